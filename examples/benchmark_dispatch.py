@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+'''Offline benchmark of per-trigger datum dispatch overhead in DetectorBase
+
+Compares looking up the file plugins and generating a uuid4 per datum on
+every trigger with the plugins resolved at stage() and pooled uids.
+'''
+
+import time
+import uuid
+
+import config
+from ophyd import Component as Cpt
+from ophyd.device import Device, GenerateDatumInterface
+from ophyd.areadetector.detectors import DetectorBase
+from ophyd.utils.uids import new_uid
+
+
+NUM_TRIGGERS = 500
+REPEATS = 5
+
+
+class DatumPlugin(Device, GenerateDatumInterface):
+    '''Generates datum uids as a FileStore plugin would, without inserting'''
+    use_pool = True
+
+    def generate_datum(self, key, timestamp):
+        if self.use_pool:
+            return new_uid()
+        return str(uuid.uuid4())
+
+
+class LegacyDatumPlugin(DatumPlugin):
+    use_pool = False
+
+
+class BenchDetector(DetectorBase):
+    hdf1 = Cpt(DatumPlugin, 'HDF1:')
+    tiff1 = Cpt(DatumPlugin, 'TIFF1:')
+    tiff2 = Cpt(DatumPlugin, 'TIFF2:', lazy=True)
+    stats1 = Cpt(Device, 'Stats1:')
+    stats2 = Cpt(Device, 'Stats2:')
+    roi1 = Cpt(Device, 'ROI1:')
+
+
+class LegacyBenchDetector(DetectorBase):
+    hdf1 = Cpt(LegacyDatumPlugin, 'HDF1:')
+    tiff1 = Cpt(LegacyDatumPlugin, 'TIFF1:')
+    tiff2 = Cpt(LegacyDatumPlugin, 'TIFF2:', lazy=True)
+    stats1 = Cpt(Device, 'Stats1:')
+    stats2 = Cpt(Device, 'Stats2:')
+    roi1 = Cpt(Device, 'ROI1:')
+
+    def dispatch(self, key, timestamp):
+        # the previous implementation: search the instantiated signals for
+        # file plugins on every trigger
+        file_plugins = [s for s in self._signals.values() if
+                        hasattr(s, 'generate_datum')]
+        for p in file_plugins:
+            p.generate_datum(key, timestamp)
+
+
+def run(det):
+    det.stage()
+    try:
+        best = None
+        for i in range(REPEATS):
+            t0 = time.perf_counter()
+            for j in range(NUM_TRIGGERS):
+                det.dispatch('light', t0)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        det.unstage()
+
+    return best
+
+
+logger = config.logger
+
+for cls in (LegacyBenchDetector, BenchDetector):
+    det = cls('BENCH:', name='det')
+    elapsed = run(det)
+    logger.info('%s: %d triggers in %.2f ms (%.2f us/trigger)',
+                cls.__name__, NUM_TRIGGERS, 1e3 * elapsed,
+                1e6 * elapsed / NUM_TRIGGERS)
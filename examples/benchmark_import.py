@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+'''Offline benchmark of the time to import ophyd
+
+Each import is timed in a fresh interpreter, along with the first access of
+the lazily loaded area detector classes and command line interface, and
+checked for the heavy optional modules it should not load. The component
+docstrings, which are only created on first access, are then all created
+to show the time deferred from import.
+'''
+
+import inspect
+import subprocess
+import sys
+import time
+
+import config
+
+
+REPEATS = 5
+IMPORT_TIMER = '''
+import sys, time
+t0 = time.perf_counter()
+import ophyd
+{access}
+print(time.perf_counter() - t0)
+print(','.join(mod for mod in {heavy!r} if mod in sys.modules))
+'''
+HEAVY_MODULES = ('IPython', 'prettytable', 'pkg_resources',
+                 'ophyd.areadetector', 'ophyd.commands')
+
+
+def time_import(access=''):
+    '''The best time of REPEATS imports, each in a new interpreter
+
+    Returns
+    -------
+    elapsed : float
+    loaded : list
+        The heavy modules which were imported
+    '''
+    statement = IMPORT_TIMER.format(access=access, heavy=HEAVY_MODULES)
+    times = []
+    for i in range(REPEATS):
+        output = subprocess.check_output([sys.executable, '-c', statement])
+        elapsed, loaded = output.decode().split('\n')[:2]
+        times.append(float(elapsed))
+
+    return min(times), [mod for mod in loaded.split(',') if mod]
+
+
+def device_classes(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from device_classes(subclass)
+
+
+def create_docstrings():
+    '''Create the docstrings of every component of every device class'''
+    import ophyd.areadetector
+    from ophyd import Device
+
+    count = 0
+    for cls in set(device_classes(Device)):
+        for attr in cls._sig_attrs:
+            count += bool(inspect.getdoc(getattr(cls, attr)))
+    return count
+
+
+logger = config.logger
+
+for desc, access in [('import ophyd', ''),
+                     ('+ area detector', 'ophyd.SimDetector'),
+                     ('+ commands', 'ophyd.mov'),
+                     ]:
+    elapsed, loaded = time_import(access)
+    logger.info('%s: %.1f ms (loaded: %s)', desc, 1e3 * elapsed,
+                ', '.join(loaded) or 'none')
+
+t0 = time.perf_counter()
+count = create_docstrings()
+logger.info('%d component docstrings created on demand in %.1f ms',
+            count, 1e3 * (time.perf_counter() - t0))
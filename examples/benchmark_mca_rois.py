@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+'''Compare reading MCA ROIs PV by PV with integrating them from the spectrum
+
+The per-PV ROIs read the count and net count PVs of each ROI; SpectrumROIs
+reads the spectrum waveform once and computes every ROI with numpy.
+'''
+
+import time
+
+import config
+from ophyd import EpicsMCA, Component as Cpt
+from ophyd.mca import SpectrumROIs
+
+
+NUM_READS = 50
+NUM_ROIS = 32
+mca_prefix = 'XF:23ID2-ES{Vortex}mca1'
+
+
+class MyMCA(EpicsMCA):
+    fast_rois = Cpt(SpectrumROIs, '')
+
+
+def run(mca):
+    mca.read()
+    t0 = time.perf_counter()
+    for i in range(NUM_READS):
+        mca.read()
+    return (time.perf_counter() - t0) / NUM_READS
+
+
+logger = config.logger
+
+per_pv_attrs = ['rois.roi{}.{}'.format(roi, attr)
+                for roi in range(NUM_ROIS)
+                for attr in ('count', 'net_count')]
+
+per_pv = MyMCA(mca_prefix, name='mca', read_attrs=per_pv_attrs)
+vectorized = MyMCA(mca_prefix, name='mca', read_attrs=['fast_rois'])
+vectorized.fast_rois.refresh()
+
+for desc, mca, channels in [('per-PV ROIs', per_pv, len(per_pv_attrs)),
+                            ('SpectrumROIs', vectorized, 1)]:
+    mca.wait_for_connection()
+    elapsed = run(mca)
+    logger.info('%s: %d channels read per event, %d values, '
+                '%.2f ms per read', desc, channels, len(mca.read()),
+                1e3 * elapsed)
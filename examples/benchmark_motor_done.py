@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+'''Latency from motor record DMOV to MoveStatus completion
+
+Compares :class:`EpicsMotor`, which decides motion completion from monitored
+direction of travel and limit switch state, against a variant that makes
+explicit channel access round trips for that state (the previous behavior).
+'''
+
+import time
+
+import numpy as np
+
+import config
+from ophyd import (EpicsMotor, EpicsSignal, EpicsSignalRO, Component as Cpt)
+
+
+class TimedMotor(EpicsMotor):
+    '''Records the time at which DMOV transitions to 1'''
+    def _move_changed(self, timestamp=None, value=None, **kwargs):
+        if value == 1 and self._moving:
+            self.dmov_ts = time.time()
+        super()._move_changed(timestamp=timestamp, value=value, **kwargs)
+
+
+class RoundTripMotor(TimedMotor):
+    '''Unmonitored state signals: each get() is a channel access round trip'''
+    motor_is_moving = Cpt(EpicsSignalRO, '.MOVN')
+    high_limit_switch = Cpt(EpicsSignal, '.HLS')
+    low_limit_switch = Cpt(EpicsSignal, '.LLS')
+    direction_of_travel = Cpt(EpicsSignal, '.TDIR')
+
+    @property
+    def moving(self):
+        return bool(self.motor_is_moving.get(use_monitor=False))
+
+
+def time_moves(motor, num_moves=20, step=0.1):
+    motor.wait_for_connection()
+    start_pos = motor.position
+    latencies = []
+    for i in range(num_moves):
+        target = start_pos + (step if i % 2 == 0 else 0.0)
+        status = motor.move(target, wait=True)
+        latencies.append(status.finish_ts - motor.dmov_ts)
+
+    return np.asarray(latencies)
+
+
+def time_moving(motor, num_calls=1000):
+    t0 = time.time()
+    for i in range(num_calls):
+        motor.moving
+    return (time.time() - t0) / num_calls
+
+
+def report(label, latencies, moving_time):
+    latencies = latencies * 1e3
+    logger.info('%s: DMOV->done mean=%.3f ms median=%.3f ms max=%.3f ms; '
+                'moving=%.1f us/call', label, np.mean(latencies),
+                np.median(latencies), np.max(latencies), moving_time * 1e6)
+
+
+logger = config.logger
+motor_record = config.motor_recs[0]
+
+for label, cls in [('round trip', RoundTripMotor),
+                   ('monitored', TimedMotor)]:
+    motor = cls(motor_record, name=label.replace(' ', '_'))
+    report(label, time_moves(motor), time_moving(motor))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+'''Offline PseudoPositioner scan benchmark using SimPositioner real axes
+
+Reports the per-move overhead beyond the simulated motion time and the
+number of inverse() calculations, with and without readback coalescing.
+'''
+
+import time
+
+import config
+from ophyd import (PseudoPositioner, PseudoSingle, SimPositioner,
+                   Component as Cpt)
+from ophyd.positioner import move_time
+
+
+NUM_POINTS = 50
+STEP = 0.1
+VELOCITY = 5.0
+ACCEL_TIME = 0.01
+UPDATE_RATE = 50.0
+
+
+class SimPseudo3x3(PseudoPositioner):
+    pseudo1 = Cpt(PseudoSingle, limits=(-10, 10))
+    pseudo2 = Cpt(PseudoSingle, limits=(-10, 10))
+    pseudo3 = Cpt(PseudoSingle, limits=(-10, 10))
+
+    real1 = Cpt(SimPositioner, velocity=VELOCITY, acceleration=ACCEL_TIME,
+                update_rate=UPDATE_RATE)
+    real2 = Cpt(SimPositioner, velocity=VELOCITY, acceleration=ACCEL_TIME,
+                update_rate=UPDATE_RATE)
+    real3 = Cpt(SimPositioner, velocity=VELOCITY, acceleration=ACCEL_TIME,
+                update_rate=UPDATE_RATE)
+
+    inverse_calls = 0
+
+    def forward(self, pseudo_pos):
+        pseudo_pos = self.PseudoPosition(*pseudo_pos)
+        return self.RealPosition(real1=-pseudo_pos.pseudo1,
+                                 real2=-pseudo_pos.pseudo2,
+                                 real3=-pseudo_pos.pseudo3)
+
+    def inverse(self, real_pos):
+        self.inverse_calls += 1
+        real_pos = self.RealPosition(*real_pos)
+        return self.PseudoPosition(pseudo1=-real_pos.real1,
+                                   pseudo2=-real_pos.real2,
+                                   pseudo3=-real_pos.real3)
+
+
+def run_scan(readback_interval):
+    pseudo = SimPseudo3x3('', name='pseudo',
+                          readback_interval=readback_interval)
+    pseudo.move((0, 0, 0), wait=True)
+    pseudo.inverse_calls = 0
+
+    readbacks = []
+    pseudo.subscribe(lambda **kwargs: readbacks.append(kwargs['value']),
+                     event_type=pseudo.SUB_READBACK, run=False)
+
+    t0 = time.time()
+    for i in range(1, NUM_POINTS + 1):
+        pseudo.move((i * STEP, ) * 3, wait=True)
+
+    elapsed = time.time() - t0
+    motion_time = NUM_POINTS * move_time(STEP, VELOCITY, ACCEL_TIME)
+    logger.info('readback_interval=%s: %d points in %.2f s (overhead '
+                '%.2f ms/point), %d inverse() calls, %d readback events',
+                readback_interval, NUM_POINTS, elapsed,
+                1e3 * (elapsed - motion_time) / NUM_POINTS,
+                pseudo.inverse_calls, len(readbacks))
+
+
+logger = config.logger
+
+for readback_interval in (None, 0.05):
+    run_scan(readback_interval)
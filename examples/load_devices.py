@@ -0,0 +1,35 @@
+'''Build the example beamline from a specification, connecting all at once'''
+
+import time
+
+import config
+from ophyd import EpicsMotor, EpicsScaler, EpicsSignalRO
+from ophyd.loader import load_devices
+
+
+logger = config.logger
+
+spec = []
+for i, prefix in enumerate(config.motor_recs, 1):
+    spec.append({'class': EpicsMotor, 'prefix': prefix,
+                 'name': 'm{}'.format(i)})
+
+for i, pvname in enumerate(config.fake_sensors, 1):
+    spec.append({'class': EpicsSignalRO, 'prefix': pvname,
+                 'name': 'sensor{}'.format(i)})
+
+for i, prefix in enumerate(config.scalers, 1):
+    spec.append({'class': EpicsScaler, 'prefix': prefix,
+                 'name': 'sclr{}'.format(i),
+                 'kwargs': {'read_attrs': ['channels']}})
+
+# an IOC which is not running does not hold up the others
+spec.append({'class': 'ophyd.EpicsMotor', 'prefix': 'XF:31IDA-OP{Missing}Mtr',
+             'name': 'missing'})
+
+t0 = time.time()
+report = load_devices(spec, timeout=5.0)
+logger.info('Loaded in %.2f s', time.time() - t0)
+logger.info(report.summary())
+
+globals().update(report.devices)
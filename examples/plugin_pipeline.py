@@ -0,0 +1,42 @@
+'''Report the health of an area detector plugin pipeline while acquiring'''
+
+import json
+import time
+
+import config
+
+from ophyd import SimDetector
+from ophyd import (ImagePlugin, StatsPlugin, ROIPlugin, TIFFPlugin,
+                   Component as Cpt)
+from ophyd.areadetector.pipeline import PluginPipelineMonitor
+
+
+logger = config.logger
+
+
+class MyDetector(SimDetector):
+    image1 = Cpt(ImagePlugin, 'image1:')
+    roi1 = Cpt(ROIPlugin, 'ROI1:')
+    stats1 = Cpt(StatsPlugin, 'Stats1:')
+    tiff1 = Cpt(TIFFPlugin, 'TIFF1:')
+
+
+det1_prefix = 'XF:31IDA-BI{Cam:Tbl}'
+det = MyDetector(det1_prefix)
+det.cam.array_callbacks.put('Enable', wait=True)
+det.cam.image_mode.put('Continuous', wait=True)
+
+monitor = PluginPipelineMonitor(det, window=2.0)
+logger.info('Port graph: %s', monitor.graph())
+
+det.cam.acquire.put(1)
+try:
+    for i in range(5):
+        time.sleep(2.0)
+        monitor.report()
+        # one JSON line per stage, e.g., for a dashboard
+        for info in monitor.snapshot():
+            print(json.dumps(info))
+finally:
+    det.cam.acquire.put(0)
+    monitor.stop()
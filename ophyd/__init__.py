@@ -1,4 +1,5 @@
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
@@ -7,30 +8,102 @@ from . import *
 
 
 # Signals
-from .signal import (Signal, EpicsSignal, EpicsSignalRO, DerivedSignal)
+from .signal import (Signal, EpicsSignal, EpicsSignalRO, DerivedSignal,
+                     ArrayGroupSignal, EpicsSignalWithRBV)
 
 # Positioners
-from .positioner import (PositionerBase, SoftPositioner)
+from .positioner import (PositionerBase, SoftPositioner, SimPositioner)
 from .epics_motor import EpicsMotor
 from .pv_positioner import (PVPositioner, PVPositionerPC)
 from .pseudopos import (PseudoPositioner, PseudoSingle)
 
 # Devices
-from .scaler import EpicsScaler
+from .scaler import EpicsScaler, PrunedEpicsScaler
 from .device import (Device, Component, FormattedComponent,
                      DynamicDeviceComponent)
 from .status import StatusBase
-from .mca import EpicsMCA, EpicsDXP
+from .mca import EpicsMCA, EpicsDXP, EpicsDXPMultiElement
 
-# Areadetector-related
-from .areadetector import *
-from ._version import get_versions
+from .utils.startup import setup as setup_ophyd
 
-from .commands import (mov, movr, set_pos, wh_pos, set_lm, log_pos,
-                       log_pos_diff, log_pos_mov)
 
-from .utils.startup import setup as setup_ophyd
+# Loaded on first access, through __getattr__: the command line interface
+# imports IPython, the area detector classes are many, and the version is
+# determined by running git in a source checkout
+_lazy_modules = {
+    '.commands': ['mov', 'movr', 'set_pos', 'wh_pos', 'set_lm', 'log_pos',
+                  'log_pos_diff', 'log_pos_mov'],
+    '.loader': ['LoadReport', 'load_devices'],
+    '.areadetector': [
+        'ADBase', 'ADComponent', 'AdscDetector', 'AdscDetectorCam',
+        'Andor3Detector', 'Andor3DetectorCam', 'AndorDetector',
+        'AndorDetectorCam', 'AreaDetector', 'BrukerDetector',
+        'BrukerDetectorCam', 'BurstTrigger', 'CamBase', 'ColorConvPlugin',
+        'DetectorBase', 'FilePlugin', 'FirewireLinDetector',
+        'FirewireLinDetectorCam', 'FirewireWinDetector',
+        'FirewireWinDetectorCam', 'FrameDistributor', 'FrameRingBuffer',
+        'HDF5Plugin', 'ImagePlugin', 'ImageStream', 'JPEGPlugin',
+        'LightFieldDetector', 'LightFieldDetectorCam', 'MagickPlugin',
+        'Mar345Detector', 'Mar345DetectorCam', 'MarCCDDetector',
+        'MarCCDDetectorCam', 'MultiTrigger', 'NetCDFPlugin', 'NexusPlugin',
+        'OverlayPlugin', 'PSLDetector', 'PSLDetectorCam',
+        'PerkinElmerDetector', 'PerkinElmerDetectorCam', 'PilatusDetector',
+        'PilatusDetectorCam', 'PipelinedTrigger', 'PixiradDetector',
+        'PixiradDetectorCam', 'PluginPipelineMonitor', 'PointGreyDetector',
+        'PointGreyDetectorCam', 'ProcessPlugin', 'ProsilicaDetector',
+        'ProsilicaDetectorCam', 'PvcamDetector', 'PvcamDetectorCam',
+        'ROIPlugin', 'RoperDetector', 'RoperDetectorCam', 'SharedFrameBuffer',
+        'SignalIndex', 'SimDetector', 'SimDetectorCam', 'SingleTrigger',
+        'StatsPlugin', 'TIFFPlugin', 'TransformPlugin', 'TriggerBase',
+        'URLDetector', 'URLDetectorCam', 'ad_group', 'get_areadetector_plugin',
+        'plugin_from_pvname', 'register_plugin'],
+    # previously re-exported along with the area detector classes
+    '.device': ['BlueskyInterface', 'Staged'],
+    '.status': ['DeviceStatus'],
+    '.utils': ['set_and_wait'],
+    '.utils.scheduler': ['get_scheduler'],
+}
+
+_lazy_names = {name: module for module, names in _lazy_modules.items()
+               for name in names}
+
+# previously imported submodules, available as attributes
+_lazy_submodules = ('areadetector', 'commands')
+
+
+def __getattr__(name):
+    if name == '__version__':
+        from ._version import get_versions
+        value = get_versions()['version']
+    elif name in _lazy_names:
+        import importlib
+        module = importlib.import_module(_lazy_names[name], __name__)
+        value = getattr(module, name)
+    elif name in _lazy_submodules:
+        import importlib
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'
+                             ''.format(__name__, name))
+
+    globals()[name] = value
+    return value
+
+
+# The lazy names are included so that `from ophyd import *` still provides
+# them, at the cost of importing their modules (and IPython) as before
+__all__ = sorted([name for name, value in globals().items()
+                  if not name.startswith('_') and
+                  not isinstance(value, type(sys))] +
+                 list(_lazy_names))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names) | set(_lazy_submodules) |
+                  {'__version__'})
 
 
-__version__ = get_versions()['version']
-del get_versions
+if sys.version_info < (3, 7):
+    # module __getattr__ (PEP 562) is not supported; load everything now
+    for _name in list(_lazy_names) + list(_lazy_submodules) + ['__version__']:
+        __getattr__(_name)
@@ -9,4 +9,7 @@ from .base import *
 from .cam import *
 from .detectors import *
 from .plugins import *
+from .streaming import *
+from .distributor import *
+from .pipeline import *
 from .trigger_mixins import *
@@ -2,21 +2,13 @@ import textwrap
 import inspect
 import re
 import sys
+import weakref
 from collections import OrderedDict
 
-from ..signal import EpicsSignal
-from . import docs
+from ..signal import (EpicsSignal, EpicsSignalWithRBV)
 from ..device import (Device, Component)
 
 
-class EpicsSignalWithRBV(EpicsSignal):
-    # An EPICS signal that simply uses the areaDetector convention of
-    # 'pvname' being the setpoint and 'pvname_RBV' being the read-back
-
-    def __init__(self, prefix, **kwargs):
-        super().__init__(prefix + '_RBV', write_pv=prefix, **kwargs)
-
-
 class ADComponent(Component):
     def __init__(self, cls, suffix, **kwargs):
         super().__init__(cls, suffix, lazy=True, **kwargs)
@@ -25,6 +17,9 @@ class ADComponent(Component):
         '''Find all the documentation related to this class, all the way up the
         MRO'''
 
+        # the documentation is only loaded when first needed
+        from . import docs
+
         classes = inspect.getmro(parent_class)
         for class_ in classes:
             try:
@@ -80,6 +75,170 @@ def ad_group(cls, attr_suffix, **kwargs):
     return defn
 
 
+def _tokenize(text):
+    '''Lower-case search tokens of text
+
+    Words are also split at underscores and camel case humps, so that
+    'ArrayRate_RBV' gives 'arrayrate_rbv', 'array', 'rate' and 'rbv'.
+    '''
+    tokens = set()
+    for word in re.findall(r'\w+', text):
+        tokens.add(word.lower())
+        tokens.update(part.lower() for part in
+                      re.findall(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|'
+                                 r'[0-9]+', word))
+    return tokens
+
+
+class SignalIndex:
+    '''An inverted index of the components of a device class
+
+    The attribute names, PV suffixes and docstrings of the components are
+    tokenized once; keyword queries are then answered from the token
+    postings, and regular expressions from the cached text, without
+    creating the docstrings again.
+
+    Results are ranked by where the query matched: in the attribute name
+    (weighted 3), the suffix (2) or the documentation (1), with a whole
+    keyword match counting double a partial one.
+
+    The class is referenced weakly, so that an index does not keep it alive.
+
+    Parameters
+    ----------
+    cls : type
+        The Device class
+    '''
+    fields = (('attr', 3.0), ('suffix', 2.0), ('doc', 1.0))
+
+    def __init__(self, cls):
+        self._cls = weakref.ref(cls)
+        self.texts = OrderedDict()
+        self.docs = OrderedDict()
+        self.postings = {}
+        self._order = {}
+        self._token_cache = {}
+
+        for order, (attr, cpt) in enumerate(cls._sig_attrs.items()):
+            doc = cpt.make_docstring(cls)
+            texts = {'attr': attr,
+                     'suffix': getattr(cpt, 'suffix', None) or '',
+                     'doc': doc}
+
+            self.texts[attr] = texts
+            self.docs[attr] = doc
+            self._order[attr] = order
+
+            for field, weight in self.fields:
+                for token in _tokenize(texts[field]):
+                    attrs = self.postings.setdefault(token, {})
+                    attrs[attr] = attrs.get(attr, 0.0) + weight
+
+        self.vocabulary = sorted(self.postings)
+
+    @property
+    def cls(self):
+        '''The indexed Device class'''
+        return self._cls()
+
+    def _tokens_matching(self, word):
+        '''Tokens containing word'''
+        try:
+            return self._token_cache[word]
+        except KeyError:
+            tokens = [token for token in self.vocabulary if word in token]
+            self._token_cache[word] = tokens
+            return tokens
+
+    def _keyword_scores(self, text, case_sensitive):
+        words = re.findall(r'\w+', text)
+        scores = None
+        for word in words:
+            word_scores = {}
+            lower = word.lower()
+            for token in self._tokens_matching(lower):
+                factor = 2.0 if token == lower else 1.0
+                for attr, weight in self.postings[token].items():
+                    word_scores[attr] = max(word_scores.get(attr, 0.0),
+                                            factor * weight)
+
+            if case_sensitive:
+                word_scores = {attr: score
+                               for attr, score in word_scores.items()
+                               if any(word in value for value in
+                                      self.texts[attr].values())}
+
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {attr: score + word_scores[attr]
+                          for attr, score in scores.items()
+                          if attr in word_scores}
+
+        return scores or {}
+
+    def _text_scores(self, match, *, doc_only):
+        scores = {}
+        for attr, texts in self.texts.items():
+            if doc_only and not match(texts['doc']):
+                continue
+
+            score = sum(weight for field, weight in self.fields
+                        if match(texts[field]))
+            if score:
+                scores[attr] = score
+        return scores
+
+    def search(self, text, *, use_re=False, case_sensitive=False,
+               keywords=True):
+        '''Search the index
+
+        Parameters
+        ----------
+        text : str
+            Keywords, all of which must match (as a whole or part of a
+            word), a phrase or a regular expression
+        use_re : bool, optional
+            text is a regular expression
+        case_sensitive : bool, optional
+            Case sensitive search
+        keywords : bool, optional
+            Match the words of text as keywords, in any field. Otherwise,
+            text (or the regular expression) must be found in the
+            documentation, as a whole.
+
+        Returns
+        -------
+        matches : list of (attr, score)
+            Best match first
+        '''
+        if use_re:
+            flags = re.MULTILINE
+            if not case_sensitive:
+                flags |= re.IGNORECASE
+
+            regex = re.compile(text, flags=flags)
+            scores = self._text_scores(regex.search, doc_only=not keywords)
+        elif keywords:
+            scores = self._keyword_scores(text, case_sensitive)
+        else:
+            if not case_sensitive:
+                text = text.lower()
+
+            def match(value):
+                if not case_sensitive:
+                    value = value.lower()
+                return text in value
+
+            scores = self._text_scores(match, doc_only=True)
+
+        return sorted(scores.items(),
+                      key=lambda item: (-item[1], self._order[item[0]]))
+
+
+_signal_indexes = weakref.WeakKeyDictionary()
+
+
 class ADBase(Device):
     '''The AreaDetector base class
 
@@ -88,10 +247,24 @@ class ADBase(Device):
 
     _html_docs = ['areaDetectorDoc.html']
 
+    @classmethod
+    def signal_index(cls):
+        '''The SignalIndex of this class, built on first use'''
+        try:
+            return _signal_indexes[cls]
+        except KeyError:
+            index = _signal_indexes[cls] = SignalIndex(cls)
+            return index
+
     def find_signal(self, text, use_re=False, case_sensitive=False,
-                    match_fcn=None, f=sys.stdout):
+                    match_fcn=None, f=sys.stdout, keywords=False):
         '''Search through the signal docs on this detector for the string text
 
+        By default, the signals whose documentation contains text (or
+        matches the regular expression) are found. Matches are ranked by
+        where else they were found (attribute name, PV suffix); see
+        `SignalIndex`.
+
         Parameters
         ----------
         text : str
@@ -106,13 +279,15 @@ class ADBase(Device):
         f : file-like, optional
             File-like object that the default match function prints to
             (Defaults to sys.stdout)
+        keywords : bool, optional
+            Match the words of text as keywords instead, all of which must be
+            found in the attribute name, PV suffix or documentation
+
+        Returns
+        -------
+        attrs : list
+            The matching attribute names, best match first
         '''
-        # TODO: Some docstrings change based on the detector type,
-        #       showing different options than are available in
-        #       the base area detector class (for example). As such,
-        #       instead of using the current docstrings, this grabs
-        #       them again.
-
         def default_match(attr, signal, doc):
             print('Property: {}'.format(attr), file=f)
             print('  Signal: {!r}'.format(signal), file=f)
@@ -122,29 +297,12 @@ class ADBase(Device):
         if match_fcn is None:
             match_fcn = default_match
 
-        if use_re:
-            flags = re.MULTILINE
-            if not case_sensitive:
-                flags |= re.IGNORECASE
-
-            regex = re.compile(text, flags=flags)
-
-        elif not case_sensitive:
-            text = text.lower()
-
-        for attr, cpt in self._sig_attrs.items():
-            doc = cpt.make_docstring(self.__class__)
-
-            match = False
-            if use_re:
-                if regex.search(doc):
-                    match = True
-            else:
-                if not case_sensitive:
-                    if text in doc.lower():
-                        match = True
-                elif text in doc:
-                    match = True
+        index = self.signal_index()
+        matches = index.search(text, use_re=use_re,
+                               case_sensitive=case_sensitive,
+                               keywords=keywords)
+        for attr, score in matches:
+            match_fcn(attr=attr, signal=getattr(self, attr),
+                      doc=index.docs[attr])
 
-            if match:
-                match_fcn(attr=attr, signal=getattr(self, attr), doc=doc)
+        return [attr for attr, score in matches]
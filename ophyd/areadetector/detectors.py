@@ -44,6 +44,25 @@ class DetectorBase(ADBase):
     Note that Plugin also inherits from ADBase.
     This adds some AD-specific methods that are not shared by the plugins.
     """
+    _datum_plugins = None
+
+    def _find_datum_plugins(self):
+        """The sub-devices which generate datums (i.e., file plugins),
+        including lazy ones"""
+        devices = (getattr(self, attr) for attr in self._sub_devices)
+        return tuple(dev for dev in devices if hasattr(dev, 'generate_datum'))
+
+    def stage(self):
+        self._datum_plugins = None
+        devices = super().stage()
+        # Resolve the file plugins once, rather than on every trigger
+        self._datum_plugins = self._find_datum_plugins()
+        return devices
+
+    def unstage(self):
+        self._datum_plugins = None
+        return super().unstage()
+
     def dispatch(self, key, timestamp):
         """When a new acquisition is finished, this method is called with a
         key which is a label like 'light', 'dark', or 'gain8'.
@@ -51,8 +70,11 @@ class DetectorBase(ADBase):
         It in turn calls all of the file plugins and makes them insert a
         datum into FileStore.
         """
-        file_plugins = [s for s in self._signals.values() if
-                        hasattr(s, 'generate_datum')]
+        file_plugins = self._datum_plugins
+        if file_plugins is None:
+            # not staged
+            file_plugins = self._find_datum_plugins()
+
         for p in file_plugins:
             p.generate_datum(key, timestamp)
 
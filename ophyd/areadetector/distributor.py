@@ -0,0 +1,378 @@
+'''
+:mod:`ophyd.areadetector.distributor` - Frame distribution to processes
+=======================================================================
+
+.. module:: ophyd.areadetector.distributor
+   :synopsis: Hand ImagePlugin frames to worker processes through shared
+              memory
+'''
+
+import logging
+import multiprocessing
+import threading
+import time
+import traceback
+
+import numpy as np
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    # Python < 3.8
+    shared_memory = None
+
+from ..signal import Signal
+from .streaming import FrameRingBuffer, ImageStream
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['SharedFrameBuffer', 'FrameDistributor']
+
+
+def _check_shared_memory():
+    if shared_memory is None:
+        raise RuntimeError('multiprocessing.shared_memory (Python 3.8+) is '
+                           'required for shared frame buffers')
+
+
+class SharedFrameBuffer(FrameRingBuffer):
+    '''A FrameRingBuffer with its frames in shared memory
+
+    Other processes attach to the frames with `attach_frames`, using `spec`.
+    The creating process is responsible for calling `close`, which also
+    frees the shared memory.
+    '''
+
+    def _allocate(self, shape, dtype):
+        _check_shared_memory()
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True,
+                                              size=max(nbytes, 1))
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        '''The shared memory block name'''
+        return self.shm.name
+
+    @property
+    def spec(self):
+        '''The shared memory name, frame storage shape and dtype'''
+        return (self.shm.name, self.frames.shape, self.frames.dtype.str)
+
+    def close(self):
+        '''Release and free the shared memory'''
+        self.frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # views of the frames are still held elsewhere; the memory is
+            # released when they are garbage collected
+            logger.debug('Shared frames %s still in use', self.shm.name)
+        self.shm.unlink()
+
+
+def attach_frames(spec):
+    '''Attach to the frames of a SharedFrameBuffer from another process
+
+    Parameters
+    ----------
+    spec : tuple
+        `SharedFrameBuffer.spec`
+
+    Returns
+    -------
+    shm : SharedMemory
+        The shared memory block, to be closed when no longer needed
+    frames : np.ndarray
+        The frame storage
+    '''
+    _check_shared_memory()
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _worker_main(func, tasks, results):
+    '''Worker process: run func on each frame slot it is handed'''
+    attached = {}
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        spec, slot, index, timestamp = task
+        name = spec[0]
+        if name not in attached:
+            # the geometry changed; let go of the previous buffer
+            _detach(attached)
+            attached[name] = attach_frames(spec)
+
+        frame = attached[name][1][slot]
+        t0 = time.monotonic()
+        try:
+            result = func(frame)
+        except Exception:
+            ok, result = False, traceback.format_exc()
+        else:
+            ok = True
+
+        del frame
+        results.put((name, slot, index, timestamp, ok, result,
+                     time.monotonic() - t0))
+
+    _detach(attached)
+
+
+def _detach(attached):
+    '''Close the shared memory blocks attached by a worker'''
+    blocks = [shm for shm, frames in attached.values()]
+    attached.clear()
+    for shm in blocks:
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+class FrameDistributor(ImageStream):
+    '''Distribute frames from an ImagePlugin to a pool of worker processes
+
+    Frames are copied from the array data monitor into a ring buffer in
+    shared memory, and only the slot index is sent to the workers, which
+    call `func` on a view of the frame. Frames are not pickled.
+
+    A slot is not reused until a worker has finished with it: when all slots
+    are busy, new frames are dropped and counted in `busy_dropped` (and
+    `dropped`), rather than queued without bound.
+
+    Results are put to the `result` signal (with the frame timestamp) as
+    they come back from the workers; with more than one worker they may
+    arrive out of order.
+
+    Parameters
+    ----------
+    plugin : ImagePlugin
+        The plugin to stream from
+    func : callable
+        Called in a worker process as func(frame), returning a picklable
+        result. Must itself be picklable, i.e., defined at module level.
+        The frame is a view of shared memory which is reused once func
+        returns.
+    workers : int, optional
+        The number of worker processes
+    capacity : int, optional
+        The number of frame slots
+    name : str, optional
+        Used to name the result signals
+    mp_context : str, optional
+        The multiprocessing start method, defaulting to the platform default
+    start : bool, optional
+        Start streaming immediately
+
+    Attributes
+    ----------
+    result : Signal
+        The latest result
+    processing_time : Signal
+        The time func took for the latest result
+    submitted : int
+        Frames handed to the workers
+    processed : int
+        Frames successfully processed
+    errors : int
+        Frames for which func raised
+    busy_dropped : int
+        Frames dropped because every slot was in use
+    '''
+
+    def __init__(self, plugin, func, *, workers=2, capacity=16, name=None,
+                 mp_context=None, start=True):
+        _check_shared_memory()
+
+        if name is None:
+            name = '{}_distributor'.format(plugin.name)
+
+        self.name = name
+        self.func = func
+        self.result = Signal(name='{}_result'.format(name))
+        self.processing_time = Signal(name='{}_processing_time'.format(name))
+        self.submitted = 0
+        self.processed = 0
+        self.errors = 0
+        self.busy_dropped = 0
+
+        self._busy = None
+        self._retired = {}
+
+        ctx = multiprocessing.get_context(mp_context)
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+
+        super().__init__(plugin, capacity=capacity, start=False)
+
+        # workers share the tracker of this process, which unlinks the
+        # buffers, rather than each starting (and cleaning up with) their own
+        resource_tracker.ensure_running()
+        self._workers = [ctx.Process(target=_worker_main,
+                                     args=(func, self._tasks, self._results),
+                                     name='{}_{}'.format(name, i),
+                                     daemon=True)
+                         for i in range(workers)]
+        for proc in self._workers:
+            proc.start()
+
+        self._result_thread = threading.Thread(target=self._collect_results,
+                                               name='{}_results'.format(name),
+                                               daemon=True)
+        self._result_thread.start()
+        self._closed = False
+
+        if start:
+            self.start()
+
+    def _allocate_buffer(self, shape, dtype):
+        old, busy = self.buffer, self._busy
+        if old is not None:
+            in_flight = int(busy.sum())
+            if in_flight:
+                # free it once the workers are finished with it
+                self._retired[old.name] = [old, in_flight]
+            else:
+                old.close()
+
+        self._busy = np.zeros(self.capacity, dtype=bool)
+        return SharedFrameBuffer(self.capacity, shape, dtype=dtype)
+
+    def _store(self, buf, data, timestamp):
+        slot = buf.count % buf.capacity
+        if self._busy[slot]:
+            self.busy_dropped += 1
+            return
+
+        index = buf.append(data, timestamp)
+        self._busy[slot] = True
+        self.submitted += 1
+        self._tasks.put((buf.spec, slot, index, timestamp))
+
+    def _release(self, name, slot):
+        '''A worker is finished with a slot'''
+        with self._lock:
+            buf = self.buffer
+            if buf is not None and buf.name == name:
+                self._busy[slot] = False
+            elif name in self._retired:
+                retired = self._retired[name]
+                retired[1] -= 1
+                if retired[1] <= 0:
+                    del self._retired[name]
+                    retired[0].close()
+
+    def _collect_results(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                break
+
+            name, slot, index, timestamp, ok, result, elapsed = item
+            self._release(name, slot)
+
+            if not ok:
+                self.errors += 1
+                logger.error('%s: processing frame %d failed\n%s',
+                             self.name, index, result)
+                continue
+
+            self.processed += 1
+            try:
+                self.processing_time.put(elapsed, timestamp=timestamp)
+                self.result.put(result, timestamp=timestamp)
+            except Exception as ex:
+                logger.error('%s: result subscription failed', self.name,
+                             exc_info=ex)
+
+    @property
+    def in_flight(self):
+        '''Frames handed to the workers and not yet returned'''
+        with self._lock:
+            in_flight = sum(count for buf, count in self._retired.values())
+            if self._busy is not None:
+                in_flight += int(self._busy.sum())
+            return in_flight
+
+    def wait(self, timeout=None, poll=0.01):
+        '''Wait until the workers have returned all submitted frames
+
+        Returns
+        -------
+        idle : bool
+            False if timed out
+        '''
+        t0 = time.monotonic()
+        while self.in_flight:
+            if timeout is not None and time.monotonic() - t0 > timeout:
+                return False
+            time.sleep(poll)
+
+        return True
+
+    @property
+    def overwritten(self):
+        '''Always 0: busy slots are never overwritten'''
+        return 0
+
+    @property
+    def dropped(self):
+        '''Frames which were not handed to the workers
+
+        In addition to those counted by ImageStream, this includes frames
+        dropped because every slot was in use.
+        '''
+        with self._lock:
+            return super().dropped + self.busy_dropped
+
+    def close(self, timeout=5.0):
+        '''Stop streaming, shut down the workers and free the shared memory
+
+        Frames already handed to the workers are processed first.
+        '''
+        if self._closed:
+            return
+
+        self._closed = True
+        self.stop()
+
+        for proc in self._workers:
+            self._tasks.put(None)
+
+        for proc in self._workers:
+            proc.join(timeout)
+            if proc.is_alive():
+                logger.warning('%s: terminating worker %s', self.name,
+                               proc.name)
+                proc.terminate()
+
+        self._results.put(None)
+        self._result_thread.join(timeout)
+
+        with self._lock:
+            for buf, count in self._retired.values():
+                buf.close()
+            self._retired.clear()
+
+            if self.buffer is not None:
+                self.buffer.close()
+                self.buffer = None
+                self._busy = None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(plugin={0.plugin.name!r}, '
+                'func={0.func!r}, workers={1}, capacity={0.capacity}, '
+                'submitted={0.submitted}, processed={0.processed}, '
+                'dropped={0.dropped})'
+                ''.format(self, len(self._workers)))
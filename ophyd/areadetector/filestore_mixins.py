@@ -21,7 +21,8 @@ To be used like so:
 """
 
 import logging
-import uuid
+import queue
+import threading
 import filestore.api as fs
 
 from datetime import datetime
@@ -29,14 +30,15 @@ from collections import defaultdict
 from itertools import count
 
 from ..device import GenerateDatumInterface, BlueskyInterface, Staged
-from ..utils import set_and_wait
+from ..utils import set_and_wait, ExceptionBundle
+from ..utils.uids import new_uid as _new_pooled_uid
 
 logger = logging.getLogger(__name__)
 
 
 def new_uid():
     "uuid4 as a string"
-    return str(uuid.uuid4())
+    return _new_pooled_uid()
 
 
 def new_short_uid():
@@ -287,6 +289,130 @@ class FileStoreBulkWrite(FileStoreBase):
         return super().unstage()
 
 
+class FileStoreBackgroundWrite(FileStoreBase):
+    """Save records to filestore in batches, from a background thread.
+
+    Datums are put on a bounded queue as they are generated, and a writer
+    thread inserts them in batches of up to `datum_batch_size`, so that
+    database latency is kept out of `trigger()`. If the queue is full,
+    `generate_datum` blocks until there is room.
+
+    All queued datums are inserted on unstage; any insert errors are then
+    raised, bundled in an ExceptionBundle.
+    """
+    datum_queue_size = 1000
+    datum_batch_size = 100
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._datum_queue = None
+        self._datum_writer = None
+        self._datum_errors = []
+        self._datums_inserted = 0
+
+    @property
+    def datum_queue_depth(self):
+        "The number of datums waiting to be inserted"
+        if self._datum_queue is None:
+            return 0
+        return self._datum_queue.qsize()
+
+    @property
+    def datum_errors(self):
+        "Exceptions raised by datum inserts since staging"
+        return list(self._datum_errors)
+
+    @property
+    def datums_inserted(self):
+        "The number of datums inserted since staging"
+        return self._datums_inserted
+
+    def stage(self):
+        # stage first: a redundant or failed stage must not replace the
+        # running writer thread (and its queue)
+        super().stage()
+        self._datum_errors = []
+        self._datums_inserted = 0
+        self._datum_queue = queue.Queue(maxsize=self.datum_queue_size)
+        self._datum_writer = threading.Thread(
+            target=self._write_datums, args=(self._datum_queue, ),
+            name='{}_datum_writer'.format(self.name), daemon=True)
+        self._datum_writer.start()
+
+    def generate_datum(self, key, timestamp):
+        "Queue each datum, to be inserted by the writer thread."
+        uid = super().generate_datum(key, timestamp)
+        i = next(self._point_counter)
+        self._datum_queue.put((self._resource, uid, {'point_number': i}))
+        return uid
+
+    def _write_datums(self, datum_queue):
+        "Writer thread: insert datums from the queue in batches"
+        done = False
+        while not done:
+            batch = [datum_queue.get()]
+            while len(batch) < self.datum_batch_size:
+                try:
+                    batch.append(datum_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in batch:
+                # flush requested; None is always the last item queued
+                batch.remove(None)
+                done = True
+
+            try:
+                self._insert_datums(batch)
+            finally:
+                for _ in range(len(batch) + done):
+                    datum_queue.task_done()
+
+    def _insert_datums(self, batch):
+        "Insert a batch of (resource, uid, kwargs) datums"
+        bulk_insert = getattr(fs, 'bulk_insert_datum', None)
+
+        by_resource = defaultdict(list)
+        for resource, uid, kwargs in batch:
+            by_resource[resource].append((uid, kwargs))
+
+        for resource, datums in by_resource.items():
+            try:
+                if bulk_insert is not None:
+                    uids, kwargs = zip(*datums)
+                    bulk_insert(resource, uids, kwargs)
+                else:
+                    for uid, kwargs in datums:
+                        fs.insert_datum(resource, uid, kwargs)
+            except Exception as ex:
+                logger.error('%s: failed to insert %d datums', self.name,
+                             len(datums), exc_info=ex)
+                self._datum_errors.append(ex)
+            else:
+                self._datums_inserted += len(datums)
+
+    def flush_datums(self):
+        "Block until every queued datum has been inserted."
+        if self._datum_queue is not None:
+            self._datum_queue.join()
+
+    def unstage(self):
+        "Insert the remaining datums, then stop the writer thread."
+        if self._datum_writer is not None:
+            self._datum_queue.put(None)
+            self._datum_writer.join()
+            self._datum_writer = None
+            self._datum_queue = None
+
+        ret = super().unstage()
+        if self._datum_errors:
+            raise ExceptionBundle('{}: {} datum insert(s) failed'
+                                  ''.format(self.name,
+                                            len(self._datum_errors)),
+                                  self.datum_errors)
+        return ret
+
+
 # ready-to-use combinations
 
 class FileStoreHDF5IterativeWrite(FileStoreHDF5, FileStoreIterativeWrite):
@@ -297,9 +423,17 @@ class FileStoreHDF5BulkWrite(FileStoreHDF5, FileStoreBulkWrite):
     pass
 
 
+class FileStoreHDF5BackgroundWrite(FileStoreHDF5, FileStoreBackgroundWrite):
+    pass
+
+
 class FileStoreTIFFIterativeWrite(FileStoreTIFF, FileStoreIterativeWrite):
     pass
 
 
 class FileStoreTIFFBulkWrite(FileStoreTIFF, FileStoreBulkWrite):
     pass
+
+
+class FileStoreTIFFBackgroundWrite(FileStoreTIFF, FileStoreBackgroundWrite):
+    pass
@@ -0,0 +1,305 @@
+'''
+:mod:`ophyd.areadetector.pipeline` - Plugin pipeline monitoring
+===============================================================
+
+.. module:: ophyd.areadetector.pipeline
+   :synopsis: Throughput, queue and drop statistics for the plugin port
+              graph of an area detector
+'''
+
+import collections
+import logging
+import sys
+import threading
+import time
+
+from .plugins import PluginBase
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['PluginPipelineMonitor']
+
+
+class _Rate:
+    '''The rate of change of a monitored counter over a time window'''
+
+    def __init__(self, window):
+        self.window = window
+        self.samples = collections.deque()
+
+    def add(self, timestamp, value):
+        samples = self.samples
+        if samples and (value < samples[-1][1] or
+                        timestamp < samples[-1][0]):
+            # the counter (or the clock of its source) was reset
+            samples.clear()
+
+        samples.append((timestamp, value))
+        while len(samples) > 2 and timestamp - samples[1][0] >= self.window:
+            samples.popleft()
+
+    @property
+    def rate(self):
+        if len(self.samples) < 2:
+            return 0.0
+
+        (t0, v0), (t1, v1) = self.samples[0], self.samples[-1]
+        if t1 <= t0:
+            return 0.0
+        return (v1 - v0) / (t1 - t0)
+
+
+class PluginPipelineMonitor:
+    '''Monitor the health of the plugin pipeline of an area detector
+
+    The port graph is built from the `port_name` of the cam and each plugin,
+    and the `nd_array_port` each plugin takes its arrays from. The
+    throughput, queue, dropped array and memory pool signals of every stage
+    are then followed through monitors (so sampling costs no channel access
+    round trips), and summarized by `snapshot`, `bottleneck` and `report`.
+
+    Parameters
+    ----------
+    detector : DetectorBase
+        The detector. Its `cam` and every plugin sub-device are monitored,
+        including lazy plugins.
+    window : float, optional
+        The time window (in seconds) over which rates are computed
+    saturation : float, optional
+        The fraction of a plugin queue in use at which the plugin is
+        considered saturated
+    start : bool, optional
+        Start monitoring immediately
+
+    Example
+    -------
+    >>> monitor = PluginPipelineMonitor(det)
+    >>> det.cam.acquire.put(1)
+    >>> monitor.report()
+    >>> monitor.bottleneck()['name']
+    '''
+
+    stage_attrs = ('port_name', 'nd_array_port', 'array_counter',
+                   'array_rate', 'queue_use', 'queue_size', 'dropped_arrays',
+                   'pool_used_mem', 'pool_free_buffers')
+
+    def __init__(self, detector, *, window=5.0, saturation=0.9, start=True):
+        self.detector = detector
+        self.window = window
+        self.saturation = saturation
+
+        self._lock = threading.RLock()
+        self._values = {}
+        self._rates = {}
+        self._subscriptions = []
+        self._running = False
+
+        self.stages = self._find_stages()
+
+        if start:
+            self.start()
+
+    def _find_stages(self):
+        stages = []
+        cam = getattr(self.detector, 'cam', None)
+        if cam is not None:
+            stages.append(cam)
+
+        for attr in self.detector._sub_devices:
+            dev = getattr(self.detector, attr)
+            if isinstance(dev, PluginBase):
+                stages.append(dev)
+
+        return stages
+
+    def start(self):
+        '''Subscribe to the pipeline signals of every stage'''
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+
+        for stage in self.stages:
+            self._values[stage] = {}
+            self._rates[stage] = {'array_counter': _Rate(self.window),
+                                  'dropped_arrays': _Rate(self.window)}
+            for attr in self.stage_attrs:
+                try:
+                    sig = getattr(stage, attr, None)
+                except TimeoutError as ex:
+                    # lazy signals connect on creation
+                    logger.warning('%s: not monitoring %s (%s)',
+                                   stage.name, attr, ex)
+                    continue
+
+                if sig is None:
+                    continue
+
+                def changed(value=None, timestamp=None, stage=stage,
+                            attr=attr, **kwargs):
+                    self._update(stage, attr, value, timestamp)
+
+                sig.subscribe(changed, run=True)
+                self._subscriptions.append((sig, changed))
+
+    def stop(self):
+        '''Unsubscribe from all signals'''
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            subscriptions, self._subscriptions = self._subscriptions, []
+
+        for sig, callback in subscriptions:
+            sig.clear_sub(callback)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _update(self, stage, attr, value, timestamp):
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            self._values[stage][attr] = value
+            rate = self._rates[stage].get(attr)
+            if rate is not None and value is not None:
+                rate.add(timestamp, value)
+
+    def graph(self):
+        '''The plugin port graph
+
+        Returns
+        -------
+        graph : dict
+            Mapping of port name to the list of port names which take
+            arrays from it
+        '''
+        with self._lock:
+            graph = collections.OrderedDict()
+            for stage in self.stages:
+                port = self._values[stage].get('port_name')
+                if port is not None:
+                    graph.setdefault(port, [])
+
+            for stage in self.stages:
+                values = self._values[stage]
+                port = values.get('port_name')
+                upstream = values.get('nd_array_port')
+                if port is not None and upstream:
+                    graph.setdefault(upstream, []).append(port)
+
+            return graph
+
+    def _stage_info(self, stage):
+        values = self._values[stage]
+        rates = self._rates[stage]
+
+        queue_use = values.get('queue_use')
+        queue_size = values.get('queue_size')
+        if queue_use is not None and queue_size:
+            queue_fill = float(queue_use) / queue_size
+        else:
+            queue_fill = None
+
+        return collections.OrderedDict([
+            ('name', stage.name),
+            ('port', values.get('port_name')),
+            ('upstream', values.get('nd_array_port')),
+            ('array_counter', values.get('array_counter')),
+            ('array_rate', values.get('array_rate')),
+            ('throughput', rates['array_counter'].rate),
+            ('queue_use', queue_use),
+            ('queue_size', queue_size),
+            ('queue_fill', queue_fill),
+            ('saturated', (queue_fill is not None and
+                           queue_fill >= self.saturation)),
+            ('dropped_arrays', values.get('dropped_arrays')),
+            ('drop_rate', rates['dropped_arrays'].rate),
+            ('pool_used_mem', values.get('pool_used_mem')),
+            ('pool_free_buffers', values.get('pool_free_buffers')),
+        ])
+
+    def snapshot(self):
+        '''The latest statistics of every stage
+
+        Returns
+        -------
+        stages : list of dict
+            One flat dictionary per stage (cam first), with the monitored
+            values, the measured `throughput` and `drop_rate` (per second,
+            over the window), the `queue_fill` fraction and whether the
+            stage is `saturated`. Suitable for logging or dashboards.
+        '''
+        with self._lock:
+            timestamp = time.time()
+            stages = [self._stage_info(stage) for stage in self.stages]
+
+        for info in stages:
+            info['timestamp'] = timestamp
+        return stages
+
+    def bottleneck(self):
+        '''The slowest stage of the pipeline
+
+        This is the plugin with the fullest queue; if no queue is in use,
+        the one dropping arrays the fastest, then the one with the lowest
+        throughput relative to its upstream port.
+
+        Returns
+        -------
+        info : dict or None
+            The stage statistics, as in `snapshot`, or None if no plugins
+            are monitored
+        '''
+        stages = self.snapshot()
+        throughput = {info['port']: info['throughput'] for info in stages}
+        plugins = [info for info in stages if info['upstream'] is not None]
+        if not plugins:
+            return None
+
+        def lag(info):
+            upstream = throughput.get(info['upstream'])
+            if not upstream:
+                return 0.0
+            return 1.0 - info['throughput'] / upstream
+
+        def key(info):
+            return (info['queue_fill'] or 0.0, info['drop_rate'], lag(info))
+
+        return max(plugins, key=key)
+
+    def report(self, f=sys.stdout):
+        '''Print a table of the stage statistics to f'''
+        columns = [('name', '{}'), ('port', '{}'), ('upstream', '{}'),
+                   ('throughput', '{:.1f}'), ('queue_fill', '{:.0%}'),
+                   ('dropped_arrays', '{}'), ('drop_rate', '{:.1f}'),
+                   ('pool_free_buffers', '{}')]
+
+        rows = [[name for name, fmt in columns]]
+        for info in self.snapshot():
+            rows.append(['-' if info[name] is None else fmt.format(info[name])
+                         for name, fmt in columns])
+
+        widths = [max(len(row[i]) for row in rows)
+                  for i in range(len(columns))]
+        for row in rows:
+            print('  '.join(value.ljust(width)
+                            for value, width in zip(row, widths)).rstrip(),
+                  file=f)
+
+        slowest = self.bottleneck()
+        if slowest is not None:
+            print('Slowest stage: {}{}'.format(slowest['name'],
+                                               ' (saturated)'
+                                               if slowest['saturated']
+                                               else ''),
+                  file=f)
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(detector={0.detector.name!r}, '
+                'stages={1})'.format(self, len(self.stages)))
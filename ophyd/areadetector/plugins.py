@@ -23,6 +23,7 @@ from .base import (ADBase, ADComponent as C, ad_group,
 from ..signal import (EpicsSignalRO, EpicsSignal)
 from ..device import DynamicDeviceComponent as DDC, GenerateDatumInterface
 from ..utils import enum, set_and_wait
+from .streaming import ImageStream
 
 
 logger = logging.getLogger(__name__)
@@ -169,6 +170,22 @@ class ImagePlugin(PluginBase):
         image = self.array_data.get(count=pixel_count)
         return np.array(image).reshape(array_size)
 
+    def stream(self, capacity=100, *, start=True):
+        '''Stream frames from the plugin into a ring buffer
+
+        Parameters
+        ----------
+        capacity : int, optional
+            The number of frames to keep
+        start : bool, optional
+            Start streaming immediately
+
+        Returns
+        -------
+        stream : ImageStream
+        '''
+        return ImageStream(self, capacity=capacity, start=start)
+
 
 class StatsPlugin(PluginBase):
     _default_suffix = 'Stats1:'
@@ -0,0 +1,351 @@
+'''
+:mod:`ophyd.areadetector.streaming` - Streaming image frames
+============================================================
+
+.. module:: ophyd.areadetector.streaming
+   :synopsis: Collect frames from an ImagePlugin into a ring buffer
+'''
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['FrameRingBuffer', 'ImageStream']
+
+
+class FrameRingBuffer:
+    '''A preallocated, fixed-capacity ring buffer of image frames
+
+    Parameters
+    ----------
+    capacity : int
+        The number of frames to keep
+    shape : tuple
+        The shape of a single frame
+    dtype : np.dtype, optional
+        The frame data type
+
+    Attributes
+    ----------
+    frames : np.ndarray
+        The frame storage, of shape (capacity, ) + shape
+    timestamps : np.ndarray
+        The timestamp of each frame in storage
+    count : int
+        The total number of frames appended
+    '''
+
+    def __init__(self, capacity, shape, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError('Capacity must be positive')
+
+        self.capacity = int(capacity)
+        self.shape = tuple(shape)
+        self.frames = self._allocate((self.capacity, ) + self.shape, dtype)
+        self.timestamps = np.full(self.capacity, np.nan)
+        self.count = 0
+
+    def _allocate(self, shape, dtype):
+        '''Allocate the frame storage'''
+        return np.zeros(shape, dtype=dtype)
+
+    @property
+    def dtype(self):
+        return self.frames.dtype
+
+    @property
+    def pixels(self):
+        '''The number of elements in a single frame'''
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def append(self, data, timestamp):
+        '''Copy a frame into the next slot, returning its absolute index
+
+        Parameters
+        ----------
+        data : array-like
+            At least `pixels` elements; any trailing elements are ignored
+        timestamp : float
+            The frame timestamp
+        '''
+        flat = np.asarray(data).reshape(-1)
+        if flat.size < self.pixels:
+            raise ValueError('Frame has {} elements, expected {}'
+                             ''.format(flat.size, self.pixels))
+
+        index = self.count
+        slot = index % self.capacity
+        self.frames[slot].reshape(-1)[:] = flat[:self.pixels]
+        self.timestamps[slot] = timestamp
+        self.count += 1
+        return index
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def overwritten(self):
+        '''The number of frames overwritten by newer ones'''
+        return max(self.count - self.capacity, 0)
+
+    def frame(self, index):
+        '''A view of the frame at an absolute index, or None if unavailable'''
+        if index < 0 or index >= self.count or index < self.overwritten:
+            return None
+        return self.frames[index % self.capacity]
+
+    def latest(self, n=1):
+        '''Views of the latest n frames, oldest first
+
+        The views are not copies: they are overwritten in place once the
+        buffer wraps around, so copy anything that needs to be kept.
+        '''
+        n = min(n, len(self))
+        return [self.frames[index % self.capacity]
+                for index in range(self.count - n, self.count)]
+
+    def since(self, index):
+        '''Views of the frames after an absolute index, oldest first
+
+        Returns
+        -------
+        frames : list
+            Views of the frames still available
+        next_index : int
+            The index to pass in on the next call
+        '''
+        start = max(index, self.overwritten)
+        return ([self.frames[i % self.capacity]
+                 for i in range(start, self.count)],
+                self.count)
+
+    @property
+    def frame_rate(self):
+        '''The frame rate, in Hz, over the frames in the buffer'''
+        n = len(self)
+        if n < 2:
+            return 0.0
+
+        first = self.timestamps[(self.count - n) % self.capacity]
+        last = self.timestamps[(self.count - 1) % self.capacity]
+        if last <= first:
+            return 0.0
+        return (n - 1) / (last - first)
+
+    def clear(self):
+        self.count = 0
+        self.timestamps[:] = np.nan
+
+
+class ImageStream:
+    '''Stream frames from an ImagePlugin into a FrameRingBuffer
+
+    Rather than polling `ImagePlugin.image`, which reads the array geometry
+    and the full array over channel access on every call, the stream
+    monitors the array data and the geometry and copies each new frame into
+    a preallocated ring buffer. The buffer is reallocated (and emptied) when
+    the geometry or data type of the frames changes.
+
+    Parameters
+    ----------
+    plugin : ImagePlugin
+        The plugin to stream from
+    capacity : int, optional
+        The number of frames to keep
+    start : bool, optional
+        Start streaming immediately
+
+    Attributes
+    ----------
+    received : int
+        Frames received from the plugin
+    rejected : int
+        Frames which did not match the array geometry
+    '''
+
+    _geometry_attrs = ('height', 'width', 'depth')
+
+    def __init__(self, plugin, capacity=100, *, start=True):
+        self.plugin = plugin
+        self.capacity = capacity
+        self.buffer = None
+        self.received = 0
+        self.rejected = 0
+
+        self._lock = threading.RLock()
+        self._geometry = {}
+        self._ndimensions = 0
+        self._counter = None
+        self._last_frame_counter = None
+        self._missed = 0
+        self._running = False
+
+        if start:
+            self.start()
+
+    @property
+    def _geometry_signals(self):
+        size = self.plugin.array_size
+        return [(attr, getattr(size, attr)) for attr in self._geometry_attrs]
+
+    def start(self):
+        '''Subscribe to the plugin array data and geometry'''
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+
+        plugin = self.plugin
+        for attr, sig in self._geometry_signals:
+            sig.subscribe(self._geometry_changed, run=True)
+        plugin.ndimensions.subscribe(self._ndimensions_changed, run=True)
+        plugin.array_counter.subscribe(self._counter_changed, run=True)
+        plugin.array_data.subscribe(self._new_frame, run=False)
+
+    def stop(self):
+        '''Stop streaming; the buffered frames are kept'''
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+
+        plugin = self.plugin
+        plugin.array_data.clear_sub(self._new_frame)
+        plugin.array_counter.clear_sub(self._counter_changed)
+        plugin.ndimensions.clear_sub(self._ndimensions_changed)
+        for attr, sig in self._geometry_signals:
+            sig.clear_sub(self._geometry_changed)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def running(self):
+        return self._running
+
+    @property
+    def shape(self):
+        '''The frame shape, according to the monitored geometry'''
+        with self._lock:
+            size = [self._geometry.get(attr) or 0
+                    for attr in self._geometry_attrs]
+            return tuple(size[:self._ndimensions])
+
+    def _geometry_changed(self, obj=None, value=None, **kwargs):
+        with self._lock:
+            for attr, sig in self._geometry_signals:
+                if sig is obj:
+                    self._geometry[attr] = value
+
+    def _ndimensions_changed(self, value=None, **kwargs):
+        with self._lock:
+            self._ndimensions = value or 0
+
+    def _counter_changed(self, value=None, **kwargs):
+        if value is None:
+            return
+
+        with self._lock:
+            self._counter = value
+
+    def _count_missed(self):
+        '''Count frames skipped by the plugin array counter since the last
+        frame was received'''
+        counter, last = self._counter, self._last_frame_counter
+        self._last_frame_counter = counter
+        if counter is None or last is None or counter < last:
+            # no counter yet, or the counter was reset
+            return
+
+        self._missed += max(counter - last - 1, 0)
+
+    def _new_frame(self, value=None, timestamp=None, **kwargs):
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            self.received += 1
+            self._count_missed()
+            shape = self.shape
+            data = np.asarray(value)
+
+            if not shape or 0 in shape:
+                self.rejected += 1
+                return
+
+            buf = self.buffer
+            if buf is None or buf.shape != shape or buf.dtype != data.dtype:
+                logger.debug('Allocating %d frames of shape %s (%s)',
+                             self.capacity, shape, data.dtype)
+                self.buffer = buf = self._allocate_buffer(shape, data.dtype)
+
+            try:
+                self._store(buf, data, timestamp)
+            except ValueError as ex:
+                logger.debug('Frame rejected: %s', ex)
+                self.rejected += 1
+
+    def _allocate_buffer(self, shape, dtype):
+        '''A new frame buffer, replacing the current one'''
+        return FrameRingBuffer(self.capacity, shape, dtype=dtype)
+
+    def _store(self, buf, data, timestamp):
+        '''Store a frame in the buffer'''
+        buf.append(data, timestamp)
+
+    @property
+    def overwritten(self):
+        '''Frames overwritten in the ring buffer before being replaced'''
+        with self._lock:
+            if self.buffer is None:
+                return 0
+            return self.buffer.overwritten
+
+    @property
+    def dropped(self):
+        '''Frames which were not stored
+
+        This includes frames which did not match the geometry, and frames the
+        plugin produced (according to its array counter) that were never
+        received.
+        '''
+        with self._lock:
+            return self.rejected + self._missed
+
+    @property
+    def frame_rate(self):
+        '''The observed frame rate, in Hz'''
+        with self._lock:
+            if self.buffer is None:
+                return 0.0
+            return self.buffer.frame_rate
+
+    def latest(self, n=1):
+        '''Views of the latest n frames, oldest first
+
+        See `FrameRingBuffer.latest`.
+        '''
+        with self._lock:
+            if self.buffer is None:
+                return []
+            return self.buffer.latest(n)
+
+    @property
+    def last_frame(self):
+        '''A view of the latest frame, or None'''
+        frames = self.latest(1)
+        return frames[0] if frames else None
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(plugin={0.plugin.name!r}, '
+                'capacity={0.capacity}, received={0.received}, '
+                'dropped={0.dropped}, overwritten={0.overwritten})'
+                ''.format(self))
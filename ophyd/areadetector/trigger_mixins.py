@@ -12,10 +12,12 @@ To be used like so:
 import time as ttime
 import logging
 import itertools
+import threading
 
 from ..ophydobj import DeviceStatus
 from ..device import BlueskyInterface, Staged
 from ..utils import set_and_wait
+from ..utils.scheduler import get_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,11 @@ class TriggerBase(BlueskyInterface):
         self._status = None
         self._acquisition_signal = self.cam.acquire
 
+    def _file_plugins(self):
+        "The file (datum-generating) plugins of a DetectorBase"
+        find_plugins = getattr(self, '_find_datum_plugins', None)
+        return find_plugins() if find_plugins is not None else ()
+
 
 class SingleTrigger(TriggerBase):
     """
@@ -208,3 +215,295 @@ class MultiTrigger(TriggerBase):
         if (old_value == 1) and (value == 0):
             # Negative-going edge means an acquisition just finished.
             self._run_subs(sub_type=self._SUB_ACQ_DONE)
+
+
+class BurstTrigger(TriggerBase):
+    """
+    This trigger mixin class takes a burst of frames per trigger.
+
+    The cam is armed once for `num_frames` frames, under internal or
+    external triggering, rather than once per frame. Frames landing are
+    followed through monitors on the cam `num_images_counter` and the
+    `num_captured` of each file plugin. One status is returned for the whole
+    burst; it finishes when acquisition stops, and fails if fewer than
+    `num_frames` frames landed.
+
+    One datum is generated per burst, spanning its frames, once acquisition
+    has stopped (off the monitor callback thread). File plugins should
+    therefore be configured with `num_frames` frames per point.
+
+    Example
+    -------
+    >>> class MyDetector(BurstTrigger, SimDetector):
+    ...     pass
+    >>> det = MyDetector('..pv..', num_frames=100)
+    # optionally, set the trigger mode (values depend on the detector)
+    >>> det = MyDetector('..pv..', num_frames=100, trigger_mode=1)
+    """
+    def __init__(self, *args, num_frames=1, trigger_mode=None,
+                 image_name=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if image_name is None:
+            image_name = '_'.join([self.name, 'image'])
+        self._image_name = image_name
+        self.num_frames = num_frames
+        if trigger_mode is not None:
+            self.stage_sigs[self.cam.trigger_mode] = trigger_mode
+
+        self._burst_lock = threading.RLock()
+        self._followed = ()
+        self._counts = {}
+        self._baselines = {}
+
+    @property
+    def num_frames(self):
+        "The number of frames per trigger"
+        return self._num_frames
+
+    @num_frames.setter
+    def num_frames(self, num_frames):
+        if num_frames < 1:
+            raise ValueError('At least one frame is required')
+        self._num_frames = int(num_frames)
+        self.stage_sigs[self.cam.num_images] = self._num_frames
+
+    @property
+    def frames_landed(self):
+        "The number of frames of the current burst which have landed"
+        with self._burst_lock:
+            return self._frames_landed()
+
+    def stage(self):
+        self._acquisition_signal.subscribe(self._acquire_changed)
+        super().stage()
+
+        # Follow the file plugins (now staged) along with the cam
+        followed = [self.cam.num_images_counter]
+        followed.extend(plugin.num_captured
+                        for plugin in self._file_plugins()
+                        if hasattr(plugin, 'num_captured'))
+
+        with self._burst_lock:
+            self._followed = tuple(followed)
+            self._counts = {sig: sig.get() for sig in self._followed}
+
+        for sig in self._followed:
+            sig.subscribe(self._count_changed, run=False)
+
+    def unstage(self):
+        super().unstage()
+        self._acquisition_signal.clear_sub(self._acquire_changed)
+        for sig in self._followed:
+            sig.clear_sub(self._count_changed)
+        self._followed = ()
+
+    def trigger(self):
+        "Trigger a burst of acquisitions."
+        if self._staged != Staged.yes:
+            raise RuntimeError("This detector is not ready to trigger."
+                               "Call the stage() method before triggering.")
+
+        with self._burst_lock:
+            self._status = status = DeviceStatus(self)
+            # The cam counter restarts from zero with each acquisition
+            self._counts[self.cam.num_images_counter] = 0
+            self._baselines = dict(self._counts)
+
+        self._acquisition_signal.put(1, wait=False)
+        return status
+
+    def _frames_landed(self):
+        "Frames counted by every followed signal since the trigger"
+        landed = min(self._counts[sig] - self._baselines.get(sig, 0)
+                     for sig in self._followed)
+        return max(min(landed, self._num_frames), 0)
+
+    def _count_changed(self, obj=None, value=None, **kwargs):
+        "This is called when a followed frame counter changes."
+        with self._burst_lock:
+            self._counts[obj] = value
+
+    def _acquire_changed(self, value=None, old_value=None, **kwargs):
+        "This is called when the 'acquire' signal changes."
+        if self._status is None:
+            return
+        if (old_value == 1) and (value == 0):
+            # Negative-going edge means the burst just finished. Catch up
+            # on the frame counters away from the monitor callback thread.
+            get_scheduler().call_soon(self._burst_finished, self._status)
+
+    def _burst_finished(self, status):
+        counts = {sig: sig.get() for sig in self._followed}
+        with self._burst_lock:
+            if status is not self._status:
+                return
+
+            self._counts.update(counts)
+            landed = self._frames_landed()
+            self._status = None
+
+        if landed:
+            # one datum for the frames of the burst
+            self.dispatch(self._image_name, ttime.time())
+
+        success = (landed >= self._num_frames)
+        if not success:
+            logger.error('%s: burst finished with %d of %d frames',
+                         self.name, landed, self._num_frames)
+        status._finished(success=success)
+
+
+class PipelinedTrigger(SingleTrigger):
+    """
+    This trigger mixin class overlaps the readout of one frame with the
+    exposure of the next.
+
+    The status returned by `trigger` finishes as soon as exposure ends (when
+    the cam `detector_state` leaves the exposing state), rather than once the
+    frame has been read out and saved, so that the next point of a step scan
+    can be moved to and triggered during readout. If the previous
+    acquisition is still in progress, the cam is re-armed as soon as it
+    finishes. Readout is tracked separately, by the `array_counter` of each
+    file plugin: `wait_for_readout` waits for outstanding frames, and
+    unstage does so before restoring settings.
+
+    For detectors which do not report an exposing state, the status finishes
+    when acquisition does, as with SingleTrigger.
+
+    Example
+    -------
+    >>> class MyDetector(PipelinedTrigger, SimDetector):
+    ...     pass
+    >>> det = MyDetector('..pv..')
+    """
+    def __init__(self, *args, exposing_state=1, readout_timeout=10.0,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exposing_state = exposing_state
+        self.readout_timeout = readout_timeout
+
+        self._pipeline_cond = threading.Condition(threading.RLock())
+        self._acquiring = False
+        self._pending_status = None
+        self._followed = ()
+        self._counts = {}
+        self._baselines = {}
+        self._triggered = 0
+        self._acquisitions_done = 0
+
+    def stage(self):
+        super().stage()
+
+        followed = [plugin.array_counter for plugin in self._file_plugins()
+                    if hasattr(plugin, 'array_counter')]
+        with self._pipeline_cond:
+            self._acquiring = False
+            self._pending_status = None
+            self._status = None
+            self._triggered = 0
+            self._acquisitions_done = 0
+            self._followed = tuple(followed)
+            self._counts = {sig: sig.get() for sig in followed}
+            self._baselines = dict(self._counts)
+
+        for sig in self._followed:
+            sig.subscribe(self._count_changed, run=False)
+        self.cam.detector_state.subscribe(self._state_changed, run=False)
+
+    def unstage(self):
+        if not self.wait_for_readout(self.readout_timeout):
+            logger.warning('%s: unstaging with %d frame(s) not read out',
+                           self.name, self.readouts_pending)
+
+        self.cam.detector_state.clear_sub(self._state_changed)
+        for sig in self._followed:
+            sig.clear_sub(self._count_changed)
+        self._followed = ()
+        super().unstage()
+
+    def trigger(self):
+        "Trigger one acquisition, finishing when exposure ends."
+        if self._staged != Staged.yes:
+            raise RuntimeError("This detector is not ready to trigger."
+                               "Call the stage() method before triggering.")
+
+        status = DeviceStatus(self)
+        with self._pipeline_cond:
+            self._triggered += 1
+            if self._acquiring:
+                # re-arm as soon as the previous acquisition finishes
+                self._pending_status = status
+            else:
+                self._arm(status)
+
+        self.dispatch(self._image_name, ttime.time())
+        return status
+
+    def _arm(self, status):
+        "Start acquisition of the frame for status"
+        with self._pipeline_cond:
+            self._status = status
+            self._acquiring = True
+
+        self._acquisition_signal.put(1, wait=False)
+
+    @property
+    def frames_read_out(self):
+        "Frames read out by every file plugin since staging"
+        with self._pipeline_cond:
+            if not self._followed:
+                # without file plugins, readout ends with acquisition
+                return self._acquisitions_done
+
+            return min(self._counts[sig] - self._baselines[sig]
+                       for sig in self._followed)
+
+    @property
+    def readouts_pending(self):
+        "Frames triggered which have not yet been read out"
+        with self._pipeline_cond:
+            return max(self._triggered - self.frames_read_out, 0)
+
+    def wait_for_readout(self, timeout=None):
+        "Wait for all triggered frames to be read out, returning success"
+        with self._pipeline_cond:
+            return self._pipeline_cond.wait_for(
+                lambda: self._triggered <= self.frames_read_out, timeout)
+
+    def _finish_exposure(self):
+        "Exposure of the current frame ended"
+        with self._pipeline_cond:
+            status, self._status = self._status, None
+
+        if status is not None:
+            status._finished()
+
+    def _state_changed(self, value=None, old_value=None, **kwargs):
+        "This is called when the 'detector_state' signal changes."
+        if old_value == self.exposing_state and value != self.exposing_state:
+            self._finish_exposure()
+
+    def _count_changed(self, obj=None, value=None, **kwargs):
+        "This is called when a file plugin array counter changes."
+        with self._pipeline_cond:
+            self._counts[obj] = value
+            self._pipeline_cond.notify_all()
+
+    def _acquire_changed(self, value=None, old_value=None, **kwargs):
+        "This is called when the 'acquire' signal changes."
+        if not ((old_value == 1) and (value == 0)):
+            return
+
+        # For detectors which do not report an exposing state
+        self._finish_exposure()
+
+        with self._pipeline_cond:
+            self._acquisitions_done += 1
+            pending, self._pending_status = self._pending_status, None
+            # still acquiring, if re-arming for a pending trigger
+            self._acquiring = (pending is not None)
+            self._pipeline_cond.notify_all()
+
+        if pending is not None:
+            # the put must not be made from the monitor callback
+            get_scheduler().call_soon(self._arm, pending)
@@ -18,6 +18,38 @@ class Staged(Enum):
     partially = 'partially'
 
 
+class _LazyDocstring:
+    '''The docstring of a component, created on first access
+
+    Creating docstrings (e.g., from the area detector documentation) for
+    every component of every device class is a significant part of import
+    time, when few are ever read.
+    '''
+    def __init__(self, class_doc):
+        self.class_doc = class_doc
+
+    @classmethod
+    def install(cls, component_class):
+        '''Make the docstrings of component_class instances lazy'''
+        doc = component_class.__dict__.get('__doc__')
+        if not isinstance(doc, cls):
+            component_class.__doc__ = cls(doc)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.class_doc
+
+        doc = instance.__dict__.get('_docstring')
+        parent = instance.__dict__.get('_doc_parent')
+        if doc is None and parent is not None:
+            doc = instance.make_docstring(parent)
+            instance._docstring = doc
+        return doc
+
+    def __set__(self, instance, value):
+        instance._docstring = value
+
+
 class Component:
     '''A descriptor representing a device component (or signal)
 
@@ -106,6 +138,9 @@ class Component:
         for kw, val in list(kwargs.items()):
             kwargs[kw] = self.maybe_add_prefix(instance, kw, val)
 
+        if instance.lazy_unused and issubclass(self.cls, Device):
+            kwargs.setdefault('lazy_unused', True)
+
         if self.suffix is not None:
             pv_name = self.maybe_add_prefix(instance, 'suffix', self.suffix)
             cpt_inst = self.cls(pv_name, parent=instance, **kwargs)
@@ -300,7 +335,7 @@ class DynamicDeviceComponent:
         cls = type(clsname, (Device, ), clsdict)
         return cls(instance.prefix, read_attrs=list(read_attrs),
                    name='{}_{}'.format(instance.name, self.attr),
-                   parent=instance)
+                   parent=instance, lazy_unused=instance.lazy_unused)
 
     def __get__(self, instance, owner):
         if instance is None:
@@ -360,9 +395,12 @@ class ComponentMeta(type):
         clsobj._device_tuple = namedtuple(name + 'Tuple', clsobj.signal_names,
                                           rename=True)
 
-        # Finally, create all the component docstrings
+        # Finally, mark the component docstrings to be created from this
+        # class on first access
         for cpt in clsobj._sig_attrs.values():
-            cpt.__doc__ = cpt.make_docstring(clsobj)
+            _LazyDocstring.install(type(cpt))
+            cpt.__doc__ = None
+            cpt._doc_parent = clsobj
 
         # List the attributes that are Devices (not Signals).
         # This list is used by stage/unstage. Only Devices need to be staged.
@@ -375,6 +413,19 @@ class ComponentMeta(type):
         return clsobj
 
 
+def _count_signals(cpt):
+    '''The number of signals a component instantiates, when not lazy'''
+    if isinstance(cpt, DynamicDeviceComponent):
+        sub_cpts = [cpt.create_attr(attr) for attr in cpt.defn]
+    elif issubclass(cpt.cls, Device):
+        sub_cpts = cpt.cls._sig_attrs.values()
+    else:
+        return 1
+
+    return sum(_count_signals(sub_cpt) for sub_cpt in sub_cpts
+               if not sub_cpt.lazy)
+
+
 # These stub 'Interface' classes are the apex of the mro heirarchy for
 # their respective methods. They make multiple interitance more
 # forgiving, and let us define classes that customize these methods
@@ -520,12 +571,18 @@ class Device(BlueskyInterface, OphydObject, metaclass=ComponentMeta):
         The name of the device
     parent : instance or None
         The instance of the parent device, if applicable
+    lazy_unused : bool, optional
+        Instantiate only the components which are read, in the
+        configuration, staged (sub-devices) or triggered, creating the others
+        on first access. Sub-devices are created in the same mode. Defaults
+        to the `lazy_unused` class attribute.
     """
 
     SUB_ACQ_DONE = 'acq_done'  # requested acquire
+    lazy_unused = False
 
     def __init__(self, prefix, *, read_attrs=None, configuration_attrs=None,
-                 name=None, parent=None, **kwargs):
+                 name=None, parent=None, lazy_unused=None, **kwargs):
         # Store EpicsSignal objects (only created once they are accessed)
         self._signals = {}
 
@@ -548,9 +605,29 @@ class Device(BlueskyInterface, OphydObject, metaclass=ComponentMeta):
         self.read_attrs = list(read_attrs)
         self.configuration_attrs = list(configuration_attrs)
 
+        if lazy_unused is not None:
+            self.lazy_unused = lazy_unused
+
+        # Components left to be instantiated on first access
+        self._deferred_attrs = set()
+        if self.lazy_unused:
+            used = self._used_attrs()
+            self._deferred_attrs.update(attr for attr, cpt
+                                        in self._sig_attrs.items()
+                                        if not cpt.lazy and attr not in used)
+
         # Instantiate non-lazy signals
         [getattr(self, attr) for attr, cpt in self._sig_attrs.items()
-         if not cpt.lazy]
+         if not cpt.lazy and attr not in self._deferred_attrs]
+
+    def _used_attrs(self):
+        '''The components used by read, configuration, stage and trigger'''
+        used = set(attr.split('.')[0] for attr in
+                   self.read_attrs + self.configuration_attrs)
+        used.update(self._sub_devices)
+        used.update(attr for attr, cpt in self._sig_attrs.items()
+                    if cpt.trigger_value is not None)
+        return used
 
     def wait_for_connection(self, all_signals=False, timeout=2.0):
         '''Wait for signals to connect
@@ -558,12 +635,15 @@ class Device(BlueskyInterface, OphydObject, metaclass=ComponentMeta):
         Parameters
         ----------
         all_signals : bool, optional
-            Wait for all signals to connect (including lazy ones)
+            Wait for all signals to connect (including lazy ones, and those
+            not yet instantiated with `lazy_unused`)
         timeout : float or None
             Overall timeout
         '''
         names = [attr for attr, cpt in self._sig_attrs.items()
-                 if not cpt.lazy or all_signals]
+                 if all_signals or (not cpt.lazy and
+                                    (attr not in self._deferred_attrs or
+                                     attr in self._signals))]
 
         # Instantiate first to kickoff connection process
         signals = [getattr(self, name) for name in names]
@@ -619,6 +699,51 @@ class Device(BlueskyInterface, OphydObject, metaclass=ComponentMeta):
             else:
                 yield full_attr, sig
 
+    def get_deferred_signals(self, *, attr_prefix=None):
+        '''Yields the components not instantiated due to `lazy_unused`
+
+        This recurses throughout the instantiated device hierarchy.
+
+        Parameters
+        ----------
+        attr_prefix : string, optional
+            The attribute prefix. If None, defaults to self.name
+
+        Yields
+        ------
+            (fully_qualified_attribute_name, component)
+        '''
+        if attr_prefix is None:
+            attr_prefix = self.name
+
+        for attr, cpt in self._sig_attrs.items():
+            full_attr = '{}.{}'.format(attr_prefix, attr)
+            if attr in self._signals:
+                sig = self._signals[attr]
+                if isinstance(sig, Device):
+                    yield from sig.get_deferred_signals(attr_prefix=full_attr)
+            elif attr in self._deferred_attrs:
+                yield full_attr, cpt
+
+    def deferred_report(self):
+        '''Counts of the signals instantiated and avoided with `lazy_unused`
+
+        Returns
+        -------
+        report : OrderedDict
+            `instantiated`: the number of signals instantiated,
+            `avoided`: the number of signals which would otherwise have
+            been instantiated, and `deferred`: the attribute names of the
+            components not instantiated
+        '''
+        deferred = list(self.get_deferred_signals())
+        instantiated = sum(1 for attr, sig in self.get_instantiated_signals())
+        avoided = sum(_count_signals(cpt) for attr, cpt in deferred)
+        return OrderedDict([('instantiated', instantiated),
+                            ('avoided', avoided),
+                            ('deferred', [attr for attr, cpt in deferred]),
+                            ])
+
     @property
     def connected(self):
         return all(signal.connected for name, signal in self._signals.items())
@@ -5,7 +5,7 @@ from epics.pv import fmt_time
 from .signal import (EpicsSignal, EpicsSignalRO)
 from .utils import DisconnectedError
 from .utils.epics_pvs import raise_if_disconnected
-from .positioner import PositionerBase
+from .positioner import (PositionerBase, move_time)
 from .device import (Device, Component as Cpt)
 from .status import wait as status_wait
 from enum import Enum
@@ -39,23 +39,33 @@ class EpicsMotor(Device, PositionerBase):
         The amount of time to wait after moves to report status completion
     timeout : float, optional
         The default timeout to use for motion requests, in seconds.
+    settle_tolerance : float, optional
+        If set, report status completion as soon as the readback stays within
+        +/- this tolerance for `settle_dwell` seconds, waiting at most
+        `settle_time`
+    settle_dwell : float, optional
+        The amount of time the readback must be stable for, when
+        `settle_tolerance` is set
+    auto_timeout : bool, optional
+        If set, moves requested without a timeout are given one based on the
+        predicted move time (see `time_to_target`)
     '''
     user_offset = Cpt(EpicsSignal, '.OFF')
-    user_readback = Cpt(EpicsSignalRO, '.RBV')
+    user_readback = Cpt(EpicsSignalRO, '.RBV', auto_monitor=True)
     user_setpoint = Cpt(EpicsSignal, '.VAL', limits=True)
     motor_egu = Cpt(EpicsSignal, '.EGU')
     motor_is_moving = Cpt(EpicsSignalRO, '.MOVN')
-    motor_done_move = Cpt(EpicsSignalRO, '.DMOV')
+    motor_done_move = Cpt(EpicsSignalRO, '.DMOV', auto_monitor=True)
     motor_stop = Cpt(EpicsSignal, '.STOP')
     offset_freeze_switch = Cpt(EpicsSignal, '.FOFF')
     velocity = Cpt(EpicsSignal, '.VELO')
     acceleration = Cpt(EpicsSignal, '.ACCL')
     set_use_switch = Cpt(EpicsSignal, '.SET')
-    high_limit_switch = Cpt(EpicsSignal, '.HLS')
-    low_limit_switch = Cpt(EpicsSignal, '.LLS')
+    high_limit_switch = Cpt(EpicsSignal, '.HLS', auto_monitor=True)
+    low_limit_switch = Cpt(EpicsSignal, '.LLS', auto_monitor=True)
     home_forward = Cpt(EpicsSignal, '.HOMF')
     home_reverse = Cpt(EpicsSignal, '.HOMR')
-    direction_of_travel = Cpt(EpicsSignal, '.TDIR')
+    direction_of_travel = Cpt(EpicsSignal, '.TDIR', auto_monitor=True)
 
     def __init__(self, prefix, *, read_attrs=None, configuration_attrs=None,
                  name=None, parent=None, **kwargs):
@@ -98,11 +108,14 @@ class EpicsMotor(Device, PositionerBase):
     def moving(self):
         '''Whether or not the motor is moving
 
+        This is determined from the monitored done-moving (DMOV) state, and
+        does not require a channel access round trip.
+
         Returns
         -------
         moving : bool
         '''
-        return bool(self.motor_is_moving.get(use_monitor=False))
+        return self._moving
 
     @raise_if_disconnected
     def stop(self):
@@ -164,6 +177,21 @@ class EpicsMotor(Device, PositionerBase):
         '''
         return self._position
 
+    @raise_if_disconnected
+    def time_to_target(self, position):
+        '''Predicted time to move from the current position to `position`
+
+        This is based on the velocity (VELO) and acceleration time (ACCL) of
+        the motor record, and does not include backlash correction.
+
+        Returns
+        -------
+        move_time : float
+            The predicted move time in seconds, not including settling
+        '''
+        return move_time(position - self.position, self.velocity.get(),
+                         self.acceleration.get())
+
     @raise_if_disconnected
     def set_current_position(self, pos):
         '''Configure the motor user position to the given value
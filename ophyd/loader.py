@@ -0,0 +1,249 @@
+'''
+:mod:`ophyd.loader` - Bulk device loading
+=========================================
+
+.. module:: ophyd.loader
+   :synopsis: Build devices from a declarative specification, connecting
+              them all at once
+'''
+
+import importlib
+import logging
+import threading
+import time as ttime
+from collections import OrderedDict
+
+import epics
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['load_devices', 'LoadReport']
+
+
+def _resolve_class(cls):
+    '''A class, or the class named by a 'module.ClassName' string'''
+    if not isinstance(cls, str):
+        return cls
+
+    module_name, _, class_name = cls.rpartition('.')
+    if not module_name:
+        raise ValueError('Class must be given as module.ClassName: '
+                         '{!r}'.format(cls))
+
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+def _unconnected(obj):
+    '''The PV names (or attributes) of the unconnected signals of obj'''
+    if hasattr(obj, '_get_unconnected'):
+        return list(obj._get_unconnected())
+    if not obj.connected:
+        return [getattr(obj, 'pvname', obj.name)]
+    return []
+
+
+class LoadReport:
+    '''The outcome of `load_devices`
+
+    Attributes
+    ----------
+    devices : OrderedDict
+        Device name to device, for all devices which were built (whether
+        or not they connected)
+    failed : OrderedDict
+        Device name to the exception raised when building it
+    connect_times : OrderedDict
+        Device name to the time (in seconds, from the start of the
+        connection wait) at which all of its signals were connected
+    unconnected : OrderedDict
+        Device name to the list of its unconnected signals, at the deadline
+    elapsed : float
+        Total time taken
+    '''
+
+    def __init__(self):
+        self.devices = OrderedDict()
+        self.failed = OrderedDict()
+        self.connect_times = OrderedDict()
+        self.unconnected = OrderedDict()
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        '''All devices were built and connected'''
+        return not (self.failed or self.unconnected)
+
+    def summary(self, max_pvs=5):
+        '''A multi-line, human readable summary
+
+        Parameters
+        ----------
+        max_pvs : int, optional
+            The number of unconnected signals listed per device
+        '''
+        lines = ['{} devices built, {} connected, {} failed in {:.2f} s'
+                 ''.format(len(self.devices), len(self.connect_times),
+                           len(self.failed), self.elapsed)]
+
+        for name, ex in self.failed.items():
+            lines.append('  {}: failed to build: {!r}'.format(name, ex))
+
+        for name, unconnected in self.unconnected.items():
+            listed = ', '.join(unconnected[:max_pvs])
+            if len(unconnected) > max_pvs:
+                listed += ', ...'
+            lines.append('  {}: {} unconnected: {}'
+                         ''.format(name, len(unconnected), listed))
+
+        slowest = sorted(self.connect_times.items(), key=lambda item: -item[1])
+        for name, elapsed in slowest[:5]:
+            lines.append('  {}: connected in {:.3f} s'.format(name, elapsed))
+
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(devices={1}, failed={2}, '
+                'unconnected={3}, elapsed={0.elapsed:.2f})'
+                ''.format(self, len(self.devices), len(self.failed),
+                          len(self.unconnected)))
+
+
+def _normalize_spec(spec):
+    '''A list of (name, class, prefix, kwargs) from a specification'''
+    if isinstance(spec, dict):
+        items = []
+        for name, entry in spec.items():
+            entry = dict(entry)
+            entry.setdefault('name', name)
+            items.append(entry)
+        spec = items
+
+    normalized = []
+    for entry in spec:
+        entry = dict(entry)
+        try:
+            cls = entry.pop('class')
+            name = entry.pop('name')
+        except KeyError as ex:
+            raise ValueError('Device specification is missing {}: {!r}'
+                             ''.format(ex, entry))
+
+        prefix = entry.pop('prefix', None)
+        kwargs = dict(entry.pop('kwargs', {}))
+        if entry:
+            raise ValueError('Unknown keys in the specification of {}: {}'
+                             ''.format(name, ', '.join(entry)))
+
+        normalized.append((name, cls, prefix, kwargs))
+
+    names = [name for name, cls, prefix, kwargs in normalized]
+    if len(set(names)) != len(names):
+        raise ValueError('Device names must be unique')
+
+    return normalized
+
+
+def load_devices(spec, *, timeout=10.0, threads=8, poll=0.05):
+    '''Build devices from a specification and connect them all at once
+
+    Devices are built in a pool of threads; a device which fails to build
+    is reported, rather than stopping the others. Building a device starts
+    the connection of its signals, so all connections proceed together, and
+    are then waited on with a single deadline.
+
+    Parameters
+    ----------
+    spec : list of dict, or dict
+        Each entry has a 'class' (a class or 'module.ClassName' string), a
+        'name', and optionally a 'prefix' and 'kwargs' for the class. A
+        dict maps the names to entries.
+    timeout : float, optional
+        The overall time (in seconds) allowed for connecting
+    threads : int, optional
+        The number of threads building devices
+    poll : float, optional
+        The connection polling period
+
+    Returns
+    -------
+    report : LoadReport
+
+    Example
+    -------
+    >>> report = load_devices([
+    ...     {'class': 'ophyd.EpicsMotor', 'name': 'm1',
+    ...      'prefix': 'XF:31IDA-OP{Tbl-Ax:X1}Mtr'},
+    ...     {'class': 'ophyd.EpicsScaler', 'name': 'sclr',
+    ...      'prefix': 'XF:03IDC-ES{Sclr:2}',
+    ...      'kwargs': {'read_attrs': ['channels']}},
+    ... ])
+    >>> print(report.summary())
+    >>> m1 = report.devices['m1']
+    '''
+    entries = _normalize_spec(spec)
+    report = LoadReport()
+    results = {}
+    lock = threading.Lock()
+    queue = list(reversed(entries))
+
+    t0 = ttime.monotonic()
+
+    def build():
+        epics.ca.use_initial_context()
+        while True:
+            with lock:
+                if not queue:
+                    return
+                name, cls, prefix, kwargs = queue.pop()
+
+            try:
+                cls = _resolve_class(cls)
+                if prefix is None:
+                    device = cls(name=name, **kwargs)
+                else:
+                    device = cls(prefix, name=name, **kwargs)
+            except Exception as ex:
+                logger.error('Failed to build %s', name, exc_info=ex)
+                device = ex
+
+            with lock:
+                results[name] = device
+
+    workers = [threading.Thread(target=build, daemon=True,
+                                name='load_devices_{}'.format(i))
+               for i in range(max(1, min(threads, len(entries))))]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # report in the order of the specification
+    for name, cls, prefix, kwargs in entries:
+        result = results[name]
+        if isinstance(result, Exception):
+            report.failed[name] = result
+        else:
+            report.devices[name] = result
+
+    t_connect = ttime.monotonic()
+    deadline = t_connect + timeout
+    pending = OrderedDict(report.devices)
+    while pending:
+        now = ttime.monotonic()
+        for name, device in list(pending.items()):
+            if device.connected:
+                report.connect_times[name] = now - t_connect
+                del pending[name]
+
+        if not pending or now >= deadline:
+            break
+        ttime.sleep(poll)
+
+    for name, device in pending.items():
+        report.unconnected[name] = _unconnected(device)
+        logger.warning('%s: unconnected: %s', name,
+                       ', '.join(report.unconnected[name]))
+
+    report.elapsed = ttime.monotonic() - t0
+    return report
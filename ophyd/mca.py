@@ -1,12 +1,16 @@
 
 import logging
+import threading
 
 from collections import OrderedDict
 
-from .signal import (EpicsSignal, EpicsSignalRO)
+import numpy as np
+
+from .signal import (Signal, EpicsSignal, EpicsSignalRO,
+                     EpicsSignalWithRBV as SignalWithRBV)
 from .device import Device
 from .device import Component as C, DynamicDeviceComponent as DDC
-from .areadetector import EpicsSignalWithRBV as SignalWithRBV
+from .utils import ReadOnlyError
 
 
 logger = logging.getLogger(__name__)
@@ -57,6 +61,189 @@ def add_rois(range_, **kwargs):
     return defn
 
 
+def roi_sums(spectra, lo_chan, hi_chan, bkgnd_chans):
+    '''Integrate regions of interest of one or more spectra
+
+    All ROIs (and all spectra) are computed at once from the cumulative sum
+    of the spectra. Net counts follow the MCA record: the background is the
+    average of the bkgnd_chans channels at each end of the ROI, times the
+    width of the ROI. ROIs with lo_chan < 0 or hi_chan < lo_chan are
+    disabled, and count 0.
+
+    Parameters
+    ----------
+    spectra : array_like
+        Spectra of shape (..., num_channels)
+    lo_chan, hi_chan : array_like
+        The first and last (inclusive) channel of each ROI
+    bkgnd_chans : array_like
+        The number of background channels at each end of each ROI. No
+        background is subtracted if 0 or less.
+
+    Returns
+    -------
+    count, net_count : np.ndarray
+        Arrays of shape (..., num_rois)
+    '''
+    spectra = np.asarray(spectra, dtype=float)
+    nchan = spectra.shape[-1]
+    lo = np.asarray(lo_chan, dtype=int)
+    hi = np.minimum(np.asarray(hi_chan, dtype=int), nchan - 1)
+    bg = np.asarray(bkgnd_chans, dtype=int)
+
+    enabled = (lo >= 0) & (hi >= lo)
+    lo = np.where(enabled, lo, 0)
+    hi = np.where(enabled, hi, 0)
+    width = hi - lo + 1
+    bg = np.clip(bg, 0, width)
+
+    cumsum = np.zeros(spectra.shape[:-1] + (nchan + 1, ))
+    np.cumsum(spectra, axis=-1, out=cumsum[..., 1:])
+
+    count = cumsum[..., hi + 1] - cumsum[..., lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        left = (cumsum[..., lo + bg] - cumsum[..., lo]) / bg
+        right = (cumsum[..., hi + 1] - cumsum[..., hi + 1 - bg]) / bg
+
+    background = np.where(bg > 0, 0.5 * (left + right) * width, 0.0)
+    net_count = count - background
+
+    count[..., ~enabled] = 0
+    net_count[..., ~enabled] = 0
+    return count, net_count
+
+
+class SpectrumROIs(Device):
+    '''ROI counts computed from the spectrum of the parent MCA
+
+    Rather than reading the count and net count PVs of each ROI, the
+    spectrum is read once and all ROIs are integrated with `roi_sums`. The
+    ROI table (lo_chan, hi_chan, bkgnd_chans and label of each ROI) is read
+    from the ROIs of the parent when first staged, and cached; call
+    `refresh` to read it again, or `set_roi` to define ROIs locally without
+    touching the IOC.
+
+    Each enabled ROI is read as `{name}_roiN_count` and
+    `{name}_roiN_net_count`.
+
+    Example
+    -------
+    >>> class MyMCA(EpicsMCA):
+    ...     fast_rois = Cpt(SpectrumROIs, '')
+    >>> mca = MyMCA(prefix, name='mca',
+    ...             read_attrs=['preset_real_time', 'fast_rois'])
+    '''
+
+    def __init__(self, prefix='', *, read_attrs=None,
+                 configuration_attrs=None, name=None, parent=None, **kwargs):
+        super().__init__(prefix, read_attrs=read_attrs,
+                         configuration_attrs=configuration_attrs,
+                         name=name, parent=parent, **kwargs)
+
+        self._lock = threading.RLock()
+        self._table = None
+
+    @property
+    def spectrum(self):
+        '''The spectrum signal of the parent'''
+        return self.parent.spectrum
+
+    def refresh(self):
+        '''Read the ROI table from the ROIs of the parent'''
+        rois = self.parent.rois
+        table = OrderedDict()
+        for attr in rois.signal_names:
+            roi = getattr(rois, attr)
+            table[int(attr[3:])] = (int(roi.lo_chan.get()),
+                                    int(roi.hi_chan.get()),
+                                    int(roi.bkgnd_chans.get()),
+                                    roi.label.get(as_string=True))
+
+        self.table = table
+
+    @property
+    def table(self):
+        '''The cached ROI table
+
+        An OrderedDict of ROI number to (lo_chan, hi_chan, bkgnd_chans,
+        label), or None if not yet loaded
+        '''
+        with self._lock:
+            if self._table is None:
+                return None
+            return OrderedDict(self._table)
+
+    @table.setter
+    def table(self, table):
+        table = OrderedDict((roi, entry) for roi, entry in table.items()
+                            if 0 <= entry[0] <= entry[1])
+
+        with self._lock:
+            self._table = table
+            self._numbers = list(table.keys())
+            entries = list(table.values())
+            self._lo = np.array([entry[0] for entry in entries], dtype=int)
+            self._hi = np.array([entry[1] for entry in entries], dtype=int)
+            self._bg = np.array([entry[2] for entry in entries], dtype=int)
+
+    def set_roi(self, roi, lo_chan, hi_chan, bkgnd_chans=1, label=''):
+        '''Define (or replace) an ROI in the cached table only'''
+        with self._lock:
+            table = self._table if self._table is not None else OrderedDict()
+            table = OrderedDict(table)
+            table[roi] = (lo_chan, hi_chan, bkgnd_chans, label)
+            self.table = OrderedDict(sorted(table.items()))
+
+    def stage(self):
+        if self._table is None:
+            self.refresh()
+        return super().stage()
+
+    def compute(self, spectrum):
+        '''ROI counts and net counts of a spectrum, per the cached table'''
+        with self._lock:
+            return roi_sums(spectrum, self._lo, self._hi, self._bg)
+
+    def _keys(self):
+        for roi in self._numbers:
+            prefix = '{}_roi{}'.format(self.name, roi)
+            yield roi, prefix + '_count', prefix + '_net_count'
+
+    def read(self):
+        res = super().read()
+        if self._table is None:
+            self.refresh()
+
+        spectrum = self.spectrum.get()
+        timestamp = self.spectrum.timestamp
+        with self._lock:
+            count, net_count = self.compute(spectrum)
+            for i, (roi, count_key, net_key) in enumerate(self._keys()):
+                res[count_key] = {'value': float(count[i]),
+                                  'timestamp': timestamp}
+                res[net_key] = {'value': float(net_count[i]),
+                                'timestamp': timestamp}
+        return res
+
+    def describe(self):
+        res = super().describe()
+        if self._table is None:
+            self.refresh()
+
+        source = getattr(self.spectrum, 'pvname', self.spectrum.name)
+        with self._lock:
+            for i, (roi, count_key, net_key) in enumerate(self._keys()):
+                lo, hi, bg, label = self._table[roi]
+                for key in (count_key, net_key):
+                    res[key] = {'source': 'PY:{}[{}:{}]'.format(source, lo,
+                                                                hi + 1),
+                                'dtype': 'number',
+                                'shape': [],
+                                'roi_label': label,
+                                }
+        return res
+
+
 class EpicsMCARecord(Device):
     '''SynApps MCA Record interface'''
     stop_signal = C(EpicsSignal, '.STOP')
@@ -144,3 +331,151 @@ class EpicsDXP(Device):
         super().__init__(prefix, read_attrs=read_attrs,
                          configuration_attrs=configuration_attrs,
                          name=name, parent=parent, **kwargs)
+
+
+def add_dxp_elements(range_, **kwargs):
+    '''Add EpicsDXP elements dxpN (with suffix 'dxpN:') for N in range_'''
+    defn = OrderedDict()
+    for element in range_:
+        defn['dxp{}'.format(element)] = (EpicsDXP, 'dxp{}:'.format(element),
+                                         kwargs)
+    return defn
+
+
+def add_mca_elements(range_, **kwargs):
+    '''Add EpicsMCARecord elements mcaN (with suffix 'mcaN') for N in range_'''
+    defn = OrderedDict()
+    for element in range_:
+        defn['mca{}'.format(element)] = (EpicsMCARecord,
+                                         'mca{}'.format(element), kwargs)
+    return defn
+
+
+def dead_time_factors(input_count_rate, output_count_rate):
+    '''Dead-time correction factors (ICR / OCR) of any number of elements
+
+    Elements with no output counts are left uncorrected (factor 1).
+    '''
+    icr = np.asarray(input_count_rate, dtype=float)
+    ocr = np.asarray(output_count_rate, dtype=float)
+    factors = np.ones(np.broadcast(icr, ocr).shape)
+    np.divide(icr, ocr, out=factors, where=ocr > 0)
+    return factors
+
+
+class DXPCorrectedSum(Signal):
+    '''The dead-time corrected spectrum, summed over all elements (read-only)
+
+    The spectra and count rates of all elements of the parent
+    EpicsDXPMultiElement are read on every get().
+    '''
+
+    def get(self, **kwargs):
+        self._readback = self.parent.update()
+        self._timestamp = self.parent.timestamp
+        return self._readback
+
+    def put(self, value, **kwargs):
+        raise ReadOnlyError('{} is read-only'.format(self.name))
+
+    def describe(self):
+        value = self.get()
+        source = self.parent.prefix or self.name
+        return {self.name: {'source': 'PY:{}'.format(source),
+                            'dtype': 'array',
+                            'shape': list(value.shape),
+                            'num_elements': self.parent.num_elements,
+                            }}
+
+
+class EpicsDXPMultiElement(Device):
+    '''A multi-element DXP detector, e.g. an xMAP, as one device
+
+    The spectra and input/output count rates of every element are read into
+    stacked numpy arrays (`spectra`, `input_count_rate` and
+    `output_count_rate`), from which all elements are dead-time corrected
+    and summed in one step. The summed, corrected spectrum is the
+    `corrected_sum` signal.
+
+    Four elements (one xMAP module) are defined by default; define `dxps`
+    and `mcas` in a subclass for other detectors:
+
+    >>> class Vortex7(EpicsDXPMultiElement):
+    ...     dxps = DDC(add_dxp_elements(range(1, 8)))
+    ...     mcas = DDC(add_mca_elements(range(1, 8)))
+    '''
+    dxps = DDC(add_dxp_elements(range(1, 5)))
+    mcas = DDC(add_mca_elements(range(1, 5)))
+
+    corrected_sum = C(DXPCorrectedSum)
+
+    def __init__(self, prefix, *, read_attrs=None, configuration_attrs=None,
+                 name=None, parent=None, **kwargs):
+
+        if read_attrs is None:
+            read_attrs = ['corrected_sum']
+
+        if configuration_attrs is None:
+            configuration_attrs = []
+
+        super().__init__(prefix, read_attrs=read_attrs,
+                         configuration_attrs=configuration_attrs,
+                         name=name, parent=parent, **kwargs)
+
+        self._elements = [(getattr(self.dxps, dxp), getattr(self.mcas, mca))
+                          for dxp, mca in zip(self.dxps.signal_names,
+                                              self.mcas.signal_names)]
+
+        num = len(self._elements)
+        self.spectra = None
+        self.input_count_rate = np.zeros(num)
+        self.output_count_rate = np.zeros(num)
+        self.timestamp = None
+
+    @property
+    def num_elements(self):
+        '''The number of elements'''
+        return len(self._elements)
+
+    def _read_elements(self):
+        '''Read the spectra and count rates into the stacked arrays'''
+        spectra = [mca.spectrum.get() for dxp, mca in self._elements]
+        lengths = set(len(spectrum) for spectrum in spectra)
+        if len(lengths) > 1:
+            raise ValueError('{}: element spectra differ in length: {}'
+                             ''.format(self.name,
+                                       [len(spectrum) for spectrum in spectra]))
+
+        shape = (self.num_elements, lengths.pop() if lengths else 0)
+        if self.spectra is None or self.spectra.shape != shape:
+            self.spectra = np.zeros(shape)
+
+        timestamp = 0.0
+        for i, (dxp, mca) in enumerate(self._elements):
+            self.spectra[i] = spectra[i]
+            self.input_count_rate[i] = dxp.input_count_rate.get()
+            self.output_count_rate[i] = dxp.output_count_rate.get()
+            timestamp = max(timestamp, mca.spectrum.timestamp)
+
+        self.timestamp = timestamp
+
+    @property
+    def dead_time_factors(self):
+        '''The dead-time correction factor of each element, as last read'''
+        return dead_time_factors(self.input_count_rate,
+                                 self.output_count_rate)
+
+    def corrected_spectra(self):
+        '''The dead-time corrected spectrum of each element, as last read'''
+        return self.spectra * self.dead_time_factors[:, np.newaxis]
+
+    def update(self):
+        '''Read all elements, then correct and sum their spectra
+
+        Returns
+        -------
+        corrected_sum : np.ndarray
+        '''
+        self._read_elements()
+        # correction and sum across elements in a single product
+        return self.dead_time_factors.dot(self.spectra)
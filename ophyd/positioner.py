@@ -1,11 +1,18 @@
 import logging
+import math
+import threading
 import time
 from functools import partial
-from collections import OrderedDict
+from collections import (OrderedDict, deque)
+
+import numpy as np
 
 from .ophydobj import OphydObject
+from .signal import Signal
 from .status import (MoveStatus, wait as status_wait)
+from .telemetry import MotionRecorder
 from .utils.epics_pvs import (data_type, data_shape)
+from .utils.scheduler import get_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +25,29 @@ class PositionerBase(OphydObject):
     Note: Subclasses should add an additional 'wait' keyword argument on the
     move method. The MoveStatus object returned from PositionerBase can then be
     waited on after the subclass finishes the motion configuration.
+
+    Parameters
+    ----------
+    name : str, optional
+        The name of the positioner
+    parent : instance or None
+        The instance of the parent device, if applicable
+    settle_time : float, optional
+        The amount of time to wait after moves to report status completion.
+        If `settle_tolerance` is set, this is the maximum amount of time to
+        wait.
+    timeout : float, optional
+        The default timeout to use for motion requests, in seconds.
+    settle_tolerance : float, optional
+        If set, use adaptive settling: status completion is reported as soon
+        as the readback stays within +/- this tolerance for `settle_dwell`
+        seconds (or `settle_time` elapses)
+    settle_dwell : float, optional
+        The amount of time the readback must be stable for, when
+        `settle_tolerance` is set
+    auto_timeout : bool, optional
+        If set, moves requested without a timeout (and with no default
+        timeout) are given one based on `time_to_target`
     '''
 
     SUB_START = 'start_moving'
@@ -26,8 +56,15 @@ class PositionerBase(OphydObject):
     _SUB_REQ_DONE = '_req_done'  # requested move finished subscription
     _default_sub = SUB_READBACK
 
+    # Number of recent moves kept for settle_stats
+    settle_history_length = 1000
+    # Automatic move timeouts are time_to_target * factor + margin
+    auto_timeout_factor = 2.0
+    auto_timeout_margin = 5.0
+
     def __init__(self, *, name=None, parent=None, settle_time=0.0,
-                 timeout=None, **kwargs):
+                 timeout=None, settle_tolerance=None, settle_dwell=0.0,
+                 auto_timeout=False, **kwargs):
         super().__init__(name=name, parent=parent, **kwargs)
 
         self._started_moving = False
@@ -35,6 +72,12 @@ class PositionerBase(OphydObject):
         self._position = None
         self._settle_time = settle_time
         self._timeout = timeout
+        self._settle_tolerance = settle_tolerance
+        self._settle_dwell = settle_dwell
+        self._settle_history = deque(maxlen=self.settle_history_length)
+        self._auto_timeout = bool(auto_timeout)
+        # An optional MotionRecorder (see `record_motion`)
+        self.motion_recorder = None
 
     @property
     def report(self):
@@ -51,6 +94,56 @@ class PositionerBase(OphydObject):
     def settle_time(self, settle_time):
         self._settle_time = settle_time
 
+    @property
+    def settle_tolerance(self):
+        '''Readback tolerance for adaptive settling
+
+        If None, the full settle_time is waited for after every move.
+        '''
+        return self._settle_tolerance
+
+    @settle_tolerance.setter
+    def settle_tolerance(self, tolerance):
+        self._settle_tolerance = tolerance
+
+    @property
+    def settle_dwell(self):
+        '''Amount of time the readback must be within the settle tolerance'''
+        return self._settle_dwell
+
+    @settle_dwell.setter
+    def settle_dwell(self, dwell):
+        self._settle_dwell = dwell
+
+    @property
+    def settle_stats(self):
+        '''Statistics on the settle time spent after recent successful moves
+
+        Returns
+        -------
+        stats : dict
+            Keys: count, total, mean, min, max (in seconds), and capped, the
+            number of moves which reached the maximum settle time before the
+            readback settled within tolerance.
+        '''
+        history = list(self._settle_history)
+        if not history:
+            return dict(count=0, total=0.0, mean=0.0, min=0.0, max=0.0,
+                        capped=0)
+
+        elapsed = np.array([elapsed for elapsed, capped in history])
+        return dict(count=len(elapsed),
+                    total=float(elapsed.sum()),
+                    mean=float(elapsed.mean()),
+                    min=float(elapsed.min()),
+                    max=float(elapsed.max()),
+                    capped=sum(capped for elapsed, capped in history),
+                    )
+
+    def reset_settle_stats(self):
+        '''Clear the settle time statistics'''
+        self._settle_history.clear()
+
     @property
     def timeout(self):
         '''Amount of time to wait before to considering a motion as failed'''
@@ -63,6 +156,45 @@ class PositionerBase(OphydObject):
         else:
             self._timeout = float(timeout)
 
+    @property
+    def auto_timeout(self):
+        '''Set move timeouts automatically from the predicted move time'''
+        return self._auto_timeout
+
+    @auto_timeout.setter
+    def auto_timeout(self, auto_timeout):
+        self._auto_timeout = bool(auto_timeout)
+
+    def time_to_target(self, position):
+        '''Predicted time to move from the current position to `position`
+
+        Parameters
+        ----------
+        position
+            The target position
+
+        Returns
+        -------
+        move_time : float or None
+            The predicted move time in seconds, not including settling, or
+            None if it cannot be predicted
+        '''
+        return None
+
+    def _auto_timeout_for(self, position):
+        '''Automatic move timeout for a move to position, or None'''
+        try:
+            move_time = self.time_to_target(position)
+        except Exception as ex:
+            logger.debug('%s failed to predict move time', self.name,
+                         exc_info=ex)
+            return None
+
+        if move_time is None:
+            return None
+
+        return move_time * self.auto_timeout_factor + self.auto_timeout_margin
+
     @property
     def egu(self):
         '''The engineering units (EGU) for positions'''
@@ -114,11 +246,19 @@ class PositionerBase(OphydObject):
 
         self.check_value(position)
 
+        if timeout is None and self._auto_timeout:
+            timeout = self._auto_timeout_for(position)
+
         self._run_subs(sub_type=self._SUB_REQ_DONE, success=False)
         self._reset_sub(self._SUB_REQ_DONE)
 
         status = MoveStatus(self, position, timeout=timeout,
-                            settle_time=self._settle_time)
+                            settle_time=self._settle_time,
+                            settle_tolerance=self._settle_tolerance,
+                            settle_dwell=self._settle_dwell)
+
+        if self.motion_recorder is not None:
+            self.motion_recorder.record_command(status)
 
         if moved_cb is not None:
             status.finished_cb = partial(moved_cb, obj=self)
@@ -139,6 +279,32 @@ class PositionerBase(OphydObject):
                        timestamp=timestamp)
         self._reset_sub(self._SUB_REQ_DONE)
 
+    def _move_settled(self, status):
+        '''Called by the MoveStatus once motion has completed and settled'''
+        if status.success:
+            self._settle_history.append((status.settle_elapsed,
+                                         status.settle_capped))
+
+        if self.motion_recorder is not None:
+            self.motion_recorder.record_settled(status)
+
+    def record_motion(self, **kwargs):
+        '''Start recording the timing of moves of this positioner
+
+        Parameters
+        ----------
+        **kwargs
+            Passed to `ophyd.telemetry.MotionRecorder`
+
+        Returns
+        -------
+        recorder : MotionRecorder
+        '''
+        if self.motion_recorder is not None:
+            self.motion_recorder.detach()
+
+        return MotionRecorder(self, **kwargs)
+
     def stop(self):
         '''Stops motion'''
         self._done_moving(success=False)
@@ -190,6 +356,10 @@ class PositionerBase(OphydObject):
         yield ('settle_time', self._settle_time)
         yield ('timeout', self._timeout)
 
+        if self._settle_tolerance is not None:
+            yield ('settle_tolerance', self._settle_tolerance)
+            yield ('settle_dwell', self._settle_dwell)
+
 
 class SoftPositioner(PositionerBase):
     '''A positioner which does not communicate with any hardware
@@ -206,6 +376,17 @@ class SoftPositioner(PositionerBase):
     source : str, optional
         Metadata indicating the source of this positioner's position. Defaults
         to 'computed'
+    settle_time : float, optional
+        The amount of time to wait after moves to report status completion
+    timeout : float, optional
+        The default timeout to use for motion requests, in seconds.
+    settle_tolerance : float, optional
+        If set, report status completion as soon as the readback stays within
+        +/- this tolerance for `settle_dwell` seconds, waiting at most
+        `settle_time`
+    settle_dwell : float, optional
+        The amount of time the readback must be stable for, when
+        `settle_tolerance` is set
     '''
 
     def __init__(self, *, egu='', limits=None, source='computed', **kwargs):
@@ -227,6 +408,10 @@ class SoftPositioner(PositionerBase):
         '''The engineering units (EGU) for positions'''
         return self._egu
 
+    def time_to_target(self, position):
+        '''SoftPositioners move instantly'''
+        return 0.0
+
     def _setup_move(self, position, status):
         '''Move requested to position
 
@@ -328,3 +513,262 @@ class SoftPositioner(PositionerBase):
 
     def describe_configuration(self):
         return OrderedDict()
+
+
+def move_time(distance, velocity, accel_time):
+    '''Duration of a move with a trapezoidal velocity profile
+
+    The positioner accelerates to `velocity` over `accel_time` seconds, as
+    with the motor record ACCL field. Moves too short to reach full velocity
+    follow a triangular profile.
+
+    Parameters
+    ----------
+    distance : float
+        Distance to move, in engineering units
+    velocity : float
+        The velocity, in engineering units per second
+    accel_time : float
+        Time to reach full velocity, in seconds
+
+    Returns
+    -------
+    move_time : float
+        The duration of the move, in seconds
+    '''
+    distance = abs(distance)
+    if distance == 0.0:
+        return 0.0
+    elif velocity <= 0.0:
+        raise ValueError('Velocity must be positive')
+    elif accel_time <= 0.0:
+        return distance / velocity
+    elif distance >= velocity * accel_time:
+        return distance / velocity + accel_time
+    else:
+        return 2.0 * math.sqrt(distance * accel_time / velocity)
+
+
+def velocity_for_move_time(distance, move_time, accel_time):
+    '''Velocity at which a trapezoidal-profile move takes `move_time`
+
+    This is the inverse of `move_time`, for a fixed acceleration time.
+
+    Parameters
+    ----------
+    distance : float
+        Distance to move, in engineering units
+    move_time : float
+        The desired duration of the move, in seconds
+    accel_time : float
+        Time to reach full velocity, in seconds
+
+    Returns
+    -------
+    velocity : float
+        The velocity, in engineering units per second
+    '''
+    distance = abs(distance)
+    if move_time <= 0.0:
+        raise ValueError('Move time must be positive')
+    elif accel_time <= 0.0:
+        return distance / move_time
+    elif move_time >= 2.0 * accel_time:
+        return distance / (move_time - accel_time)
+    else:
+        return 4.0 * distance * accel_time / move_time ** 2
+
+
+def _profile_distance(elapsed, distance, velocity, accel_time):
+    '''Distance covered after `elapsed` seconds of a trapezoidal move'''
+    if elapsed <= 0.0 or distance <= 0.0:
+        return 0.0
+    elif accel_time <= 0.0:
+        return min(velocity * elapsed, distance)
+
+    duration = move_time(distance, velocity, accel_time)
+    if elapsed >= duration:
+        return distance
+
+    accel = velocity / accel_time
+    ramp_time = min(accel_time, duration / 2.0)
+    if elapsed < ramp_time:
+        return 0.5 * accel * elapsed ** 2
+    elif elapsed < duration - ramp_time:
+        return 0.5 * accel * ramp_time ** 2 + accel * ramp_time * (elapsed -
+                                                                   ramp_time)
+    else:
+        return distance - 0.5 * accel * (duration - elapsed) ** 2
+
+
+class SimPositioner(SoftPositioner):
+    '''A SoftPositioner which simulates the kinematics of a motor
+
+    Unlike SoftPositioner, motion takes time: the position follows a
+    trapezoidal velocity profile, and readback events are emitted at
+    `update_rate` from the shared callback scheduler thread. Start, readback
+    and done events use the same subscription types as EpicsMotor, making this
+    useful for benchmarking scans and callback overhead without an IOC.
+
+    Parameters
+    ----------
+    velocity : float, optional
+        The velocity, in engineering units per second
+    acceleration : float, optional
+        Time to reach full velocity, in seconds (as with the motor record ACCL
+        field)
+    backlash : float, optional
+        Backlash distance (as with the motor record BDST field). Moves in the
+        direction opposite to its sign first overshoot the target by this
+        distance, and then approach it from the other side.
+    update_rate : float, optional
+        The readback update rate during motion, in Hz
+    init_pos : float, optional
+        The initial position
+    limits : (low_limit, high_limit)
+        Soft limits to use
+    egu : str, optional
+        Engineering units (EGU) for a position
+    source : str, optional
+        Metadata indicating the source of this positioner's position. Defaults
+        to 'simulated'
+    settle_time : float, optional
+        The amount of time to wait after moves to report status completion
+    timeout : float, optional
+        The default timeout to use for motion requests, in seconds.
+
+    Attributes
+    ----------
+    velocity : Signal
+        The velocity used for subsequent moves
+    acceleration : Signal
+        The acceleration time used for subsequent moves
+    '''
+
+    def __init__(self, *, velocity=1.0, acceleration=0.0, backlash=0.0,
+                 update_rate=10.0, init_pos=0.0, source='simulated',
+                 **kwargs):
+        super().__init__(source=source, **kwargs)
+
+        self.velocity = Signal(value=float(velocity), parent=self,
+                               name='{}_velocity'.format(self.name))
+        self.acceleration = Signal(value=float(acceleration), parent=self,
+                                   name='{}_acceleration'.format(self.name))
+        self.backlash = float(backlash)
+        self.update_rate = float(update_rate)
+
+        self._sim_lock = threading.RLock()
+        self._legs = []
+        self._move_t0 = None
+        self._pending_tick = None
+        self._set_position(init_pos)
+
+    def _plan_legs(self, start, target):
+        '''Split a move into (start, end, velocity, accel_time) legs'''
+        velocity = self.velocity.get()
+        accel_time = self.acceleration.get()
+        backlash = self.backlash
+
+        if backlash and (target - start) * backlash < 0:
+            # approach the target from the direction of the backlash sign
+            overshoot = target - backlash
+            return [(start, overshoot, velocity, accel_time),
+                    (overshoot, target, velocity, accel_time)]
+
+        return [(start, target, velocity, accel_time)]
+
+    def time_to_target(self, position):
+        '''Predicted time to move from the current position to `position`'''
+        return sum(move_time(end - start, velocity, accel_time)
+                   for start, end, velocity, accel_time
+                   in self._plan_legs(self.position, position))
+
+    def _sim_position(self, elapsed):
+        '''Simulated position at `elapsed` seconds into the current move
+
+        Returns
+        -------
+        position : float
+        finished : bool
+        '''
+        for start, end, velocity, accel_time in self._legs:
+            distance = abs(end - start)
+            duration = move_time(distance, velocity, accel_time)
+            if elapsed < duration:
+                moved = _profile_distance(elapsed, distance, velocity,
+                                          accel_time)
+                return start + math.copysign(moved, end - start), False
+
+            elapsed -= duration
+
+        return self._legs[-1][1], True
+
+    def _setup_move(self, position, status):
+        '''Start a simulated move to position'''
+        with self._sim_lock:
+            self._cancel_tick()
+
+            start = self._position
+            if start is None:
+                start = position
+
+            self._legs = self._plan_legs(start, position)
+            self._move_t0 = time.monotonic()
+            self._started_moving = True
+            self._moving = True
+
+        self._run_subs(sub_type=self.SUB_START, timestamp=time.time())
+        self._tick()
+
+    def _cancel_tick(self):
+        if self._pending_tick is not None:
+            self._pending_tick.cancel()
+            self._pending_tick = None
+
+    def _tick(self):
+        '''Scheduler callback: update the simulated position'''
+        with self._sim_lock:
+            if not self._moving:
+                return
+
+            elapsed = time.monotonic() - self._move_t0
+            position, finished = self._sim_position(elapsed)
+
+            if finished:
+                self._pending_tick = None
+                self._moving = False
+            else:
+                # tick at the update rate, and exactly at the end of motion
+                remaining = sum(move_time(end - start, velocity, accel)
+                                for start, end, velocity, accel
+                                in self._legs) - elapsed
+                delay = min(1.0 / self.update_rate, remaining)
+                self._pending_tick = get_scheduler().call_later(delay,
+                                                                self._tick)
+
+        self._set_position(position)
+
+        if finished:
+            self._done_moving()
+
+    def stop(self):
+        '''Stop motion at the current simulated position'''
+        with self._sim_lock:
+            was_moving = self._moving
+            self._cancel_tick()
+            if was_moving:
+                position, finished = self._sim_position(time.monotonic() -
+                                                        self._move_t0)
+                self._moving = False
+
+        if was_moving:
+            self._set_position(position)
+
+        super().stop()
+
+    def _repr_info(self):
+        yield from super()._repr_info()
+        yield ('velocity', self.velocity.get())
+        yield ('acceleration', self.acceleration.get())
+        yield ('backlash', self.backlash)
+        yield ('update_rate', self.update_rate)
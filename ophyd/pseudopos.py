@@ -15,8 +15,12 @@ import functools
 
 from collections import (OrderedDict, namedtuple, Sequence)
 
-from .utils import DisconnectedError
-from .positioner import (PositionerBase, SoftPositioner)
+import numpy as np
+
+from .utils import (DisconnectedError, LimitError, set_and_wait)
+from .utils.scheduler import get_scheduler
+from .positioner import (PositionerBase, SoftPositioner,
+                         velocity_for_move_time)
 from .device import Device
 from .status import (wait as status_wait)
 
@@ -120,6 +124,16 @@ class PseudoSingle(SoftPositioner):
         '''Stop motion on the PseudoPositioner'''
         return self._parent.stop()
 
+    def time_to_target(self, pos):
+        '''Predicted time to move this pseudo axis to a specific position
+
+        See `PseudoPositioner.time_to_target` for more information.
+        '''
+        target = list(self._parent.target)
+        target[self._idx] = pos
+        return self._parent.time_to_target(
+            self._parent.PseudoPosition(*target))
+
     @property
     def _started_moving(self):
         '''Has motion started since the motion request?
@@ -180,6 +194,44 @@ def position_argument_wrapper(type_):
 real_position_argument = position_argument_wrapper('real')
 pseudo_position_argument = position_argument_wrapper('pseudo')
 
+
+def position_array_wrapper(type_):
+    '''Wrapper to convert an array of positions to a PositionTuple of columns
+
+    The wrapped method receives a PositionTuple with one 1D array per axis,
+    and should return a PositionTuple of the same form. The result is then
+    converted back to the layout of the input (see `to_position_columns`).
+    '''
+    if type_ not in ('pseudo', 'real'):
+        raise ValueError("position_type should be either 'pseudo' or 'real'")
+
+    def wrapper(method):
+        @functools.wraps(method)
+        def wrapped(self, positions, **kwargs):
+            if type_ == 'pseudo':
+                cls = self.PseudoPosition
+            else:
+                cls = self.RealPosition
+
+            columns = to_position_columns(cls, positions)
+            result = method(self, columns, **kwargs)
+
+            if isinstance(positions, cls):
+                return result
+            elif getattr(positions, 'dtype', None) is not None and \
+                    positions.dtype.names is not None:
+                return position_columns_to_structured(result)
+            else:
+                return np.column_stack(result)
+
+        return wrapped
+
+    return wrapper
+
+
+real_array_argument = position_array_wrapper('real')
+pseudo_array_argument = position_array_wrapper('pseudo')
+
 _to_position_tuple_usage_info = '''Positions can be passed in a number of ways.
 
 As positional arguments:
@@ -286,6 +338,94 @@ def to_position_tuple(cls, *args, **kwargs):
     return position, other_kw
 
 
+def to_position_columns(cls, positions):
+    '''Convert an array of positions to a PositionTuple of 1D arrays
+
+    Example:
+        Tuple = namedtuple('Tuple', 'px py')
+
+    All of the following will return the same thing:
+        cols = to_position_columns(Tuple, [[1, 2], [3, 4], [5, 6]])
+        cols = to_position_columns(Tuple, np.array([(1, 2), (3, 4), (5, 6)],
+                                                   dtype=[('px', float),
+                                                          ('py', float)]))
+        cols = to_position_columns(Tuple, Tuple(px=[1, 3, 5], py=[2, 4, 6]))
+
+    cols will be Tuple(px=array([1, 3, 5]), py=array([2, 4, 6])).
+
+    Parameters
+    ----------
+    cls : namedtuple
+        The position class to use. This is likely a RealPosition or a
+        PseudoPosition from a PseudoPositioner.
+    positions : array-like
+        A structured array with one field per position tuple field, an array
+        of shape (num_points, num_fields) with columns in field order, or a
+        position tuple of 1D arrays
+
+    Returns
+    -------
+    columns : cls
+        The position tuple, with one 1D array per field. Where possible, these
+        are views of the input array.
+
+    Raises
+    ------
+    ValueError
+        On a mismatch of fields or array shapes
+    '''
+    fields = cls._fields
+
+    if isinstance(positions, cls):
+        columns = [np.atleast_1d(np.asarray(col)) for col in positions]
+    elif (getattr(positions, 'dtype', None) is not None and
+            positions.dtype.names is not None):
+        missing_fields = [field for field in fields
+                          if field not in positions.dtype.names]
+        if missing_fields:
+            raise ValueError('Missing fields for {}: {}'
+                             ''.format(cls.__name__,
+                                       ', '.join(missing_fields)))
+        columns = [np.atleast_1d(positions[field]) for field in fields]
+    else:
+        positions = np.asarray(positions, dtype=float)
+        if positions.ndim != 2 or positions.shape[1] != len(fields):
+            raise ValueError('Expected an array of shape (num_points, {}) for '
+                             '{}; got {}'.format(len(fields), cls.__name__,
+                                                 positions.shape))
+        columns = list(positions.T)
+
+    if len(set(len(col) for col in columns)) > 1:
+        raise ValueError('Position columns differ in length for {}'
+                         ''.format(cls.__name__))
+
+    return cls(*columns)
+
+
+def position_columns_to_structured(columns):
+    '''Convert a PositionTuple of 1D arrays to a structured array
+
+    Parameters
+    ----------
+    columns : namedtuple
+        Position tuple with one 1D array per field
+
+    Returns
+    -------
+    positions : np.ndarray
+        Structured array with one field per position tuple field
+    '''
+    fields = columns._fields
+    columns = [np.atleast_1d(np.asarray(col)) for col in columns]
+    dtype = [(field, col.dtype) for field, col in zip(fields, columns)]
+
+    positions = np.empty(len(columns[0]), dtype=dtype)
+    for field, col in zip(fields, columns):
+        positions[field] = col
+
+    return positions
+
+
 class PseudoPositioner(Device, SoftPositioner):
     '''A pseudo positioner which can be comprised of multiple positioners
 
@@ -309,12 +449,32 @@ class PseudoPositioner(Device, SoftPositioner):
         The amount of time to wait after moves to report status completion
     timeout : float, optional
         The default timeout to use for motion requests, in seconds.
+    readback_interval : float, optional
+        If set, readback events from the real positioners are coalesced, and
+        the pseudo position is recomputed at most once per this many seconds.
+        The position is always recomputed when motion completes.
+    coordinated : bool, optional
+        If set (and moving concurrently), the velocities of the real
+        positioners are scaled down such that all axes arrive at the same
+        time. This requires real positioners with `velocity` and
+        `acceleration` signals (such as EpicsMotor). Original velocities are
+        restored when motion completes.
     '''
     def __init__(self, prefix, *, concurrent=True, read_attrs=None,
-                 configuration_attrs=None, name=None, egu='', **kwargs):
+                 configuration_attrs=None, name=None, egu='',
+                 readback_interval=None, coordinated=False, **kwargs):
+
+        self._readback_interval = None
+        self._update_lock = threading.Lock()
+        self._pending_update = None
+        self._last_update = 0.0
+        if readback_interval:
+            self._readback_interval = float(readback_interval)
 
         self._finished_lock = threading.RLock()
         self._concurrent = bool(concurrent)
+        self._coordinated = bool(coordinated)
+        self._saved_velocities = []
         self._finish_thread = None
         self._real_waiting = []
         self._move_queue = []
@@ -460,6 +620,12 @@ class PseudoPositioner(Device, SoftPositioner):
         yield from super()._repr_info()
         yield ('concurrent', self._concurrent)
 
+        if self._coordinated:
+            yield ('coordinated', self._coordinated)
+
+        if self._readback_interval is not None:
+            yield ('readback_interval', self._readback_interval)
+
     @property
     def connected(self):
         return all(mtr.connected for mtr in self._real)
@@ -519,6 +685,53 @@ class PseudoPositioner(Device, SoftPositioner):
         for real, pos in zip(self._real, real_pos):
             real.check_value(pos)
 
+    def check_trajectory(self, pseudo_positions):
+        '''Check if every point of a pseudo position trajectory is valid
+
+        This is the vectorized equivalent of calling `check_value` on each
+        point. First checks all points against the limits set for individual
+        pseudo axes. Second, calculates forward_many(pseudo_positions) and
+        checks the result against the limits of the real positioners.
+
+        Parameters
+        ----------
+        pseudo_positions : array-like
+            The trajectory, in any form accepted by `forward_many`
+
+        Returns
+        -------
+        real_positions : RealPosition
+            The real positions of the trajectory, one 1D array per axis
+
+        Raises
+        ------
+        LimitError
+            Indicating the first point outside of the limits of a positioner
+        '''
+        pseudo_pos = to_position_columns(self.PseudoPosition, pseudo_positions)
+        for pseudo, pos in zip(self._pseudo, pseudo_pos):
+            self._check_trajectory_limits(pseudo, pos)
+
+        real_pos = self.forward_many(pseudo_pos)
+        for real, pos in zip(self._real, real_pos):
+            self._check_trajectory_limits(real, pos)
+
+        return real_pos
+
+    def _check_trajectory_limits(self, positioner, positions):
+        '''Check an array of positions against the limits of a positioner'''
+        low, high = positioner.limits
+        if low >= high:
+            return
+
+        bad_points = np.flatnonzero((positions < low) | (positions > high))
+        if len(bad_points):
+            idx = bad_points[0]
+            raise LimitError('Trajectory point {} is outside of limits: {}, '
+                             '{} < {} < {} ({} point(s) outside of limits)'
+                             ''.format(idx, positioner.name, low,
+                                       positions[idx], high, len(bad_points)))
+
     @property
     def limits(self):
         '''All PseudoSingle limits as a namedtuple'''
@@ -555,6 +768,17 @@ class PseudoPositioner(Device, SoftPositioner):
         '''If concurrent is set, motors will move concurrently (in parallel)'''
         return self._concurrent
 
+    @property
+    def coordinated(self):
+        '''If coordinated is set, concurrent moves of the real positioners are
+        scaled in velocity to arrive at the same time
+        '''
+        return self._coordinated
+
+    @coordinated.setter
+    def coordinated(self, coordinated):
+        self._coordinated = bool(coordinated)
+
     @property
     def _started_moving(self):
         return any(pos._started_moving for pos in self._real)
@@ -574,12 +798,33 @@ class PseudoPositioner(Device, SoftPositioner):
         '''Real motor position namedtuple'''
         return self.RealPosition(*self._real_cur_pos.values())
 
+    @property
+    def readback_interval(self):
+        '''Minimum time between pseudo position recomputations, in seconds
+
+        Readback events from the real positioners which arrive within this
+        interval are coalesced, and the pseudo position is recomputed once
+        from the newest real positions. If None, the pseudo position is
+        recomputed on every readback event.
+        '''
+        return self._readback_interval
+
+    @readback_interval.setter
+    def readback_interval(self, interval):
+        if not interval:
+            self._readback_interval = None
+        else:
+            self._readback_interval = float(interval)
+
+        self._flush_position_update()
+
     def _update_position(self):
         '''Update the internal position based on all of the real positioners'''
         real_cur_pos = self.real_position
         if None in real_cur_pos:
             raise DisconnectedError('Not all positioners connected')
 
+        self._last_update = time.time()
         calc_pseudo_pos = self.inverse(real_cur_pos)
         self._set_position(calc_pseudo_pos)
         return calc_pseudo_pos
@@ -588,15 +833,47 @@ class PseudoPositioner(Device, SoftPositioner):
         '''Callback: A single real positioner has moved'''
         real = obj
         self._real_cur_pos[real] = value
+
+        interval = self._readback_interval
+        if interval is not None:
+            with self._update_lock:
+                if self._pending_update is not None:
+                    # The scheduled update will use the newest real positions
+                    return
+
+                delay = self._last_update + interval - time.time()
+                if delay > 0:
+                    scheduler = get_scheduler()
+                    self._pending_update = scheduler.call_later(
+                        delay, self._flush_position_update)
+                    return
+
         # Only update the position if all real motors are connected
         try:
             self._update_position()
         except DisconnectedError:
             pass
 
+    def _flush_position_update(self):
+        '''Recompute the pseudo position now, if an update is pending'''
+        with self._update_lock:
+            pending, self._pending_update = self._pending_update, None
+
+        if pending is None:
+            return
+
+        pending.cancel()
+        try:
+            self._update_position()
+        except DisconnectedError:
+            pass
+
     def _done_moving(self, success=True):
         '''Call this when motion has completed.  Runs SUB_DONE subscription.'''
         del self._real_waiting[:]
+        self._restore_velocities()
+        # Ensure subscribers see the final position before motion completes
+        self._flush_position_update()
         super()._done_moving(success=success)
 
     def _real_finished(self, obj=None):
@@ -691,10 +968,66 @@ class PseudoPositioner(Device, SoftPositioner):
         logger.debug('[%s:sequential] started', self.name)
         move_next()
 
+    def _coordinate_velocities(self, real_pos):
+        '''Scale real positioner velocities such that all arrive together
+
+        Positioners which would otherwise arrive early are slowed down; none
+        are sped up. Positioners without `velocity` and `acceleration`
+        signals are left to move at their own pace.
+        '''
+        self._restore_velocities()
+
+        moves = []
+        for real, pos in zip(self._real, real_pos):
+            try:
+                velocity = real.velocity.get()
+                accel_time = real.acceleration.get()
+                move_time = real.time_to_target(pos)
+            except AttributeError:
+                continue
+
+            if move_time:
+                moves.append((real, pos, velocity, accel_time, move_time))
+
+        if not moves:
+            return
+
+        arrival_time = max(move_time for *_, move_time in moves)
+        for real, pos, velocity, accel_time, move_time in moves:
+            if move_time >= arrival_time:
+                continue
+
+            new_velocity = velocity_for_move_time(pos - real.position,
+                                                  arrival_time, accel_time)
+            if new_velocity >= velocity:
+                continue
+
+            logger.debug('[coordinated] Scaling %s velocity %g -> %g',
+                         real.name, velocity, new_velocity)
+            self._saved_velocities.append((real, velocity))
+            # Channel access does not order puts to different channels; the
+            # velocity must be in place before the move is requested
+            set_and_wait(real.velocity, new_velocity)
+
+    def _restore_velocities(self):
+        '''Restore velocities changed by a coordinated move'''
+        while self._saved_velocities:
+            real, velocity = self._saved_velocities.pop()
+            logger.debug('[coordinated] Restoring %s velocity to %g',
+                         real.name, velocity)
+            try:
+                real.velocity.put(velocity)
+            except Exception as ex:
+                logger.error('%s failed to restore velocity of %s',
+                             self.name, real.name, exc_info=ex)
+
     def _concurrent_move(self, real_pos, **kwargs):
         '''Move all real positioners to a certain position, in parallel'''
         self._real_waiting.extend(self._real)
 
+        if self._coordinated:
+            self._coordinate_velocities(real_pos)
+
         for real, value in zip(self._real, real_pos):
             logger.debug('[concurrent] Moving %s to %s', real.name, value)
             real.move(value, wait=False, moved_cb=self._real_finished,
@@ -762,6 +1095,32 @@ class PseudoPositioner(Device, SoftPositioner):
             else:
                 self._concurrent_move(real_pos, timeout=timeout)
 
+    @pseudo_position_argument
+    def time_to_target(self, position):
+        '''Predicted time to move from the current position to `position`
+
+        Parameters
+        ----------
+        position : PseudoPosition
+            The target position
+
+        Returns
+        -------
+        move_time : float or None
+            The longest predicted move time of the real positioners when moving
+            concurrently, or the sum when moving sequentially. None if any real
+            positioner cannot predict its move time.
+        '''
+        real_pos = self.forward(position)
+        move_times = [real.time_to_target(pos)
+                      for real, pos in zip(self._real, real_pos)]
+        if None in move_times:
+            return None
+        elif self.sequential:
+            return sum(move_times)
+        else:
+            return max(move_times)
+
     @pseudo_position_argument
     def forward(self, pseudo_pos):
         '''Calculate a RealPosition from a given PseudoPosition
@@ -800,6 +1159,60 @@ class PseudoPositioner(Device, SoftPositioner):
         # return self.PseudoPosition()
         raise NotImplementedError()
 
+    @pseudo_array_argument
+    def forward_many(self, pseudo_pos):
+        '''Calculate many RealPositions from an array of PseudoPositions
+
+        Accepts a structured array with one field per pseudo axis, an array
+        of shape (num_points, num_pseudo), or a PseudoPosition of 1D arrays.
+        The result is returned in the same layout.
+
+        The default implementation calls `forward` for each point. Subclasses
+        may override this, decorated with `pseudo_array_argument`, to
+        calculate all points at once.
+
+        Parameters
+        ----------
+        pseudo_pos : PseudoPosition
+            The pseudo position input, with one 1D array per axis
+
+        Returns
+        -------
+        real_position : RealPosition
+            The real position output, with one 1D array per axis
+        '''
+        real_pos = np.asarray([self.forward(self.PseudoPosition(*point))
+                               for point in zip(*pseudo_pos)], dtype=float)
+        real_pos = real_pos.reshape(-1, len(self._real))
+        return self.RealPosition(*real_pos.T)
+
+    @real_array_argument
+    def inverse_many(self, real_pos):
+        '''Calculate many PseudoPositions from an array of RealPositions
+
+        Accepts a structured array with one field per real axis, an array of
+        shape (num_points, num_real), or a RealPosition of 1D arrays. The
+        result is returned in the same layout.
+
+        The default implementation calls `inverse` for each point. Subclasses
+        may override this, decorated with `real_array_argument`, to calculate
+        all points at once.
+
+        Parameters
+        ----------
+        real_pos : RealPosition
+            The real position input, with one 1D array per axis
+
+        Returns
+        -------
+        pseudo_pos : PseudoPosition
+            The pseudo position output, with one 1D array per axis
+        '''
+        pseudo_pos = np.asarray([self.inverse(self.RealPosition(*point))
+                                 for point in zip(*real_pos)], dtype=float)
+        pseudo_pos = pseudo_pos.reshape(-1, len(self._pseudo))
+        return self.PseudoPosition(*pseudo_pos.T)
+
     @pseudo_position_argument
     def set(self, position, **kwargs):
         '''Move to a new position asynchronously
@@ -14,6 +14,7 @@ from epics.pv import fmt_time
 from .device import Device
 from .positioner import PositionerBase
 from .status import wait as status_wait
+from .utils.scheduler import get_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,13 @@ class PVPositioner(Device, PositionerBase):
         The amount of time to wait after moves to report status completion
     timeout : float, optional
         The default timeout to use for motion requests, in seconds.
+    settle_tolerance : float, optional
+        If set, report status completion as soon as the readback stays within
+        +/- this tolerance for `settle_dwell` seconds, waiting at most
+        `settle_time`
+    settle_dwell : float, optional
+        The amount of time the readback must be stable for, when
+        `settle_tolerance` is set
 
     Attributes
     ----------
@@ -90,6 +98,8 @@ class PVPositioner(Device, PositionerBase):
                             'signals set in the class definition.')
 
         self._egu = egu
+        self._move_id = 0
+        self._pending_actuation = None
 
         if limits is not None:
             self._limits = tuple(limits)
@@ -152,10 +162,54 @@ class PVPositioner(Device, PositionerBase):
     def _setup_move(self, position):
         '''Move and do not wait until motion is complete (asynchronous)'''
         logger.debug('%s.setpoint = %s', self.name, position)
-        self.setpoint.put(position, wait=True)
         if self.actuate is not None:
-            logger.debug('%s.actuate = %s', self.name, self.actuate_value)
-            self.actuate.put(self.actuate_value, wait=False)
+            self._setpoint_then_actuate(position)
+        else:
+            self._put_setpoint(position)
+
+    def _put_setpoint(self, position, **kwargs):
+        '''Write the setpoint without waiting, failing the move on error'''
+        try:
+            self.setpoint.put(position, wait=False, **kwargs)
+        except Exception:
+            self._pending_actuation = None
+            self._done_moving(success=False)
+            raise
+
+    def _setpoint_then_actuate(self, position, actuate_callback=None):
+        '''Write the setpoint, then actuate once its put has completed
+
+        Neither put is waited on. The actuation is run on the callback
+        scheduler thread, as channel access calls should not be made from
+        the put completion callback.
+        '''
+        self._move_id += 1
+        move_id = self._pending_actuation = self._move_id
+
+        def setpoint_done(**kwargs):
+            get_scheduler().call_soon(self._actuate, move_id,
+                                      actuate_callback)
+
+        self._put_setpoint(position, callback=setpoint_done)
+
+    def _actuate(self, move_id, callback=None):
+        '''Scheduler callback: the setpoint is written, so actuate the move'''
+        if move_id != self._pending_actuation:
+            logger.debug('%s move superseded before actuation', self.name)
+            return
+
+        self._pending_actuation = None
+
+        logger.debug('%s.actuate = %s', self.name, self.actuate_value)
+        kwargs = {}
+        if callback is not None:
+            kwargs['callback'] = callback
+
+        try:
+            self.actuate.put(self.actuate_value, wait=False, **kwargs)
+        except Exception as ex:
+            logger.error('%s failed to actuate motion', self.name, exc_info=ex)
+            self._done_moving(success=False)
 
     def move(self, position, wait=True, timeout=None, moved_cb=None):
         '''Move to a specified position, optionally waiting for motion to
@@ -233,6 +287,13 @@ class PVPositioner(Device, PositionerBase):
         self._set_position(value)
 
     def stop(self):
+        if self._pending_actuation is not None:
+            # The setpoint put has not completed: drop the actuation and fail
+            # the move. This is its only notification, as Device.stop does
+            # not continue on to PositionerBase.stop.
+            self._pending_actuation = None
+            self._done_moving(success=False)
+
         if self.stop_signal is not None:
             self.stop_signal.put(self.stop_value, wait=False)
         super().stop()
@@ -286,11 +347,7 @@ class PVPositionerPC(PVPositioner):
         logger.debug('%s.setpoint = %s', self.name, position)
 
         if self.actuate is not None:
-            self.setpoint.put(position, wait=True)
-
-            logger.debug('%s.actuate = %s', self.name, self.actuate_value)
-            self.actuate.put(self.actuate_value, wait=False,
-                             callback=done_moving)
+            self._setpoint_then_actuate(position,
+                                        actuate_callback=done_moving)
         else:
-            self.setpoint.put(position, wait=False,
-                              callback=done_moving)
+            self._put_setpoint(position, callback=done_moving)
@@ -3,7 +3,7 @@ import logging
 
 from collections import OrderedDict
 
-from .signal import (EpicsSignal, EpicsSignalRO)
+from .signal import (EpicsSignal, EpicsSignalRO, ArrayGroupSignal)
 from .device import Device
 from .device import (Component as C, DynamicDeviceComponent as DDC)
 
@@ -21,7 +21,13 @@ def _scaler_fields(attr_base, field_base, range_, **kwargs):
 
 
 class EpicsScaler(Device):
-    '''SynApps Scaler Record interface'''
+    '''SynApps Scaler Record interface
+
+    The channels, presets and gates are also available as single arrays
+    (`channels_array`, `presets_array` and `gates_array`), e.g.,
+    ``read_attrs=['channels_array', 'time']`` to read one array of counts
+    rather than one reading per channel.
+    '''
 
     count = C(EpicsSignal, '.CNT', trigger_value=1)
     count_mode = C(EpicsSignal, '.CONT', string=True)
@@ -32,6 +38,10 @@ class EpicsScaler(Device):
     presets = DDC(_scaler_fields('preset', '.PR', range(1, 33)))
     gates = DDC(_scaler_fields('gate', '.G', range(1, 33)))
 
+    channels_array = C(ArrayGroupSignal, group='channels', lazy=True)
+    presets_array = C(ArrayGroupSignal, group='presets', lazy=True)
+    gates_array = C(ArrayGroupSignal, group='gates', lazy=True)
+
     def __init__(self, prefix, *, read_attrs=None, configuration_attrs=None,
                  name=None, parent=None, **kwargs):
         if read_attrs is None:
@@ -45,3 +55,128 @@ class EpicsScaler(Device):
                          name=name, parent=parent, **kwargs)
 
         self.stage_sigs.update([(self.count_mode, 0)])
+
+
+class PrunedEpicsScaler(EpicsScaler):
+    '''An EpicsScaler which connects to and reads only its active channels
+
+    The channel, preset and gate signals are created on first access, so
+    those of inactive channels are never connected or read. The active
+    channels are either given, or found when connecting from the channel
+    name fields (.NMn) of the record: channels with a name are active. This
+    happens on connecting, staging, or the first read or describe, whichever
+    is first. `set_active_channels` changes them at runtime.
+
+    The `channels_array`, `presets_array` and `gates_array` components
+    always cover all 32 channels.
+
+    Parameters
+    ----------
+    prefix : str
+        The scaler record prefix
+    active_channels : sequence of int, optional
+        The active channel numbers (1-32)
+    '''
+
+    channels = DDC(_scaler_fields('chan', '.S', range(1, 33), lazy=True))
+    presets = DDC(_scaler_fields('preset', '.PR', range(1, 33), lazy=True))
+    gates = DDC(_scaler_fields('gate', '.G', range(1, 33), lazy=True))
+    names = DDC(_scaler_fields('name', '.NM', range(1, 33), lazy=True,
+                               string=True))
+    num_channels = C(EpicsSignalRO, '.NCH', lazy=True)
+
+    def __init__(self, prefix, *, active_channels=None, read_attrs=None,
+                 configuration_attrs=None, name=None, parent=None, **kwargs):
+        super().__init__(prefix, read_attrs=read_attrs,
+                         configuration_attrs=configuration_attrs,
+                         name=name, parent=parent, **kwargs)
+
+        self._active_channels = None
+        if active_channels is not None:
+            self.set_active_channels(active_channels)
+        else:
+            # no channel signals are created until the active ones are known
+            for group in (self.channels, self.presets, self.gates):
+                group.read_attrs = []
+
+    @property
+    def active_channels(self):
+        '''The active channel numbers, or None if not yet known'''
+        return self._active_channels
+
+    def find_active_channels(self, timeout=2.0):
+        '''Make the channels named in the record active
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Time allowed for the channel name signals to connect
+
+        Returns
+        -------
+        active_channels : tuple of int
+        '''
+        # connect to the channel count and all names together, then read
+        self.num_channels
+        self.names.wait_for_connection(all_signals=True, timeout=timeout)
+
+        num_channels = min(int(self.num_channels.get()), 32)
+        active = [i for i in range(1, num_channels + 1)
+                  if getattr(self.names, 'name{}'.format(i)).get().strip()]
+
+        if not active:
+            logger.warning('%s: no named channels; using all %d', self.name,
+                           num_channels)
+            active = range(1, num_channels + 1)
+
+        self.set_active_channels(active)
+        return self._active_channels
+
+    def set_active_channels(self, channels):
+        '''Read (and connect to) only the given channels
+
+        Parameters
+        ----------
+        channels : sequence of int
+            The channel numbers (1-32)
+        '''
+        channels = tuple(sorted(set(channels)))
+        for channel in channels:
+            if not (1 <= channel <= 32):
+                raise ValueError('Channel must be in the range [1, 32]')
+
+        for group, attr in ((self.channels, 'chan'),
+                            (self.presets, 'preset'),
+                            (self.gates, 'gate')):
+            group.read_attrs = ['{}{}'.format(attr, channel)
+                                for channel in channels]
+            # connect now, rather than on the first read
+            for sig_attr in group.read_attrs:
+                getattr(group, sig_attr)
+
+        self._active_channels = channels
+        logger.debug('%s: active channels %s', self.name, channels)
+
+    def wait_for_connection(self, all_signals=False, timeout=2.0):
+        super().wait_for_connection(all_signals=all_signals, timeout=timeout)
+
+        if self._active_channels is None:
+            self.find_active_channels(timeout=timeout)
+
+    def stage(self):
+        if self._active_channels is None:
+            self.find_active_channels()
+
+        return super().stage()
+
+    def read(self):
+        if self._active_channels is None:
+            self.find_active_channels()
+
+        return super().read()
+
+    def describe(self):
+        if self._active_channels is None:
+            self.find_active_channels()
+
+        return super().describe()
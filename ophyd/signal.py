@@ -1,12 +1,18 @@
 # vi: ts=4 sw=4
 import logging
+import threading
 import time
 
 import epics
-
-from .utils import (ReadOnlyError, LimitError)
-from .utils.epics_pvs import (pv_form, waveform_to_string,
-                              raise_if_disconnected, data_type, data_shape)
+import numpy as np
+
+from .utils import (ReadOnlyError, LimitError, DisconnectedError)
+from .utils.pv_cache import get_pv_cache
+from .utils.scheduler import get_scheduler
+from .utils import epics_pvs
+from .utils.epics_pvs import (waveform_to_string,
+                              raise_if_disconnected, data_type, data_shape,
+                              pv_data_type_shape)
 from .ophydobj import OphydObject
 from .status import DeviceStatus
 
@@ -203,6 +209,144 @@ class DerivedSignal(Signal):
         yield ('derived_from', self._derived_from)
 
 
+class ArrayGroupSignal(Signal):
+    '''The member signals of a group device as one array (read-only)
+
+    The group is typically a DynamicDeviceComponent of homogeneous scalar
+    signals, such as the channels of a scaler. Member values are collected
+    into one preallocated vector, read as a single array reading whose
+    description lists the member `element_names`. The members themselves
+    are unchanged and can still be read one by one.
+
+    Parameters
+    ----------
+    group : str or Device
+        The group device, or its attribute name on the parent
+    monitor : bool, optional
+        Follow the members through subscriptions, so that get() costs no
+        round trips. Otherwise, every member is read on each get().
+    dtype : np.dtype, optional
+        The array data type
+    name : str, optional
+        The signal name
+    parent : Device, optional
+        The parent device
+    '''
+    def __init__(self, group, *, monitor=True, dtype=float, name=None,
+                 parent=None, **kwargs):
+        super().__init__(name=name, parent=parent, **kwargs)
+
+        if isinstance(group, str):
+            group = getattr(parent, group)
+
+        self.group = group
+        self.members = [getattr(group, attr) for attr in group.signal_names]
+        self.element_names = [sig.name for sig in self.members]
+
+        self._lock = threading.RLock()
+        self._values = np.zeros(len(self.members), dtype=dtype)
+        self._timestamps = np.zeros(len(self.members))
+        self._member_subs = []
+
+        if monitor:
+            self.start_monitoring()
+
+    @property
+    def monitoring(self):
+        '''Whether the members are followed through subscriptions'''
+        return bool(self._member_subs)
+
+    def start_monitoring(self):
+        '''Subscribe to all members'''
+        with self._lock:
+            if self._member_subs:
+                return
+
+            for index, sig in enumerate(self.members):
+                if getattr(sig, '_readback', None) is not None:
+                    # start from the last known value, as there may not be
+                    # a cached value event to replay on subscription
+                    self._values[index] = sig._readback
+                    self._timestamps[index] = sig._timestamp
+
+                def changed(value=None, timestamp=None, index=index,
+                            **kwargs):
+                    self._member_changed(index, value, timestamp)
+
+                self._member_subs.append((sig, changed))
+                sig.subscribe(changed, run=True)
+
+    def stop_monitoring(self):
+        '''Unsubscribe from all members'''
+        with self._lock:
+            callbacks, self._member_subs = self._member_subs, []
+
+        for sig, callback in callbacks:
+            sig.clear_sub(callback)
+
+    def _member_changed(self, index, value, timestamp):
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            self._values[index] = value
+            self._timestamps[index] = timestamp
+            values = self._values.copy()
+
+        self._run_subs(sub_type=self.SUB_VALUE, value=values,
+                       timestamp=timestamp)
+
+    def _read_members(self):
+        with self._lock:
+            for index, sig in enumerate(self.members):
+                self._values[index] = sig.get()
+                self._timestamps[index] = sig.timestamp
+
+    def get(self, **kwargs):
+        '''The member values, as an array'''
+        with self._lock:
+            if not self._member_subs:
+                self._read_members()
+            return self._values.copy()
+
+    def put(self, value, **kwargs):
+        raise ReadOnlyError('{} is read-only'.format(self.name))
+
+    @property
+    def timestamp(self):
+        '''The most recent timestamp of the members'''
+        with self._lock:
+            if not len(self._timestamps):
+                return self._timestamp
+            return float(self._timestamps.max())
+
+    def read(self):
+        with self._lock:
+            return {self.name: {'value': self.get(),
+                                'timestamp': self.timestamp}}
+
+    def describe(self):
+        return {self.name: {'source': 'PY:{}'.format(self.group.name),
+                            'dtype': 'array',
+                            'shape': [len(self.members)],
+                            'element_names': list(self.element_names),
+                            }}
+
+    def wait_for_connection(self, timeout=1.0):
+        '''Wait for all members to connect'''
+        for sig in self.members:
+            sig.wait_for_connection(timeout=timeout)
+
+    @property
+    def connected(self):
+        return all(getattr(sig, 'connected', True) for sig in self.members)
+
+    def _repr_info(self):
+        yield from super()._repr_info()
+        yield ('group', self.group.name)
+        yield ('monitor', self.monitoring)
+
+
 class EpicsSignalBase(Signal):
     '''A read-only EpicsSignal -- that is, one with no `write_pv`
 
@@ -246,13 +390,14 @@ class EpicsSignalBase(Signal):
         self._string = bool(string)
         self._pv_kw = pv_kw
         self._auto_monitor = auto_monitor
+        self._metadata_checked = set()
 
         if name is None:
             name = read_pv
 
         super().__init__(name=name, **kwargs)
 
-        self._read_pv = epics.PV(read_pv, form=pv_form,
+        self._read_pv = epics.PV(read_pv, form=epics_pvs.pv_form,
                                  auto_monitor=auto_monitor,
                                  **pv_kw)
 
@@ -265,17 +410,85 @@ class EpicsSignalBase(Signal):
         return self._string
 
     @property
-    @raise_if_disconnected
     def precision(self):
         '''The precision of the read PV, as reported by EPICS'''
+        metadata = self._pv_metadata(self._read_pv)
+        if metadata is not None:
+            return metadata['precision']
+
+        if not self._read_pv.connected:
+            raise DisconnectedError('{} is not connected'.format(self.name))
         return self._read_pv.precision
 
     @property
-    @raise_if_disconnected
     def enum_strs(self):
         """List of strings if PV is an enum type"""
+        metadata = self._pv_metadata(self._read_pv)
+        if metadata is not None:
+            return metadata['enum_strs']
+
+        if not self._read_pv.connected:
+            raise DisconnectedError('{} is not connected'.format(self.name))
         return self._read_pv.enum_strs
 
+    def _pv_metadata(self, pv):
+        '''Control metadata of a PV from the PV metadata cache, if one is used
+
+        Cached metadata is returned immediately, and checked against the IOC
+        in the background. Metadata not yet cached is read from the IOC and
+        cached.
+
+        Returns
+        -------
+        metadata : dict or None
+            None if no cache is used (see `ophyd.utils.pv_cache`)
+        '''
+        cache = get_pv_cache()
+        if cache is None:
+            return None
+
+        metadata = cache.get(pv.pvname)
+        if metadata is None:
+            if not pv.connected:
+                raise DisconnectedError('{} is not connected'
+                                        ''.format(self.name))
+            metadata = self._read_metadata(pv)
+            cache.update(pv.pvname, metadata)
+            self._metadata_checked.add(pv.pvname)
+        elif pv.pvname not in self._metadata_checked:
+            self._metadata_checked.add(pv.pvname)
+            get_scheduler().call_soon(self._check_metadata, pv)
+
+        return metadata
+
+    @staticmethod
+    def _read_metadata(pv):
+        '''Read the control metadata of a (connected) PV from the IOC'''
+        pv.get_ctrlvars()
+        return {'units': getattr(pv, 'units', None),
+                'precision': getattr(pv, 'precision', None),
+                'enum_strs': getattr(pv, 'enum_strs', None),
+                'lower_ctrl_limit': getattr(pv, 'lower_ctrl_limit', None),
+                'upper_ctrl_limit': getattr(pv, 'upper_ctrl_limit', None),
+                'type': getattr(pv, 'type', None),
+                'count': getattr(pv, 'count', None),
+                }
+
+    def _check_metadata(self, pv):
+        '''Update cached metadata from the IOC (run in the background)'''
+        cache = get_pv_cache()
+        if cache is None:
+            return
+
+        if not pv.connected:
+            # check again on the next access
+            self._metadata_checked.discard(pv.pvname)
+            return
+
+        if cache.update(pv.pvname, self._read_metadata(pv)):
+            logger.info('%s: cached metadata of %s was out of date',
+                        self.name, pv.pvname)
+
     def _reinitialize_pv(self, old_instance, **pv_kw):
         '''Reinitialize a PV instance
 
@@ -422,19 +635,46 @@ class EpicsSignalBase(Signal):
         """
         desc = {'source': 'PV:{}'.format(self._read_pv.pvname), }
 
-        val = self.value
-        desc['dtype'] = data_type(val)
-        desc['shape'] = data_shape(val)
+        cache = get_pv_cache()
+        metadata = None
+        if (cache is not None and not self._read_pv.connected and
+                self._read_pv.pvname in cache):
+            metadata = self._pv_metadata(self._read_pv)
+
+        if metadata is not None and metadata['type'] is not None:
+            # describe a disconnected PV from the cached channel type
+            desc['dtype'], desc['shape'] = pv_data_type_shape(
+                metadata['type'], metadata['count'], as_string=self._string)
+        else:
+            val = self.value
+            desc['dtype'] = data_type(val)
+            desc['shape'] = data_shape(val)
 
         try:
             desc['precision'] = int(self.precision)
         except (ValueError, TypeError):
             pass
-        desc['units'] = self._read_pv.units
+
+        metadata = self._pv_metadata(self._read_pv)
+        if metadata is not None:
+            desc['units'] = metadata['units']
+        else:
+            desc['units'] = self._read_pv.units
 
         if hasattr(self, '_write_pv'):
-            desc['lower_ctrl_limit'] = self._write_pv.lower_ctrl_limit
-            desc['upper_ctrl_limit'] = self._write_pv.upper_ctrl_limit
+            # limits are only taken from the cache while disconnected, as
+            # they may be changed on the IOC at any time
+            metadata = None
+            if (cache is not None and not self._write_pv.connected and
+                    self._write_pv.pvname in cache):
+                metadata = self._pv_metadata(self._write_pv)
+
+            if metadata is not None:
+                desc['lower_ctrl_limit'] = metadata['lower_ctrl_limit']
+                desc['upper_ctrl_limit'] = metadata['upper_ctrl_limit']
+            else:
+                desc['lower_ctrl_limit'] = self._write_pv.lower_ctrl_limit
+                desc['upper_ctrl_limit'] = self._write_pv.upper_ctrl_limit
 
         if self.enum_strs:
             desc['enum_strs'] = list(self.enum_strs)
@@ -519,7 +759,7 @@ class EpicsSignal(EpicsSignalBase):
                          auto_monitor=auto_monitor, name=name, **kwargs)
 
         if write_pv is not None:
-            self._write_pv = epics.PV(write_pv, form=pv_form,
+            self._write_pv = epics.PV(write_pv, form=epics_pvs.pv_form,
                                       auto_monitor=self._auto_monitor,
                                       **self._pv_kw)
             self._write_pv.add_callback(self._write_changed,
@@ -683,3 +923,11 @@ class EpicsSignal(EpicsSignalBase):
     @setpoint.setter
     def setpoint(self, value):
         self.put(value)
+
+
+class EpicsSignalWithRBV(EpicsSignal):
+    # An EPICS signal that simply uses the areaDetector convention of
+    # 'pvname' being the setpoint and 'pvname_RBV' being the read-back
+
+    def __init__(self, prefix, **kwargs):
+        super().__init__(prefix + '_RBV', write_pv=prefix, **kwargs)
@@ -77,11 +77,18 @@ class StatusBase:
         '''Hook for when status has completed and settled'''
         pass
 
-    def _settle_then_run_callbacks(self, success=True):
-        # wait until the settling time is done to mark completion
+    def _settle(self, success=True):
+        '''Hook to wait for the operation to settle after completion
+
+        By default, this waits for the full settle time.
+        '''
         if self.settle_time > 0.0:
             time.sleep(self.settle_time)
 
+    def _settle_then_run_callbacks(self, success=True):
+        # wait until the settling time is done to mark completion
+        self._settle(success=success)
+
         with self._lock:
             self.success = success
             self.done = True
@@ -169,7 +176,14 @@ class MoveStatus(DeviceStatus):
         to wait to mark the motion as failed
     settle_time : float, optional
         The amount of time to wait between motion completion and running
-        callbacks
+        callbacks. If `settle_tolerance` is set, this is the maximum amount of
+        time to wait.
+    settle_tolerance : float, optional
+        If set, settling completes as soon as the positioner readback stays
+        within +/- this tolerance for `settle_dwell` seconds
+    settle_dwell : float, optional
+        The amount of time the readback must be stable for, when
+        `settle_tolerance` is set
 
     Attributes
     ----------
@@ -186,10 +200,15 @@ class MoveStatus(DeviceStatus):
         The final position
     success : bool
         Motion successfully completed
+    settle_elapsed : float
+        The time spent settling after motion completed
+    settle_capped : bool
+        The readback did not settle within tolerance before the maximum
+        settle time elapsed
     '''
 
     def __init__(self, positioner, target, *, done=False, start_ts=None,
-                 **kwargs):
+                 settle_tolerance=None, settle_dwell=0.0, **kwargs):
         # call the base class
         super().__init__(positioner, **kwargs)
 
@@ -202,6 +221,56 @@ class MoveStatus(DeviceStatus):
         self.start_ts = start_ts
         self.finish_ts = None
         self.finish_pos = None
+        self.settle_tolerance = settle_tolerance
+        self.settle_dwell = float(settle_dwell)
+        self.settle_elapsed = 0.0
+        self.settle_capped = False
+
+    def _settle(self, success=True):
+        '''Wait for the positioner readback to settle
+
+        With a settle tolerance set, this returns as soon as the readback has
+        stayed within the tolerance band for the dwell time, or when the
+        settle time (the maximum) has elapsed. Otherwise, the full settle time
+        is waited for.
+        '''
+        t0 = time.time()
+        try:
+            if self.settle_tolerance is None:
+                super()._settle(success=success)
+            elif success and self.settle_time > 0.0:
+                self.settle_capped = not self._wait_for_stable_readback(t0)
+        finally:
+            self.settle_elapsed = time.time() - t0
+
+    def _wait_for_stable_readback(self, t0):
+        '''Poll the readback until it is stable or the settle time elapses
+
+        Returns
+        -------
+        settled : bool
+            True if the readback settled before the settle time elapsed
+        '''
+        deadline = t0 + self.settle_time
+        dwell = min(self.settle_dwell, self.settle_time)
+        poll_period = min(max(dwell / 5.0, 0.001), 0.05)
+
+        reference = np.asarray(self.pos.position, dtype=float)
+        stable_since = t0
+        while True:
+            now = time.time()
+            if now - stable_since >= dwell:
+                return True
+            elif now >= deadline:
+                return False
+
+            time.sleep(min(poll_period, deadline - now))
+
+            position = np.asarray(self.pos.position, dtype=float)
+            if np.max(np.abs(position - reference)) > self.settle_tolerance:
+                # moved outside of the band; restart the dwell from here
+                reference = position
+                stable_since = time.time()
 
     @property
     def error(self):
@@ -225,6 +294,13 @@ class MoveStatus(DeviceStatus):
         self.finish_ts = time.time()
         self.finish_pos = self.pos.position
 
+        try:
+            move_settled = self.pos._move_settled
+        except AttributeError:
+            pass
+        else:
+            move_settled(self)
+
     @property
     def elapsed(self):
         '''Elapsed time'''
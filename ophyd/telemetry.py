@@ -0,0 +1,302 @@
+'''
+:mod:`ophyd.telemetry` - Motion telemetry
+=========================================
+
+.. module:: ophyd.telemetry
+   :synopsis: Per-move timing records for positioners
+'''
+
+import logging
+import threading
+import time
+import weakref
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['MotionRecorder']
+
+
+MOVE_DTYPE = np.dtype([('move_id', 'i8'),
+                       ('target', 'f8'),
+                       ('final_position', 'f8'),
+                       ('command_ts', 'f8'),
+                       ('start_ts', 'f8'),
+                       ('done_ts', 'f8'),
+                       ('settled_ts', 'f8'),
+                       ('settle_elapsed', 'f8'),
+                       ('num_readbacks', 'i8'),
+                       ('success', '?'),
+                       ])
+
+READBACK_DTYPE = np.dtype([('move_id', 'i8'),
+                           ('value', 'f8'),
+                           ('timestamp', 'f8'),
+                           ('received_ts', 'f8'),
+                           ])
+
+
+def _to_float(value):
+    '''A scalar position as a float, or NaN for anything else'''
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class _RingBuffer:
+    '''A preallocated ring buffer of numpy structured records'''
+
+    def __init__(self, capacity, dtype):
+        if capacity <= 0:
+            raise ValueError('Capacity must be positive')
+
+        # new records start with NaN floats and -1 integers
+        blank = np.zeros(1, dtype=dtype)
+        for field, (field_dtype, offset) in dtype.fields.items():
+            if field_dtype.kind == 'f':
+                blank[field] = np.nan
+            elif field_dtype.kind == 'i':
+                blank[field] = -1
+
+        self.data = np.repeat(blank, capacity)
+        self.capacity = capacity
+        self.count = 0
+        self._blank = blank[0]
+
+    def append(self):
+        '''Claim the next (blank) record, returning its absolute index'''
+        index = self.count
+        self.data[index % self.capacity] = self._blank
+        self.count += 1
+        return index
+
+    def record(self, index):
+        '''The record at an absolute index, or None if overwritten'''
+        if index < 0 or index < self.count - self.capacity:
+            return None
+        return self.data[index % self.capacity]
+
+    def ordered(self):
+        '''Copy of the stored records, oldest first'''
+        if self.count <= self.capacity:
+            return self.data[:self.count].copy()
+
+        start = self.count % self.capacity
+        return np.concatenate((self.data[start:], self.data[:start]))
+
+    def clear(self):
+        self.count = 0
+
+
+class MotionRecorder:
+    '''Records the timing of each move of a positioner
+
+    For every move, the time the move was requested, the SUB_START and
+    SUB_DONE events, and the time the move status completed (after settling)
+    are recorded, along with every SUB_READBACK value. Records are stored in
+    preallocated numpy ring buffers, so the oldest moves and readbacks are
+    overwritten once capacity is reached.
+
+    Times are measured with `time.time()` on receipt of each event; readback
+    records also keep the event timestamp, so that callback delivery delay
+    can be examined.
+
+    Parameters
+    ----------
+    positioner : PositionerBase
+        The positioner to record. The recorder attaches itself to it.
+    capacity : int, optional
+        The number of moves to keep
+    readback_capacity : int, optional
+        The number of readback events to keep
+
+    Attributes
+    ----------
+    positioner : PositionerBase
+        The recorded positioner
+    '''
+
+    def __init__(self, positioner, *, capacity=1000, readback_capacity=100000):
+        self.positioner = positioner
+        self._lock = threading.RLock()
+        self._moves = _RingBuffer(capacity, MOVE_DTYPE)
+        self._readbacks = _RingBuffer(readback_capacity, READBACK_DTYPE)
+        self._current_move = -1
+        # move status to the id of its recorded move
+        self._status_moves = weakref.WeakKeyDictionary()
+        self._attached = False
+        self.attach()
+
+    def attach(self):
+        '''Start recording moves of the positioner'''
+        if self._attached:
+            return
+
+        pos = self.positioner
+        pos.subscribe(self._start, event_type=pos.SUB_START, run=False)
+        pos.subscribe(self._readback, event_type=pos.SUB_READBACK, run=False)
+        pos.subscribe(self._done, event_type=pos.SUB_DONE, run=False)
+        pos.motion_recorder = self
+        self._attached = True
+
+    def detach(self):
+        '''Stop recording moves of the positioner'''
+        if not self._attached:
+            return
+
+        pos = self.positioner
+        pos.clear_sub(self._start, event_type=pos.SUB_START)
+        pos.clear_sub(self._readback, event_type=pos.SUB_READBACK)
+        pos.clear_sub(self._done, event_type=pos.SUB_DONE)
+        if pos.motion_recorder is self:
+            pos.motion_recorder = None
+        self._attached = False
+
+    def clear(self):
+        '''Clear all recorded moves and readbacks'''
+        with self._lock:
+            self._moves.clear()
+            self._readbacks.clear()
+            self._current_move = -1
+            self._status_moves.clear()
+
+    def _current(self):
+        return self._moves.record(self._current_move)
+
+    def record_command(self, status):
+        '''Positioner hook: a move was requested'''
+        with self._lock:
+            self._current_move = move_id = self._moves.append()
+            rec = self._moves.record(move_id)
+            rec['move_id'] = move_id
+            rec['target'] = _to_float(status.target)
+            rec['command_ts'] = status.start_ts
+            rec['num_readbacks'] = 0
+            self._status_moves[status] = move_id
+
+    def record_settled(self, status):
+        '''Positioner hook: a move status completed, after settling'''
+        with self._lock:
+            move_id = self._status_moves.pop(status, None)
+            if move_id is None:
+                return
+
+            rec = self._moves.record(move_id)
+            if rec is None:
+                return
+
+            rec['settled_ts'] = status.finish_ts
+            rec['final_position'] = _to_float(status.finish_pos)
+            rec['settle_elapsed'] = status.settle_elapsed
+            rec['success'] = status.success
+
+    def _start(self, **kwargs):
+        with self._lock:
+            rec = self._current()
+            if rec is not None and np.isnan(rec['start_ts']):
+                rec['start_ts'] = time.time()
+
+    def _done(self, **kwargs):
+        with self._lock:
+            rec = self._current()
+            if rec is not None and np.isnan(rec['done_ts']):
+                rec['done_ts'] = time.time()
+
+    def _readback(self, value=None, timestamp=None, **kwargs):
+        received_ts = time.time()
+        with self._lock:
+            rec = self._readbacks.record(self._readbacks.append())
+            rec['value'] = _to_float(value)
+            rec['timestamp'] = (received_ts if timestamp is None
+                                else timestamp)
+            rec['received_ts'] = received_ts
+
+            move = self._current()
+            if move is not None and np.isnan(move['settled_ts']):
+                rec['move_id'] = self._current_move
+                move['num_readbacks'] += 1
+
+    @property
+    def moves(self):
+        '''Recorded moves, oldest first (a copy)'''
+        with self._lock:
+            return self._moves.ordered()
+
+    @property
+    def readbacks(self):
+        '''Recorded readback events, oldest first (a copy)'''
+        with self._lock:
+            return self._readbacks.ordered()
+
+    def summary(self):
+        '''Timing statistics over the recorded moves
+
+        Returns
+        -------
+        summary : dict
+            With the number of recorded, successful, and overwritten moves,
+            and a dictionary of statistics (mean, p50, p99, max; in seconds)
+            for each of:
+
+            command_latency
+                From the move request to SUB_START
+            motion_time
+                From SUB_START to SUB_DONE
+            completion_latency
+                From SUB_DONE to completion of the move status
+            total_time
+                From the move request to completion of the move status
+            overhead
+                total_time less motion_time
+            readback_delay
+                From readback event timestamp to receipt of the callback
+        '''
+        moves = self.moves
+        readbacks = self.readbacks
+        done = moves[moves['success']]
+
+        intervals = {
+            'command_latency': done['start_ts'] - done['command_ts'],
+            'motion_time': done['done_ts'] - done['start_ts'],
+            'completion_latency': done['settled_ts'] - done['done_ts'],
+            'total_time': done['settled_ts'] - done['command_ts'],
+            'readback_delay': (readbacks['received_ts'] -
+                               readbacks['timestamp']),
+        }
+        intervals['overhead'] = (intervals['total_time'] -
+                                 intervals['motion_time'])
+
+        summary = dict(name=self.positioner.name,
+                       moves=len(moves),
+                       successful=len(done),
+                       overwritten=max(self._moves.count -
+                                       self._moves.capacity, 0),
+                       readbacks=len(readbacks),
+                       )
+
+        for key, values in intervals.items():
+            values = values[np.isfinite(values)]
+            if len(values):
+                summary[key] = dict(mean=float(np.mean(values)),
+                                    p50=float(np.percentile(values, 50)),
+                                    p99=float(np.percentile(values, 99)),
+                                    max=float(np.max(values)),
+                                    )
+            else:
+                summary[key] = None
+
+        return summary
+
+    def export(self, filename):
+        '''Save the recorded moves and readbacks to a numpy .npz file
+
+        The file contains the structured arrays 'moves' and 'readbacks'.
+        '''
+        np.savez(filename, moves=self.moves, readbacks=self.readbacks)
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(positioner={0.positioner.name!r}, '
+                'moves={1}, readbacks={2})'
+                ''.format(self, self._moves.count, self._readbacks.count))
@@ -10,6 +10,7 @@
 
 import time as ttime
 import ctypes
+import sys
 import threading
 import queue
 import logging
@@ -251,12 +252,18 @@ def get_pv_form():
 
         return version_tuple
 
-    try:
-        from pkg_resources import parse_version
-    except ImportError:
-        parse_version = _naive_parse_version
+    # plain release versions do not need pkg_resources, which is slow to
+    # import
+    parse_version = _naive_parse_version
+    version = parse_version(epics.__version__)
 
-    version = parse_version(_fix_git_versioning(epics.__version__))
+    if version is None:
+        try:
+            from pkg_resources import parse_version
+        except ImportError:
+            pass
+        else:
+            version = parse_version(_fix_git_versioning(epics.__version__))
 
     if version is None:
         warnings.warn('Unrecognized PyEpics version; using local timestamps',
@@ -272,7 +279,19 @@ def get_pv_form():
         return 'time'
 
 
-pv_form = get_pv_form()
+def __getattr__(name):
+    # pv_form is determined on first use (Python 3.7+), i.e., when the first
+    # PV is created rather than on import
+    if name == 'pv_form':
+        global pv_form
+        pv_form = get_pv_form()
+        return pv_form
+    raise AttributeError('module {!r} has no attribute {!r}'
+                         ''.format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    pv_form = get_pv_form()
 
 
 def records_from_db(fn):
@@ -384,6 +403,52 @@ def set_and_wait(signal, val, poll_time=0.01, timeout=10):
                                (signal, val, timeout, current_value))
 
 
+_pv_type_map = {'string': 'string',
+                'enum': 'integer',
+                'char': 'integer',
+                'short': 'integer',
+                'int': 'integer',
+                'long': 'integer',
+                'float': 'number',
+                'double': 'number',
+                }
+
+
+def pv_data_type_shape(pv_type, count, *, as_string=False):
+    '''Determine the data-type and shape of a PV from its channel type
+
+    For describing a PV without its value (as data_type and data_shape do),
+    given the type and element count of the channel.
+
+    Parameters
+    ----------
+    pv_type : str
+        The channel type name, e.g. 'double' or 'time_double'
+    count : int
+        The number of elements
+    as_string : bool, optional
+        The value is read as a string
+
+    Returns
+    -------
+    dtype : str
+        One of ('number', 'array', 'string', 'integer')
+    shape : list
+    '''
+    if as_string:
+        return 'string', []
+
+    pv_type = pv_type.split('_', 1)[-1]
+    try:
+        dtype = _pv_type_map[pv_type]
+    except KeyError:
+        raise ValueError('Unknown channel type {!r}'.format(pv_type))
+
+    if count is not None and count > 1 and dtype != 'string':
+        return 'array', [count]
+    return dtype, []
+
+
 def _compare_maybe_enum(a, b, enums):
     if not enums:
         return a == b
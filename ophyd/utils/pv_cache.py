@@ -0,0 +1,167 @@
+'''
+:mod:`ophyd.utils.pv_cache` - Persistent PV metadata cache
+==========================================================
+
+.. module:: ophyd.utils.pv_cache
+   :synopsis: Control metadata (units, precision, enum strings, limits,
+              native type and count) of PVs, kept between sessions in an
+              SQLite file
+'''
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['PVMetadataCache', 'set_pv_cache', 'get_pv_cache']
+
+_cache = None
+
+
+class PVMetadataCache:
+    '''Control metadata of PVs, stored in an SQLite file
+
+    The whole file is loaded when opened, so lookups cost no I/O. Updates
+    are written in batches, on `flush` (also called at exit) or once
+    `batch_size` are pending.
+
+    Parameters
+    ----------
+    path : str
+        The cache file, created if it does not exist
+    batch_size : int, optional
+        The number of pending updates at which they are written
+    '''
+    fields = ('units', 'precision', 'enum_strs', 'lower_ctrl_limit',
+              'upper_ctrl_limit', 'type', 'count')
+
+    def __init__(self, path, *, batch_size=500):
+        self.path = os.path.expanduser(path)
+        self.batch_size = batch_size
+
+        self._lock = threading.RLock()
+        self._metadata = {}
+        self._pending = {}
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS pv_metadata '
+                               '(pvname TEXT PRIMARY KEY, metadata TEXT, '
+                               'updated REAL)')
+
+        for pvname, metadata in self._conn.execute(
+                'SELECT pvname, metadata FROM pv_metadata'):
+            try:
+                self._metadata[pvname] = json.loads(metadata)
+            except ValueError:
+                logger.warning('Ignoring invalid cached metadata for %s',
+                               pvname)
+
+        atexit.register(self.flush)
+
+    def get(self, pvname):
+        '''The cached metadata of pvname, or None'''
+        with self._lock:
+            metadata = self._metadata.get(pvname)
+            if metadata is None:
+                return None
+            return dict(metadata)
+
+    def update(self, pvname, metadata):
+        '''Cache the metadata of pvname, if it has changed
+
+        Returns
+        -------
+        changed : bool
+            True if the metadata differed from the cached metadata
+        '''
+        metadata = {key: metadata.get(key) for key in self.fields}
+        if metadata['enum_strs'] is not None:
+            metadata['enum_strs'] = list(metadata['enum_strs'])
+
+        # round trip, so cached and live metadata compare alike
+        metadata = json.loads(json.dumps(metadata))
+
+        with self._lock:
+            if self._metadata.get(pvname) == metadata:
+                return False
+
+            self._metadata[pvname] = metadata
+            self._pending[pvname] = metadata
+            flush = len(self._pending) >= self.batch_size
+
+        if flush:
+            self.flush()
+        return True
+
+    def flush(self):
+        '''Write pending updates to the file'''
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending or self._conn is None:
+                return
+
+            now = time.time()
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO pv_metadata VALUES (?, ?, ?)',
+                    [(pvname, json.dumps(metadata), now)
+                     for pvname, metadata in pending.items()])
+
+    def clear(self):
+        '''Remove all cached metadata'''
+        with self._lock:
+            self._metadata.clear()
+            self._pending.clear()
+            with self._conn:
+                self._conn.execute('DELETE FROM pv_metadata')
+
+    def close(self):
+        '''Write pending updates and close the file'''
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def __contains__(self, pvname):
+        return pvname in self._metadata
+
+    def __len__(self):
+        return len(self._metadata)
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}({0.path!r}, entries={1})'
+                ''.format(self, len(self)))
+
+
+def set_pv_cache(path):
+    '''Use a PV metadata cache file for all EpicsSignals
+
+    Parameters
+    ----------
+    path : str or None
+        The cache file, or None to stop using one
+
+    Returns
+    -------
+    cache : PVMetadataCache or None
+    '''
+    global _cache
+
+    if _cache is not None:
+        _cache.close()
+
+    _cache = PVMetadataCache(path) if path is not None else None
+    return _cache
+
+
+def get_pv_cache():
+    '''The PV metadata cache in use, or None'''
+    return _cache
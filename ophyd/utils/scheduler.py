@@ -0,0 +1,157 @@
+'''
+:mod:`ophyd.utils.scheduler` - Shared callback scheduler
+========================================================
+
+.. module:: ophyd.utils.scheduler
+   :synopsis: A single thread which runs callbacks at scheduled times
+'''
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+import epics
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['CallbackScheduler', 'ScheduledCall', 'get_scheduler']
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class ScheduledCall:
+    '''A handle to a callback scheduled with a CallbackScheduler
+
+    Attributes
+    ----------
+    when : float
+        The time (in `time.monotonic` terms) the callback is to be run
+    callback : callable
+        The scheduled callback
+    cancelled : bool
+        Whether or not the callback has been cancelled
+    '''
+    __slots__ = ('when', 'callback', 'args', 'cancelled')
+
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        '''Cancel the callback, if it has not already been run'''
+        self.cancelled = True
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(callback={0.callback!r}, '
+                'when={0.when}, cancelled={0.cancelled})'.format(self))
+
+
+class CallbackScheduler(epics.ca.CAThread):
+    '''A single thread which runs callbacks at scheduled times
+
+    This allows many objects to defer work (coalesced updates, periodic
+    ticks, puts that should not run on a channel access callback thread)
+    without each starting a thread or `threading.Timer` of their own.
+    Callbacks are run in the order they are due, in the initial channel
+    access context, and should return quickly.
+
+    As with asyncio, positional arguments may be passed to callbacks; use
+    `functools.partial` to pass keyword arguments.
+
+    Parameters
+    ----------
+    name : str, optional
+        The thread name
+    '''
+
+    def __init__(self, name='callback_scheduler'):
+        epics.ca.CAThread.__init__(self, name=name)
+
+        self.daemon = True
+        self._queue = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+
+        self.start()
+
+    def call_later(self, delay, callback, *args):
+        '''Run callback(*args) after delay seconds
+
+        Returns
+        -------
+        call : ScheduledCall
+            A handle which may be used to cancel the call
+        '''
+        call = ScheduledCall(time.monotonic() + max(delay, 0.0), callback,
+                             args)
+        with self._cond:
+            heapq.heappush(self._queue, (call.when, next(self._counter),
+                                         call))
+            self._cond.notify()
+
+        return call
+
+    def call_soon(self, callback, *args):
+        '''Run callback(*args) on the scheduler thread
+
+        Returns
+        -------
+        call : ScheduledCall
+            A handle which may be used to cancel the call
+        '''
+        return self.call_later(0.0, callback, *args)
+
+    def _next_call(self):
+        '''Wait for the next due call, or None if the scheduler is stopped'''
+        with self._cond:
+            while not self._stopped:
+                if not self._queue:
+                    self._cond.wait()
+                    continue
+
+                remaining = self._queue[0][0] - time.monotonic()
+                if remaining <= 0:
+                    return heapq.heappop(self._queue)[-1]
+
+                self._cond.wait(remaining)
+
+    def run(self):
+        epics.ca.use_initial_context()
+
+        while True:
+            call = self._next_call()
+            if call is None:
+                break
+            elif call.cancelled:
+                continue
+
+            try:
+                call.callback(*call.args)
+            except Exception as ex:
+                logger.error('Scheduled callback %s failed', call.callback,
+                             exc_info=ex)
+
+    def stop(self):
+        '''Stop the scheduler thread, discarding any pending calls'''
+        with self._cond:
+            self._stopped = True
+            del self._queue[:]
+            self._cond.notify()
+
+
+def get_scheduler():
+    '''Get the shared CallbackScheduler, starting it if necessary'''
+    global _scheduler
+
+    with _scheduler_lock:
+        if _scheduler is None or not _scheduler.is_alive():
+            logger.debug('Starting the callback scheduler')
+            _scheduler = CallbackScheduler()
+
+        return _scheduler
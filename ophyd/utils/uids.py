@@ -0,0 +1,92 @@
+'''
+:mod:`ophyd.utils.uids` - Unique identifiers
+============================================
+
+.. module:: ophyd.utils.uids
+   :synopsis: uuid4 strings, generated in blocks
+'''
+
+import collections
+import os
+import threading
+import uuid
+
+__all__ = ['UidPool', 'new_uid']
+
+
+class UidPool:
+    '''A pool of random (version 4) uuid strings, generated in blocks
+
+    `uuid.uuid4` reads from the system random number generator on every
+    call; the pool reads the random bytes for a whole block of uids at once.
+    Uids generated before a fork are discarded in the child process, so that
+    parent and child do not hand out the same uids.
+
+    Parameters
+    ----------
+    block_size : int, optional
+        The number of uids to generate at a time
+    '''
+
+    def __init__(self, block_size=256):
+        if block_size <= 0:
+            raise ValueError('Block size must be positive')
+
+        self.block_size = block_size
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._uids = collections.deque()
+        self._lock = threading.Lock()
+
+    def _check_pid(self):
+        '''Discard the uids inherited from the parent of a forked process'''
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _generate(self, count):
+        raw = os.urandom(16 * count)
+        return [str(uuid.UUID(bytes=raw[i:i + 16], version=4))
+                for i in range(0, len(raw), 16)]
+
+    def reserve(self, count):
+        '''Ensure at least count uids are ready'''
+        self._check_pid()
+        with self._lock:
+            needed = count - len(self._uids)
+            if needed > 0:
+                blocks = -(-needed // self.block_size)
+                self._uids.extend(self._generate(blocks * self.block_size))
+
+    def take(self, count):
+        '''Take a list of count uids'''
+        self.reserve(count)
+        uids = []
+        while len(uids) < count:
+            try:
+                uids.append(self._uids.popleft())
+            except IndexError:
+                # taken by another thread in the meantime
+                self.reserve(count - len(uids))
+        return uids
+
+    def __call__(self):
+        '''Take a single uid'''
+        self._check_pid()
+        try:
+            return self._uids.popleft()
+        except IndexError:
+            return self.take(1)[0]
+
+    def __len__(self):
+        self._check_pid()
+        return len(self._uids)
+
+
+_pool = UidPool()
+
+
+def new_uid():
+    '''A uuid4 as a string, from the shared UidPool'''
+    return _pool()
@@ -0,0 +1,342 @@
+import gc
+import logging
+import time
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from ophyd.areadetector.detectors import DetectorBase
+from ophyd.areadetector.pipeline import PluginPipelineMonitor
+from ophyd.areadetector.plugins import PluginBase
+from ophyd.areadetector.trigger_mixins import (BurstTrigger,
+                                               PipelinedTrigger)
+from ophyd.device import (Device, Component as Cpt, GenerateDatumInterface)
+from ophyd.signal import Signal
+
+logger = logging.getLogger(__name__)
+
+
+class AcquireSignal(Signal):
+    def put(self, value, *, wait=False, **kwargs):
+        super().put(value, **kwargs)
+
+
+class SoftCam(Device):
+    acquire = Cpt(AcquireSignal, value=0)
+    detector_state = Cpt(Signal, value=0)
+    image_mode = Cpt(Signal, value=0)
+    num_images = Cpt(Signal, value=0)
+    num_images_counter = Cpt(Signal, value=0)
+    trigger_mode = Cpt(Signal, value=0)
+
+
+class SoftFilePlugin(Device, GenerateDatumInterface):
+    array_counter = Cpt(Signal, value=0)
+    num_captured = Cpt(Signal, value=0)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.datums = []
+
+    def generate_datum(self, key, timestamp):
+        self.datums.append(key)
+
+
+def wait_done(status, timeout=2.0):
+    t0 = time.time()
+    while not status.done and time.time() - t0 < timeout:
+        time.sleep(0.01)
+    return status.done
+
+
+class SoftADTest(unittest.TestCase):
+    def test_dispatch(self):
+        class DatumPlugin(Device, GenerateDatumInterface):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.datums = []
+
+            def generate_datum(self, key, timestamp):
+                self.datums.append((key, timestamp))
+
+        class MyDetector(DetectorBase):
+            file1 = Cpt(DatumPlugin, 'File1:')
+            file2 = Cpt(DatumPlugin, 'File2:', lazy=True)
+            other = Cpt(Device, 'Other:')
+
+        det = MyDetector('prefix:', name='det')
+        self.assertNotIn('file2', det._signals)
+
+        det.stage()
+        self.assertEquals(set(det._datum_plugins), {det.file1, det.file2})
+        det.dispatch('light', 1.0)
+        det.unstage()
+        self.assertIs(det._datum_plugins, None)
+
+        # unstaged, plugins are looked up on each dispatch
+        det.dispatch('dark', 2.0)
+        for plugin in (det.file1, det.file2):
+            self.assertEquals(plugin.datums, [('light', 1.0), ('dark', 2.0)])
+
+    def test_burst_trigger(self):
+        class BurstDetector(BurstTrigger, DetectorBase):
+            cam = Cpt(SoftCam, '')
+            file1 = Cpt(SoftFilePlugin, '')
+
+        det = BurstDetector('', name='det', num_frames=5, trigger_mode=1)
+        self.assertRaises(ValueError, setattr, det, 'num_frames', 0)
+        self.assertRaises(RuntimeError, det.trigger)
+
+        def run_burst(frames, captured_start=0):
+            status = det.trigger()
+            datums = len(det.file1.datums)
+            self.assertEquals(det.cam.acquire.get(), 1)
+            det.cam.num_images_counter.put(0)
+            for i in range(1, frames + 1):
+                det.cam.num_images_counter.put(i)
+                # not landed until the file plugin has captured it
+                self.assertEquals(det.frames_landed, i - 1)
+                det.file1.num_captured.put(captured_start + i)
+                self.assertEquals(det.frames_landed, i)
+
+            # the datum is generated once the burst is done
+            self.assertEquals(len(det.file1.datums), datums)
+            det.cam.acquire.put(0)
+            self.assertTrue(wait_done(status))
+            return status
+
+        det.stage()
+        try:
+            self.assertEquals(det.cam.num_images.get(), 5)
+            self.assertEquals(det.cam.trigger_mode.get(), 1)
+
+            status = run_burst(5)
+            self.assertTrue(status.success)
+            self.assertEquals(det.file1.datums, ['det_image'])
+
+            # a short burst fails
+            status = run_burst(3, captured_start=5)
+            self.assertFalse(status.success)
+            self.assertEquals(det.file1.datums, ['det_image'] * 2)
+        finally:
+            det.unstage()
+
+        self.assertEquals(det.cam.num_images.get(), 0)
+
+    def test_pipelined_trigger(self):
+        class PipelinedDetector(PipelinedTrigger, DetectorBase):
+            cam = Cpt(SoftCam, '')
+            file1 = Cpt(SoftFilePlugin, '')
+
+        det = PipelinedDetector('', name='det')
+        cam = det.cam
+        det.stage()
+
+        # point 1: the status finishes when exposure ends
+        st1 = det.trigger()
+        self.assertEquals(cam.acquire.get(), 1)
+        cam.detector_state.put(1)
+        self.assertFalse(st1.done)
+        cam.detector_state.put(2)  # readout
+        self.assertTrue(st1.done and st1.success)
+        self.assertEquals(det.readouts_pending, 1)
+
+        # point 2 is triggered during the readout of point 1, and armed
+        # once acquisition of point 1 is done
+        cam.acquire.put(1)
+        st2 = det.trigger()
+        self.assertEquals(det.file1.datums, ['det_image'] * 2)
+        self.assertEquals(det.readouts_pending, 2)
+
+        det.file1.array_counter.put(1)
+        cam.detector_state.put(0)
+        cam.acquire.put(0)
+        self.assertFalse(st2.done)
+        self.assertEquals(det.readouts_pending, 1)
+
+        t0 = time.time()
+        while cam.acquire.get() != 1 and time.time() - t0 < 2.0:
+            time.sleep(0.01)
+        self.assertEquals(cam.acquire.get(), 1)
+
+        cam.detector_state.put(1)
+        cam.detector_state.put(2)
+        self.assertTrue(wait_done(st2))
+        self.assertFalse(det.wait_for_readout(timeout=0.1))
+
+        cam.detector_state.put(0)
+        cam.acquire.put(0)
+        det.file1.array_counter.put(2)
+        self.assertTrue(det.wait_for_readout(timeout=1.0))
+        self.assertEquals(det.readouts_pending, 0)
+        det.unstage()
+
+    def test_pipeline_monitor(self):
+        class SoftPlugin(PluginBase):
+            port_name = Cpt(Signal)
+            nd_array_port = Cpt(Signal)
+            array_counter = Cpt(Signal)
+            array_rate = Cpt(Signal)
+            queue_use = Cpt(Signal)
+            queue_size = Cpt(Signal)
+            dropped_arrays = Cpt(Signal)
+            pool_used_mem = Cpt(Signal)
+            pool_free_buffers = Cpt(Signal)
+
+        class SoftPipelineCam(Device):
+            array_callbacks = Cpt(Signal)
+            port_name = Cpt(Signal)
+            array_counter = Cpt(Signal)
+
+        class PipelineDetector(DetectorBase):
+            cam = Cpt(SoftPipelineCam, '')
+            roi1 = Cpt(SoftPlugin, '')
+            stats1 = Cpt(SoftPlugin, '')
+
+        det = PipelineDetector('', name='det')
+        det.cam.port_name.put('CAM')
+        for plugin, port, upstream in ((det.roi1, 'ROI1', 'CAM'),
+                                       (det.stats1, 'STATS1', 'ROI1')):
+            plugin.port_name.put(port)
+            plugin.nd_array_port.put(upstream)
+            plugin.queue_size.put(10)
+            plugin.queue_use.put(0)
+            plugin.dropped_arrays.put(0)
+
+        monitor = PluginPipelineMonitor(det)
+        self.assertEquals(monitor.stages, [det.cam, det.roi1, det.stats1])
+        self.assertEquals(monitor.graph(), {'CAM': ['ROI1'],
+                                            'ROI1': ['STATS1'],
+                                            'STATS1': []})
+
+        for i in range(11):
+            ts = 100.0 + i * 0.1
+            det.cam.array_counter.put(i, timestamp=ts)
+            det.roi1.array_counter.put(i, timestamp=ts)
+            det.stats1.array_counter.put(i // 2, timestamp=ts)
+            det.stats1.dropped_arrays.put(i // 2, timestamp=ts)
+
+        det.stats1.queue_use.put(10)
+
+        info = {info['name']: info for info in monitor.snapshot()}
+        self.assertAlmostEqual(info['det_cam']['throughput'], 10.0)
+        self.assertAlmostEqual(info['det_stats1']['throughput'], 5.0)
+        self.assertAlmostEqual(info['det_stats1']['drop_rate'], 5.0)
+        self.assertEquals(info['det_stats1']['queue_fill'], 1.0)
+        self.assertTrue(info['det_stats1']['saturated'])
+        self.assertFalse(info['det_roi1']['saturated'])
+        self.assertEquals(monitor.bottleneck()['name'], 'det_stats1')
+
+        f = StringIO()
+        monitor.report(f=f)
+        self.assertIn('Slowest stage: det_stats1 (saturated)', f.getvalue())
+
+        monitor.stop()
+        det.stats1.queue_use.put(0)
+        self.assertTrue(monitor.bottleneck()['saturated'])
+
+    def test_signal_index(self):
+        from ophyd.areadetector.cam import SimDetectorCam
+
+        index = SimDetectorCam.signal_index()
+        self.assertIs(SimDetectorCam.signal_index(), index)
+
+        attrs = [attr for attr, score in index.search('acquire')]
+        self.assertEquals(attrs[0], 'acquire')
+        self.assertIn('acquire_period', attrs)
+
+        # all keywords must match, best match first
+        attrs = [attr for attr, score in index.search('acquire time')]
+        self.assertEquals(attrs[0], 'acquire_time')
+        self.assertNotIn('acquire', attrs)
+
+        # camel case suffixes are split into words
+        self.assertEquals(index.search('rate')[0][0], 'array_rate')
+
+        attrs = [attr for attr, score in index.search('^Acquire',
+                                                      use_re=True)]
+        self.assertIn('acquire', attrs)
+        self.assertEquals(index.search('ACQUIRE', case_sensitive=True), [])
+        self.assertEquals(index.search('no_such_word'), [])
+
+    def test_background_write_stage(self):
+        try:
+            from ophyd.areadetector.filestore_mixins import (
+                FileStoreBackgroundWrite)
+        except ImportError:
+            self.skipTest('filestore is not installed')
+
+        from ophyd.utils import RedundantStaging
+
+        class SoftWriter(FileStoreBackgroundWrite, Device):
+            value = Cpt(Signal, value=0)
+
+            def _insert_datums(self, batch):
+                inserted.extend(uid for resource, uid, kwargs in batch)
+
+        inserted = []
+        writer = SoftWriter('', name='writer', write_path_template='/tmp')
+        writer.stage()
+        writer._resource = 'resource'
+        thread = writer._datum_writer
+        uid = writer.generate_datum('image', time.time())
+
+        # staging again leaves the writer thread and its queue in place
+        self.assertRaises(RedundantStaging, writer.stage)
+        self.assertIs(writer._datum_writer, thread)
+
+        writer.unstage()
+        self.assertFalse(thread.is_alive())
+        self.assertEquals(inserted, [uid])
+
+    def test_find_signal(self):
+        from ophyd.areadetector.base import ADBase, _signal_indexes
+
+        class SoftAD(ADBase):
+            acquire = Cpt(Signal, value=0, doc="Start (1) or stop (0)")
+            acquire_time = Cpt(Signal, value=0, doc='Exposure time')
+            array_rate = Cpt(Signal, value=0, doc="Array rate (frames/s)")
+
+        det = SoftAD('', name='det')
+        found = []
+
+        def match(attr, signal, doc):
+            found.append(attr)
+
+        # by default, text is a substring of the documentation
+        self.assertEquals(det.find_signal('rate (', match_fcn=match),
+                          ['array_rate'])
+        self.assertEquals(found, ['array_rate'])
+        self.assertEquals(det.find_signal('(', match_fcn=match),
+                          ['acquire', 'array_rate'])
+        self.assertEquals(det.find_signal('time', match_fcn=match),
+                          ['acquire_time'])
+        self.assertEquals(det.find_signal('xposure', match_fcn=match),
+                          ['acquire_time'])
+        self.assertEquals(det.find_signal('EXPOSURE', match_fcn=match,
+                                          case_sensitive=True), [])
+        self.assertEquals(det.find_signal(r'^Start', use_re=True,
+                                          match_fcn=match), ['acquire'])
+
+        # keywords may be found in any field, in any order
+        self.assertEquals(det.find_signal('time acquire', match_fcn=match),
+                          [])
+        self.assertEquals(det.find_signal('time acquire', match_fcn=match,
+                                          keywords=True), ['acquire_time'])
+        self.assertEquals(det.find_signal('(', match_fcn=match,
+                                          keywords=True), [])
+
+        # the index does not keep the class alive
+        self.assertIn(SoftAD, _signal_indexes)
+        del det, SoftAD
+        gc.collect()
+        self.assertFalse(any(cls.__name__ == 'SoftAD'
+                             for cls in _signal_indexes.keys()))
+
+
+from . import main
+is_main = (__name__ == '__main__')
+main(is_main)
@@ -184,6 +184,59 @@ class DeviceTests(unittest.TestCase):
         self.assertEquals(device.cpt.read_pv,
                           device.prefix + MyDevice.cpt.suffix)
 
+    def test_lazy_docstrings(self):
+        class MyDevice(Device):
+            cpt = Component(FakeSignal, 'suffix')
+            documented = Component(FakeSignal, 'doc', doc='documented')
+
+        self.assertIs(MyDevice.cpt.__dict__.get('_docstring'), None)
+        self.assertIn("Component(FakeSignal, 'suffix')", MyDevice.cpt.__doc__)
+        self.assertEqual(MyDevice.documented.__doc__, 'documented')
+        self.assertIn('descriptor', Component.__doc__)
+
+        MyDevice.cpt.__doc__ = 'replaced'
+        self.assertEqual(MyDevice.cpt.__doc__, 'replaced')
+
+    def test_lazy_unused(self):
+        class SubDevice(Device):
+            used = Component(FakeSignal, 'used')
+            unused = Component(FakeSignal, 'unused')
+
+        class MyDevice(Device):
+            cpt1 = Component(FakeSignal, '1')
+            cpt2 = Component(FakeSignal, '2')
+            cpt3 = Component(FakeSignal, '3')
+            acquire = Component(FakeSignal, 'acq', trigger_value=1)
+            lazy = Component(FakeSignal, 'lazy', lazy=True)
+            sub = Component(SubDevice, 'sub:', read_attrs=['used'])
+
+        d = MyDevice('prefix', name='d', read_attrs=['cpt1', 'sub'],
+                     configuration_attrs=['cpt2'], lazy_unused=True)
+        self.assertEqual(set(d._signals), {'cpt1', 'cpt2', 'acquire', 'sub'})
+        self.assertEqual(set(d.sub._signals), {'used'})
+
+        report = d.deferred_report()
+        self.assertEqual(report['instantiated'], 4)
+        self.assertEqual(report['avoided'], 2)
+        self.assertEqual(report['deferred'], ['d.cpt3', 'd.sub.unused'])
+
+        # created on first access
+        self.assertEqual(d.cpt3.get(), 'd_cpt3')
+        self.assertEqual(d.deferred_report()['deferred'], ['d.sub.unused'])
+        d.wait_for_connection()
+        self.assertNotIn('lazy', d._signals)
+
+        # the default instantiates everything not lazy
+        d = MyDevice('prefix', name='d', read_attrs=['cpt1'])
+        self.assertEqual(set(d._signals),
+                         {'cpt1', 'cpt2', 'cpt3', 'acquire', 'sub'})
+        self.assertEqual(d.deferred_report()['avoided'], 0)
+
+        class LazyDevice(MyDevice):
+            lazy_unused = True
+
+        d = LazyDevice('prefix', name='d', read_attrs=['cpt1'])
+        self.assertEqual(set(d._signals), {'cpt1', 'acquire', 'sub'})
 
     def test_root(self):
         class MyDevice(Device):
@@ -5,6 +5,7 @@ from copy import copy
 from numpy.testing import assert_approx_equal
 
 from ophyd import (EpicsMotor, Signal, EpicsSignalRO, Component as C)
+from ophyd.status import wait as status_wait
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +75,18 @@ def test_move(motor):
     assert_approx_equal(m.position, 0.0)
 
 
+def test_moving(motor):
+    m = motor
+
+    status = m.move(0.1, timeout=5, wait=False)
+    status_wait(status)
+    assert not m.moving
+    assert m.motor_done_move.get() == 1
+
+    m.move(0.0, timeout=5, wait=True)
+    assert not m.moving
+
+
 def test_copy(motor):
     m = motor
 
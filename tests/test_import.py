@@ -0,0 +1,54 @@
+import importlib
+import sys
+import types
+import unittest
+
+import ophyd
+from . import main
+
+
+class LazyImportTests(unittest.TestCase):
+    def test_lazy_names(self):
+        for name, module in ophyd._lazy_names.items():
+            module = importlib.import_module(module, 'ophyd')
+            self.assertIs(getattr(ophyd, name), getattr(module, name))
+
+        self.assertIsInstance(ophyd.__version__, str)
+        self.assertIn('SimDetector', dir(ophyd))
+        self.assertRaises(AttributeError, getattr, ophyd, 'not_an_attribute')
+
+    def test_areadetector_names(self):
+        # everything exported by the area detector package is available
+        namespace = {}
+        exec('from ophyd.areadetector import *', namespace)
+        names = set(name for name, value in namespace.items()
+                    if getattr(value, '__module__', '').startswith(
+                        'ophyd.areadetector'))
+
+        self.assertIn('SimDetector', names)
+        self.assertEqual(names - set(ophyd.__all__), set())
+
+    def test_import_is_lazy(self):
+        saved = dict(sys.modules)
+        try:
+            for name in list(sys.modules):
+                if name == 'ophyd' or name.startswith('ophyd.'):
+                    del sys.modules[name]
+
+            fresh = importlib.import_module('ophyd')
+            self.assertIsInstance(fresh, types.ModuleType)
+            self.assertNotIn('ophyd.commands', sys.modules)
+            self.assertNotIn('ophyd.areadetector', sys.modules)
+
+            # submodules are still available as attributes
+            self.assertIs(fresh.commands, sys.modules['ophyd.commands'])
+            self.assertIs(fresh.areadetector,
+                          sys.modules['ophyd.areadetector'])
+            self.assertIn('commands', dir(fresh))
+        finally:
+            sys.modules.clear()
+            sys.modules.update(saved)
+
+
+is_main = (__name__ == '__main__')
+main(is_main)
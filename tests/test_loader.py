@@ -0,0 +1,95 @@
+import logging
+import unittest
+
+import epics
+
+from ophyd import (Device, Component as Cpt, FormattedComponent as FCpt,
+                   EpicsSignal, Signal)
+from ophyd.loader import load_devices, LoadReport
+from .test_signal import FakeEpicsPV
+
+logger = logging.getLogger(__name__)
+
+
+def setUpModule():
+    epics._PV = epics.PV
+    epics.PV = FakeEpicsPV
+
+
+def tearDownModule():
+    if __name__ == '__main__':
+        epics.ca.destroy_context()
+    epics.PV = epics._PV
+
+
+class MyDevice(Device):
+    a = Cpt(EpicsSignal, 'a')
+    b = Cpt(EpicsSignal, 'b')
+
+
+class Unconnected(Device):
+    a = Cpt(EpicsSignal, 'a')
+    never = FCpt(EpicsSignal, 'does_not_connect')
+
+
+class Broken(Device):
+    def __init__(self, prefix, **kwargs):
+        raise RuntimeError('broken')
+
+
+class LoaderTests(unittest.TestCase):
+    def test_load(self):
+        spec = [{'class': MyDevice, 'prefix': 'dev1:', 'name': 'dev1'},
+                {'class': 'tests.test_loader.MyDevice', 'prefix': 'dev2:',
+                 'name': 'dev2', 'kwargs': {'read_attrs': ['a']}},
+                {'class': 'ophyd.Signal', 'name': 'soft',
+                 'kwargs': {'value': 1}},
+                ]
+
+        report = load_devices(spec, timeout=2.0)
+        self.assertIsInstance(report, LoadReport)
+        self.assertTrue(report.ok)
+        self.assertEqual(list(report.devices), ['dev1', 'dev2', 'soft'])
+        self.assertEqual(set(report.connect_times), {'dev1', 'dev2', 'soft'})
+
+        dev2 = report.devices['dev2']
+        self.assertIsInstance(dev2, MyDevice)
+        self.assertEqual(dev2.prefix, 'dev2:')
+        self.assertEqual(dev2.read_attrs, ['a'])
+        self.assertIsInstance(report.devices['soft'], Signal)
+        self.assertEqual(report.devices['soft'].get(), 1)
+
+        self.assertIn('3 devices built', report.summary())
+        repr(report)
+
+    def test_failures(self):
+        spec = {'ok': {'class': MyDevice, 'prefix': 'ok:'},
+                'broken': {'class': Broken, 'prefix': 'broken:'},
+                'missing': {'class': 'ophyd.NotAClass', 'prefix': 'x:'},
+                'slow': {'class': Unconnected, 'prefix': 'slow:'},
+                }
+
+        report = load_devices(spec, timeout=0.5)
+        self.assertFalse(report.ok)
+        self.assertIn('ok', report.connect_times)
+        self.assertEqual(set(report.failed), {'broken', 'missing'})
+        self.assertIsInstance(report.failed['broken'], RuntimeError)
+        self.assertEqual(report.unconnected['slow'],
+                         ['slow.never (does_not_connect)'])
+
+        summary = report.summary()
+        self.assertIn('broken', summary)
+        self.assertIn('does_not_connect', summary)
+
+    def test_bad_spec(self):
+        self.assertRaises(ValueError, load_devices, [{'class': MyDevice}])
+        self.assertRaises(ValueError, load_devices,
+                          [{'class': MyDevice, 'name': 'a', 'prefx': 'a:'}])
+        self.assertRaises(ValueError, load_devices,
+                          [{'class': MyDevice, 'name': 'a'},
+                           {'class': MyDevice, 'name': 'a'}])
+
+
+from . import main
+is_main = (__name__ == '__main__')
+main(is_main)
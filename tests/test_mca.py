@@ -6,9 +6,13 @@ import time
 from copy import copy
 
 import epics
+import numpy as np
 
-from ophyd import EpicsMCA, EpicsDXP
-from ophyd.mca import add_rois
+from ophyd import (EpicsMCA, EpicsDXP, Component as Cpt,
+                   DynamicDeviceComponent as DDC)
+from ophyd.mca import (add_rois, roi_sums, SpectrumROIs,
+                       EpicsDXPMultiElement, add_dxp_elements,
+                       add_mca_elements, dead_time_factors)
 from ophyd.utils import enum, ReadOnlyError
 from .test_signal import FakeEpicsPV
 from . import main
@@ -89,6 +93,50 @@ class MCATests(unittest.TestCase):
         self.assertRaises(ReadOnlyError, mca.rois.roi1.count.put, 3.14)
         self.assertRaises(ReadOnlyError, mca.rois.roi1.net_count.put, 3.14)
 
+    def test_roi_sums(self):
+        spectrum = np.arange(10, dtype=float)
+        count, net = roi_sums(spectrum, [2, 0, -1, 5], [4, 9, 3, 4],
+                              [0, 1, 1, 1])
+        np.testing.assert_array_equal(count, [9, 45, 0, 0])
+        # background: mean of channels 0 and 9, times 10 channels
+        np.testing.assert_array_equal(net, [9, 0, 0, 0])
+
+        # several spectra at once
+        spectra = np.vstack([spectrum, 2 * spectrum])
+        count, net = roi_sums(spectra, [2], [4], [1])
+        np.testing.assert_array_equal(count, [[9], [18]])
+        np.testing.assert_array_equal(net, [[0], [0]])
+
+    def test_spectrum_rois(self):
+        class MyMCA(EpicsMCA):
+            fast_rois = Cpt(SpectrumROIs, '')
+
+        mca = MyMCA(devs[0], name='mca', read_attrs=['fast_rois'])
+        mca.wait_for_connection()
+        mca.fast_rois.set_roi(3, 0, 4, bkgnd_chans=0, label='Fe')
+        mca.fast_rois.set_roi(1, 5, 9, bkgnd_chans=1)
+        mca.fast_rois.set_roi(2, 5, 2)
+        self.assertEqual(list(mca.fast_rois.table), [1, 3])
+
+        spectrum = np.ones(16)
+        mca.spectrum.get = lambda **kwargs: spectrum
+
+        desc = mca.describe()
+        reading = mca.read()
+        self.assertEqual(list(desc), list(reading))
+        self.assertEqual(list(reading), ['mca_fast_rois_roi1_count',
+                                         'mca_fast_rois_roi1_net_count',
+                                         'mca_fast_rois_roi3_count',
+                                         'mca_fast_rois_roi3_net_count'])
+        self.assertEqual(desc['mca_fast_rois_roi3_count']['roi_label'], 'Fe')
+        self.assertEqual(reading['mca_fast_rois_roi1_count']['value'], 5)
+        self.assertEqual(reading['mca_fast_rois_roi1_net_count']['value'], 0)
+        self.assertEqual(reading['mca_fast_rois_roi3_net_count']['value'], 5)
+
+        # the table is read from the ROIs of the MCA
+        mca.fast_rois.refresh()
+        self.assertEqual(len(mca.fast_rois.table), 32)
+
 
 class DxpTests(unittest.TestCase):
 
@@ -129,5 +177,54 @@ class DxpTests(unittest.TestCase):
         self.assertRaises(ReadOnlyError, dxp.output_count_rate.put, 2)
 
 
+class DxpMultiElementTests(unittest.TestCase):
+    def test_dead_time_factors(self):
+        np.testing.assert_array_equal(dead_time_factors([10, 5, 3], [5, 5, 0]),
+                                      [2, 1, 1])
+
+    def test_corrected_sum(self):
+        class TwoElement(EpicsDXPMultiElement):
+            dxps = DDC(add_dxp_elements(range(1, 3)))
+            mcas = DDC(add_mca_elements(range(1, 3)))
+
+        det = TwoElement('XF:23ID2-ES{Vortex}', name='det')
+        det.wait_for_connection()
+        self.assertEqual(det.num_elements, 2)
+        self.assertEqual(det.mcas.mca2.prefix, 'XF:23ID2-ES{Vortex}mca2')
+
+        rates = [(2000., 1000.), (500., 500.)]
+        for i, (dxp, mca) in enumerate(det._elements):
+            spectrum = np.arange(8.) + i
+            mca.spectrum.get = lambda spectrum=spectrum, **kwargs: spectrum
+            icr, ocr = rates[i]
+            dxp.input_count_rate.get = lambda icr=icr, **kwargs: icr
+            dxp.output_count_rate.get = lambda ocr=ocr, **kwargs: ocr
+
+        expected = 2 * np.arange(8.) + (np.arange(8.) + 1)
+        reading = det.read()
+        np.testing.assert_array_equal(reading['det_corrected_sum']['value'],
+                                      expected)
+        np.testing.assert_array_equal(det.dead_time_factors, [2, 1])
+        np.testing.assert_array_equal(det.corrected_spectra().sum(axis=0),
+                                      expected)
+
+        desc = det.describe()['det_corrected_sum']
+        self.assertEqual(desc['shape'], [8])
+        self.assertRaises(ReadOnlyError, det.corrected_sum.put, expected)
+
+        # a new spectrum length for all elements reallocates the stack...
+        for i, (dxp, mca) in enumerate(det._elements):
+            spectrum = np.arange(4.) + i
+            mca.spectrum.get = lambda spectrum=spectrum, **kwargs: spectrum
+
+        det.update()
+        np.testing.assert_array_equal(det.spectra,
+                                      [np.arange(4.), np.arange(4.) + 1])
+
+        # ... while mismatched lengths are an error
+        mca.spectrum.get = lambda **kwargs: np.arange(5.)
+        self.assertRaises(ValueError, det.update)
+
+
 is_main = (__name__ == '__main__')
 main(is_main)
@@ -2,6 +2,7 @@
 
 import time
 import logging
+import threading
 import unittest
 import pytest
 from copy import copy
@@ -10,8 +11,10 @@ from unittest.mock import Mock
 
 import epics
 import ophyd
-from ophyd import (SoftPositioner, PVPositioner)
+from ophyd import (SoftPositioner, SimPositioner, PVPositioner)
+from ophyd.positioner import move_time
 from ophyd import (Component as C)
+from ophyd.status import wait as status_wait
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +40,46 @@ def test_positioner_settle():
     assert p.timeout == 20.0
 
 
+def test_positioner_adaptive_settle():
+    p = SoftPositioner(name='test', egu='egu', limits=(-10, 10),
+                       settle_time=2.0, settle_tolerance=0.01,
+                       settle_dwell=0.05)
+    assert p.settle_tolerance == 0.01
+    assert p.settle_dwell == 0.05
+    assert p.settle_stats['count'] == 0
+
+    # the readback of a SoftPositioner is stable immediately
+    st = p.move(1.0, wait=True)
+    assert st.success
+    assert 0.05 <= st.settle_elapsed < 1.0
+    assert not st.settle_capped
+
+    # the readback never settles: the settle time is the maximum
+    p.settle_time = 0.2
+    st = p.move(2.0, wait=False)
+
+    def jitter():
+        for i in range(60):
+            p._set_position(2.0 + 0.05 * i)
+            time.sleep(0.005)
+
+    thread = threading.Thread(target=jitter)
+    thread.start()
+    status_wait(st)
+    thread.join()
+
+    assert st.settle_capped
+    assert 0.2 <= st.settle_elapsed < 1.0
+
+    stats = p.settle_stats
+    assert stats['count'] == 2
+    assert stats['capped'] == 1
+    assert stats['max'] == st.settle_elapsed
+
+    p.reset_settle_stats()
+    assert p.settle_stats['count'] == 0
+
+
 def test_positioner():
     p = SoftPositioner(name='test', egu='egu', limits=(-10, 10))
 
@@ -104,6 +147,97 @@ def test_positioner():
     assert pc.limits == p.limits
 
 
+def test_move_time():
+    assert move_time(0, 1.0, 0.5) == 0.0
+    # no acceleration
+    assert move_time(2.0, 1.0, 0.0) == 2.0
+    # trapezoidal: cruise distance / velocity + acceleration time
+    assert move_time(-2.0, 1.0, 0.5) == 2.5
+    # triangular: full velocity is never reached
+    assert abs(move_time(0.25, 1.0, 0.5) - 2 * (0.125) ** 0.5) < 1e-9
+
+    with pytest.raises(ValueError):
+        move_time(1.0, 0.0, 0.0)
+
+
+def test_sim_positioner():
+    p = SimPositioner(name='sim', velocity=10.0, acceleration=0.05,
+                      update_rate=100.0, limits=(-10, 10), egu='mm')
+    assert p.position == 0.0
+    assert p.velocity.get() == 10.0
+
+    readbacks = []
+    started = Mock()
+    finished = Mock()
+    p.subscribe(lambda value=None, **kw: readbacks.append(value),
+                event_type=p.SUB_READBACK, run=False)
+    p.subscribe(started, event_type=p.SUB_START, run=False)
+    p.subscribe(finished, event_type=p.SUB_DONE, run=False)
+
+    st = p.move(1.0, wait=False)
+    assert p.moving
+    assert not st.done
+    status_wait(st, timeout=2.0)
+
+    assert not p.moving
+    assert p.position == 1.0
+    assert st.elapsed >= move_time(1.0, 10.0, 0.05)
+    assert readbacks[-1] == 1.0
+    # intermediate readbacks, increasing monotonically
+    assert len(readbacks) > 3
+    assert readbacks == sorted(readbacks)
+    assert started.call_count == 1
+    assert finished.call_count == 1
+
+    # a stopped move fails, leaving the position where it was
+    st = p.move(-5.0, wait=False)
+    time.sleep(0.1)
+    p.stop()
+    with pytest.raises(RuntimeError):
+        status_wait(st, timeout=1.0)
+    assert -5.0 < p.position < 1.0
+    assert finished.call_count == 1
+
+
+def test_auto_timeout():
+    p = SimPositioner(name='sim', velocity=10.0, update_rate=100.0,
+                      auto_timeout=True)
+    assert p.auto_timeout
+    assert abs(p.time_to_target(5.0) - 0.5) < 1e-9
+
+    st = p.move(5.0, wait=True)
+    expected = 0.5 * p.auto_timeout_factor + p.auto_timeout_margin
+    assert abs(st.timeout - expected) < 1e-9
+
+    # an explicit timeout takes precedence
+    st = p.move(0.0, wait=True, timeout=3.0)
+    assert st.timeout == 3.0
+
+    p.auto_timeout = False
+    st = p.move(1.0, wait=True)
+    assert st.timeout is None
+
+    assert SoftPositioner(name='soft').time_to_target(1.0) == 0.0
+
+
+def test_sim_positioner_backlash():
+    p = SimPositioner(name='sim', velocity=50.0, update_rate=200.0,
+                      backlash=0.5)
+    readbacks = []
+    p.subscribe(lambda value=None, **kw: readbacks.append(value),
+                event_type=p.SUB_READBACK, run=False)
+
+    # moving against the backlash direction overshoots
+    p.move(-1.0, wait=True, timeout=2.0)
+    assert p.position == -1.0
+    assert min(readbacks) < -1.0
+
+    # moving with it does not
+    del readbacks[:]
+    p.move(1.0, wait=True, timeout=2.0)
+    assert max(readbacks) == 1.0
+
+
 from . import main
 is_main = (__name__ == '__main__')
 main(is_main)
@@ -6,8 +6,13 @@ import unittest
 from copy import copy
 
 import epics
-from ophyd import (PseudoPositioner, PseudoSingle, EpicsMotor)
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+from ophyd import (PseudoPositioner, PseudoSingle, EpicsMotor, SoftPositioner,
+                   SimPositioner)
 from ophyd import (Component as C)
+from ophyd.pseudopos import (pseudo_array_argument, to_position_columns)
+from ophyd.utils import LimitError
 
 
 logger = logging.getLogger(__name__)
@@ -76,6 +81,177 @@ class Pseudo1x3(PseudoPositioner):
         return self.PseudoPosition(pseudo1=-real_pos.real1)
 
 
+class SoftPseudo2x2(PseudoPositioner):
+    pseudo1 = C(PseudoSingle, limits=(-10, 10))
+    pseudo2 = C(PseudoSingle, limits=None)
+    real1 = C(SoftPositioner, limits=(-5, 5))
+    real2 = C(SoftPositioner, limits=None)
+
+    def forward(self, pseudo_pos):
+        pseudo_pos = self.PseudoPosition(*pseudo_pos)
+        return self.RealPosition(real1=pseudo_pos.pseudo1 + pseudo_pos.pseudo2,
+                                 real2=pseudo_pos.pseudo1 - pseudo_pos.pseudo2)
+
+    def inverse(self, real_pos):
+        real_pos = self.RealPosition(*real_pos)
+        return self.PseudoPosition(pseudo1=(real_pos.real1 + real_pos.real2) / 2,
+                                   pseudo2=(real_pos.real1 - real_pos.real2) / 2)
+
+
+class VectorizedSoftPseudo2x2(SoftPseudo2x2):
+    @pseudo_array_argument
+    def forward_many(self, pseudo_pos):
+        return self.forward(pseudo_pos)
+
+
+class SimPseudo2x2(PseudoPositioner):
+    pseudo1 = C(PseudoSingle, limits=(-10, 10))
+    pseudo2 = C(PseudoSingle, limits=(-10, 10))
+    real1 = C(SimPositioner, velocity=2.0, update_rate=100.0)
+    real2 = C(SimPositioner, velocity=4.0, update_rate=100.0)
+
+    def forward(self, pseudo_pos):
+        pseudo_pos = self.PseudoPosition(*pseudo_pos)
+        return self.RealPosition(real1=pseudo_pos.pseudo1,
+                                 real2=pseudo_pos.pseudo2)
+
+    def inverse(self, real_pos):
+        real_pos = self.RealPosition(*real_pos)
+        return self.PseudoPosition(pseudo1=real_pos.real1,
+                                   pseudo2=real_pos.real2)
+
+
+class PseudoArrayTests(unittest.TestCase):
+    def test_columns(self):
+        pseudo = SoftPseudo2x2('', name='mypseudo')
+        expected = pseudo.PseudoPosition(pseudo1=np.array([1., 3.]),
+                                         pseudo2=np.array([2., 4.]))
+
+        structured = np.array([(1, 2), (3, 4)],
+                              dtype=[('pseudo1', float), ('pseudo2', float)])
+        for positions in ([[1, 2], [3, 4]], structured, expected):
+            cols = to_position_columns(pseudo.PseudoPosition, positions)
+            assert_array_almost_equal(cols, expected)
+
+        self.assertRaises(ValueError, to_position_columns,
+                          pseudo.PseudoPosition, [1, 2, 3])
+        self.assertRaises(ValueError, to_position_columns,
+                          pseudo.PseudoPosition, [[1, 2, 3]])
+        self.assertRaises(ValueError, to_position_columns,
+                          pseudo.PseudoPosition, structured[['pseudo1']])
+
+    def test_forward_inverse_many(self):
+        for cls in (SoftPseudo2x2, VectorizedSoftPseudo2x2):
+            pseudo = cls('', name='mypseudo')
+            pseudo_pos = np.random.uniform(-1, 1, size=(100, 2))
+
+            real_pos = pseudo.forward_many(pseudo_pos)
+            self.assertEqual(real_pos.shape, (100, 2))
+            for pp, rp in zip(pseudo_pos, real_pos):
+                assert_array_almost_equal(pseudo.forward(pp), rp)
+
+            assert_array_almost_equal(pseudo.inverse_many(real_pos),
+                                      pseudo_pos)
+
+            structured = pseudo.forward_many(
+                np.array([tuple(pt) for pt in pseudo_pos],
+                         dtype=[('pseudo1', float), ('pseudo2', float)]))
+            self.assertEqual(structured.dtype.names, ('real1', 'real2'))
+            assert_array_almost_equal(structured['real1'], real_pos[:, 0])
+
+            cols = pseudo.inverse_many(pseudo.RealPosition(*real_pos.T))
+            self.assertIsInstance(cols, pseudo.PseudoPosition)
+            assert_array_almost_equal(cols.pseudo2, pseudo_pos[:, 1])
+
+    def test_check_trajectory(self):
+        pseudo = SoftPseudo2x2('', name='mypseudo')
+
+        pseudo1 = np.linspace(-2, 2, 10)
+        real_pos = pseudo.check_trajectory(np.column_stack([pseudo1,
+                                                            pseudo1]))
+        assert_array_almost_equal(real_pos.real1, 2 * pseudo1)
+
+        # outside of pseudo1 limits
+        with self.assertRaises(LimitError) as cm:
+            pseudo.check_trajectory([[0, 0], [11, 0], [12, 0]])
+        self.assertIn('point 1', str(cm.exception))
+
+        # within pseudo limits, but outside of real1 limits
+        with self.assertRaises(LimitError) as cm:
+            pseudo.check_trajectory([[0, 0], [1, 1], [3, 3]])
+        self.assertIn('point 2', str(cm.exception))
+
+    def test_time_to_target(self):
+        pseudo = SimPseudo2x2('', name='mypseudo')
+        self.assertAlmostEqual(pseudo.time_to_target((0.4, 0.4)), 0.2)
+        self.assertAlmostEqual(pseudo.pseudo2.time_to_target(0.8), 0.2)
+
+        pseudo._concurrent = False
+        self.assertAlmostEqual(pseudo.time_to_target((0.4, 0.4)), 0.3)
+
+        soft_pseudo = SoftPseudo2x2('', name='mypseudo')
+        self.assertEqual(soft_pseudo.time_to_target((1, 1)), 0.0)
+
+    def test_coordinated(self):
+        pseudo = SimPseudo2x2('', name='mypseudo', coordinated=True)
+        self.assertTrue(pseudo.coordinated)
+
+        arrival = {}
+
+        def done(obj=None, **kwargs):
+            arrival[obj.name] = time.time()
+
+        for real in pseudo.real_positioners:
+            real.subscribe(done, event_type=real.SUB_DONE, run=False)
+
+        t0 = time.time()
+        pseudo.move((0.4, 0.4), wait=True, timeout=2.0)
+
+        # real2 would have arrived in half the time of real1
+        real1_time = arrival['mypseudo_real1'] - t0
+        real2_time = arrival['mypseudo_real2'] - t0
+        self.assertGreaterEqual(real1_time, 0.15)
+        self.assertAlmostEqual(real2_time / real1_time, 1.0, delta=0.25)
+        self.assertEqual(tuple(pseudo.position), (0.4, 0.4))
+
+        # velocities restored
+        self.assertEqual(pseudo.real1.velocity.get(), 2.0)
+        self.assertEqual(pseudo.real2.velocity.get(), 4.0)
+
+    def test_readback_interval(self):
+        pseudo = SoftPseudo2x2('', name='mypseudo', readback_interval=0.2)
+        self.assertEqual(pseudo.readback_interval, 0.2)
+
+        updates = []
+
+        def readback(value=None, **kwargs):
+            updates.append(value)
+
+        pseudo.real1._set_position(0.0)
+        pseudo.real2._set_position(0.0)
+        pseudo.subscribe(readback, event_type=pseudo.SUB_READBACK, run=False)
+
+        # a burst of real readbacks is coalesced into one trailing update
+        time.sleep(0.3)
+        for i in range(1, 11):
+            pseudo.real1._set_position(float(i))
+            pseudo.real2._set_position(float(i))
+
+        self.assertLessEqual(len(updates), 2)
+        time.sleep(0.5)
+        self.assertLessEqual(len(updates), 2)
+        self.assertEqual(tuple(updates[-1]), (10.0, 0.0))
+
+        # motion completion always reports the final position
+        del updates[:]
+        pseudo.move((1.0, 0.5), wait=True)
+        self.assertEqual(tuple(pseudo.position), (1.0, 0.5))
+        self.assertEqual(tuple(updates[-1]), (1.0, 0.5))
+
+        pseudo.readback_interval = None
+        self.assertIs(pseudo.readback_interval, None)
+
+
 class PseudoPosTests(unittest.TestCase):
     def test_onlypseudo(self):
         # can't instantiate it on its own
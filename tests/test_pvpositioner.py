@@ -2,6 +2,7 @@
 
 import time
 import logging
+import threading
 import unittest
 from copy import copy
 
@@ -9,6 +10,9 @@ import epics
 from ophyd import (PVPositioner, PVPositionerPC, EpicsMotor)
 from ophyd import (EpicsSignal, EpicsSignalRO)
 from ophyd import (Component as C)
+from ophyd.status import wait as status_wait
+
+from .test_signal import FakeEpicsPV
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +28,22 @@ def tearDownModule():
     logger.setLevel(logging.INFO)
 
 
+class FakePutCompletionPV(FakeEpicsPV):
+    '''FakeEpicsPV with delayed put completion callbacks'''
+    put_delay = 0.2
+    puts = []
+
+    def put(self, value, wait=False, callback=None, **kwargs):
+        super().put(value, wait=wait, **kwargs)
+        self.puts.append((self.pvname, value, time.time()))
+
+        if callback is not None:
+            timer = threading.Timer(self.put_delay, callback,
+                                    kwargs=dict(pvname=self.pvname))
+            timer.daemon = True
+            timer.start()
+
+
 class PVPosTest(unittest.TestCase):
     sim_pv = 'XF:31IDA-OP{Tbl-Ax:X1}Mtr'
 
@@ -246,6 +266,71 @@ class PVPosTest(unittest.TestCase):
         repr(pos)
         str(pos)
 
+    def test_nonblocking_setpoint_then_actuate(self):
+        class MyPositioner(PVPositionerPC):
+            setpoint = C(EpicsSignal, 'setpoint')
+            readback = C(EpicsSignalRO, 'readback')
+            actuate = C(EpicsSignal, 'actuate')
+
+        epics._PV, epics.PV = epics.PV, FakePutCompletionPV
+        try:
+            pos = MyPositioner('', name='pc')
+            pos.wait_for_connection()
+        finally:
+            epics.PV = epics._PV
+
+        delay = FakePutCompletionPV.put_delay
+        del FakePutCompletionPV.puts[:]
+
+        t0 = time.time()
+        status = pos.move(0.2, wait=False)
+        self.assertLess(time.time() - t0, delay)
+        self.assertFalse(status.done)
+
+        status_wait(status, timeout=5.0)
+        self.assertTrue(status.success)
+
+        (sp_name, sp_value, sp_time), (act_name, act_value, act_time) = \
+            FakePutCompletionPV.puts
+        self.assertEqual((sp_name, sp_value), ('setpoint', 0.2))
+        self.assertEqual((act_name, act_value), ('actuate', 1))
+        # actuation only after put completion of the setpoint
+        self.assertGreaterEqual(act_time - sp_time, delay)
+        self.assertGreaterEqual(status.elapsed, 2 * delay)
+
+        # a stop before the setpoint completes drops the actuation
+        done_moving = []
+        orig_done_moving = pos._done_moving
+
+        def counted_done_moving(**kwargs):
+            done_moving.append(kwargs)
+            orig_done_moving(**kwargs)
+
+        pos._done_moving = counted_done_moving
+
+        del FakePutCompletionPV.puts[:]
+        status = pos.move(0.3, wait=False)
+        pos.stop()
+        self.assertEqual(done_moving, [{'success': False}])
+        time.sleep(2 * delay)
+        self.assertTrue(status.done)
+        self.assertFalse(status.success)
+        self.assertEqual([name for name, value, ts
+                          in FakePutCompletionPV.puts], ['setpoint'])
+
+        # synchronous errors fail the status and are raised
+        def failed_put(*args, **kwargs):
+            raise RuntimeError('setpoint put failed')
+
+        pos.setpoint._write_pv.put = failed_put
+        del FakePutCompletionPV.puts[:]
+        del done_moving[:]
+        self.assertRaises(RuntimeError, pos.move, 0.25, wait=False)
+        self.assertEqual(done_moving, [{'success': False}])
+        # the actuate signal is never written
+        time.sleep(2 * delay)
+        self.assertEqual(FakePutCompletionPV.puts, [])
+
     def test_pvpositioner_pc_with_actuate(self):
         # TODO
         self.skipTest('TODO')
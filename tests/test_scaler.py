@@ -113,6 +113,80 @@ class SignalTests(unittest.TestCase):
         self.assertIn('scaler_channels_chan1', data)
         self.assertNotIn('scaler_channels_chan2', data)
 
+    def test_channels_array(self):
+        sca = scaler.EpicsScaler(scalers[0], name='scaler',
+                                 read_attrs=['channels_array', 'time'])
+        sca.wait_for_connection()
+        data = sca.read()
+        self.assertNotIn('scaler_channels_chan1', data)
+        self.assertEqual(data['scaler_channels_array']['value'].shape, (32, ))
+        desc = sca.describe()['scaler_channels_array']
+        self.assertEqual(desc['element_names'][0], 'scaler_channels_chan1')
+
+    def test_pruned_scaler(self):
+        sca = scaler.PrunedEpicsScaler(scalers[0], name='scaler',
+                                       active_channels=[3, 1])
+        sca.wait_for_connection()
+        self.assertEqual(sca.active_channels, (1, 3))
+        self.assertEqual(sorted(sca.channels._signals), ['chan1', 'chan3'])
+
+        data = sca.read()
+        self.assertIn('scaler_channels_chan1', data)
+        self.assertIn('scaler_channels_chan3', data)
+        self.assertNotIn('scaler_channels_chan2', data)
+        self.assertIn('scaler_presets_preset3', sca.read_configuration())
+
+        sca.set_active_channels([2])
+        data = sca.read()
+        self.assertIn('scaler_channels_chan2', data)
+        self.assertNotIn('scaler_channels_chan1', data)
+        self.assertRaises(ValueError, sca.set_active_channels, [33])
+
+    def test_pruned_scaler_find(self):
+        sca = scaler.PrunedEpicsScaler(scalers[0], name='scaler')
+        self.assertIs(sca.active_channels, None)
+
+        sca.num_channels.get = lambda **kwargs: 8
+        for i in range(1, 9):
+            sig = getattr(sca.names, 'name{}'.format(i))
+            sig.get = lambda i=i, **kwargs: ('I0' if i in (1, 4) else '')
+
+        sca.wait_for_connection()
+        self.assertEqual(sca.active_channels, (1, 4))
+        self.assertEqual(sorted(sca.channels._signals), ['chan1', 'chan4'])
+        # all names are connected at once
+        self.assertEqual(len(sca.names._signals), 32)
+
+        # channels are found on the first read, rather than all created
+        sca = scaler.PrunedEpicsScaler(scalers[0], name='scaler')
+        self.assertEqual(sca.channels._signals, {})
+        sca.num_channels.get = lambda **kwargs: 2
+        sca.names.name1.get = lambda **kwargs: ''
+        sca.names.name2.get = lambda **kwargs: 'I0'
+
+        data = sca.read()
+        self.assertEqual(sca.active_channels, (2, ))
+        self.assertEqual(sorted(sca.channels._signals), ['chan2'])
+        self.assertIn('scaler_channels_chan2', data)
+        self.assertNotIn('scaler_channels_chan1', data)
+
+    def test_lazy_unused(self):
+        sca = scaler.EpicsScaler(scalers[0], name='scaler',
+                                 read_attrs=['channels'],
+                                 configuration_attrs=[], lazy_unused=True)
+        sca.wait_for_connection()
+        self.assertEqual(len(sca.channels._signals), 32)
+        self.assertEqual(sca.presets._signals, {})
+
+        # created for stage_sigs
+        self.assertIn('count_mode', sca._signals)
+
+        report = sca.deferred_report()
+        # time, preset_time, auto_count_time, presets, gates
+        self.assertEqual(report['avoided'], 67)
+        self.assertIn('scaler.presets.preset1', report['deferred'])
+        self.assertIn('scaler_channels_chan1', sca.read())
+
 
 from . import main
 is_main = (__name__ == '__main__')
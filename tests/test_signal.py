@@ -1,6 +1,8 @@
 
+import os
 import sys
 import logging
+import tempfile
 import unittest
 import threading
 import random
@@ -10,8 +12,11 @@ import copy
 import numpy as np
 import epics
 
-from ophyd.signal import (Signal, EpicsSignal, EpicsSignalRO, DerivedSignal)
+from ophyd.signal import (Signal, EpicsSignal, EpicsSignalRO, DerivedSignal,
+                          ArrayGroupSignal)
 from ophyd.utils import ReadOnlyError
+from ophyd.utils.pv_cache import set_pv_cache
+from ophyd.utils.scheduler import get_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -513,6 +518,97 @@ class EpicsSignalTests(unittest.TestCase):
         self.assertEquals(desc['shape'], [1,])
 
 
+class PVCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._pv = epics.PV
+        epics.PV = FakeEpicsPV
+        self.path = os.path.join(tempfile.mkdtemp(), 'pv_cache.db')
+
+    def tearDown(self):
+        set_pv_cache(None)
+        epics.PV = self._pv
+
+    def test_pv_cache(self):
+        cache = set_pv_cache(self.path)
+        signal = EpicsSignal('fakepv', name='sig')
+        signal.wait_for_connection()
+        signal.describe()
+        self.assertIn('fakepv', cache)
+        self.assertEqual(cache.get('fakepv')['precision'], 0)
+
+        # the next session reads the cache file
+        set_pv_cache(None)
+        cache = set_pv_cache(self.path)
+        self.assertEqual(len(cache), 1)
+
+        cache.update('fakepv', dict(cache.get('fakepv'), precision=3,
+                                    enum_strs=['a', 'b']))
+        signal = EpicsSignal('fakepv', name='sig')
+
+        # answered from the cache before connecting...
+        self.assertEqual(signal.precision, 3)
+        self.assertEqual(signal.enum_strs, ['a', 'b'])
+
+        # ... and checked against the live PV in the background
+        signal.wait_for_connection()
+        get_scheduler().call_soon(signal._check_metadata, signal._read_pv)
+        t0 = time.time()
+        while cache.get('fakepv')['precision'] != 0:
+            self.assertLess(time.time() - t0, 2.0)
+            time.sleep(0.01)
+
+        self.assertIs(cache.get('fakepv')['enum_strs'], None)
+
+    def test_pv_cache_describe(self):
+        cache = set_pv_cache(self.path)
+        metadata = {'units': 'mm', 'precision': 4, 'enum_strs': None,
+                    'lower_ctrl_limit': 0, 'upper_ctrl_limit': 10,
+                    'type': 'time_double', 'count': 1}
+        cache.update('does_not_connect', metadata)
+
+        # described from the cache, without connecting
+        signal = EpicsSignalRO('does_not_connect', name='sig')
+        self.assertFalse(signal.connected)
+        desc = signal.describe()['sig']
+        self.assertEqual(desc['dtype'], 'number')
+        self.assertEqual(desc['shape'], [])
+        self.assertEqual(desc['precision'], 4)
+        self.assertEqual(desc['units'], 'mm')
+
+        cache.update('does_not_connect', dict(metadata, type='time_long',
+                                              count=10))
+        desc = signal.describe()['sig']
+        self.assertEqual(desc['dtype'], 'array')
+        self.assertEqual(desc['shape'], [10])
+
+        signal = EpicsSignal('does_not_connect', name='sig')
+        desc = signal.describe()['sig']
+        self.assertEqual(desc['lower_ctrl_limit'], 0)
+        self.assertEqual(desc['upper_ctrl_limit'], 10)
+
+    def test_pv_cache_limits(self):
+        class LimitsPV(FakeEpicsPV):
+            lower_ctrl_limit = 0.1
+            upper_ctrl_limit = 0.3
+
+        epics.PV = LimitsPV
+        cache = set_pv_cache(self.path)
+        signal = EpicsSignal('fakepv', name='sig')
+        signal.wait_for_connection()
+        signal.describe()
+        self.assertEqual(cache.get('fakepv')['upper_ctrl_limit'], 0.3)
+
+        # limits changed on the IOC are used right away
+        signal._write_pv.lower_ctrl_limit = -10
+        signal._write_pv.upper_ctrl_limit = 10
+        self.assertEqual(signal.limits, (-10, 10))
+        signal.check_value(5)
+
+        desc = signal.describe()['sig']
+        self.assertEqual(desc['lower_ctrl_limit'], -10)
+        self.assertEqual(desc['upper_ctrl_limit'], 10)
+
+
 class DerivedSignalTests(unittest.TestCase):
     def test_soft_derived(self):
         timestamp = 1.0
@@ -552,6 +648,53 @@ class DerivedSignalTests(unittest.TestCase):
         # self.assertEqual(derived.get(), signal.value)
 
 
+class ArrayGroupSignalTests(unittest.TestCase):
+    def test_array_group(self):
+        from collections import OrderedDict
+        from ophyd import Device, Component as Cpt
+        from ophyd.device import DynamicDeviceComponent as DDC
+
+        defn = OrderedDict(('ch{}'.format(i), (Signal, None, {'value': i}))
+                           for i in range(4))
+
+        class Group(Device):
+            chans = DDC(defn)
+            chans_array = Cpt(ArrayGroupSignal, group='chans')
+            polled = Cpt(ArrayGroupSignal, group='chans', monitor=False)
+
+        dev = Group('', name='dev', read_attrs=['chans_array'])
+        arr = dev.chans_array
+        self.assertTrue(arr.monitoring)
+        self.assertFalse(dev.polled.monitoring)
+        np.testing.assert_array_equal(dev.polled.get(), [0, 1, 2, 3])
+
+        desc = dev.describe()
+        self.assertEqual(list(desc), ['dev_chans_array'])
+        self.assertEqual(desc['dev_chans_array']['shape'], [4])
+        self.assertEqual(desc['dev_chans_array']['element_names'],
+                         ['dev_chans_ch0', 'dev_chans_ch1', 'dev_chans_ch2',
+                          'dev_chans_ch3'])
+
+        updates = []
+        arr.subscribe(lambda value=None, **kwargs: updates.append(value),
+                      run=False)
+        dev.chans.ch2.put(20, timestamp=5.0)
+        np.testing.assert_array_equal(updates[-1], [0, 1, 20, 3])
+
+        reading = dev.read()['dev_chans_array']
+        np.testing.assert_array_equal(reading['value'], [0, 1, 20, 3])
+        np.testing.assert_array_equal(dev.polled.get(), [0, 1, 20, 3])
+
+        # members can still be read one by one
+        self.assertEqual(dev.chans.ch2.read()['dev_chans_ch2']['value'], 20)
+        self.assertRaises(ReadOnlyError, arr.put, [0, 0, 0, 0])
+
+        arr.stop_monitoring()
+        dev.chans.ch0.put(10)
+        self.assertEqual(len(updates), 1)
+        np.testing.assert_array_equal(arr.get(), [10, 1, 20, 3])
+
+
 from . import main
 is_main = (__name__ == '__main__')
 main(is_main)
@@ -0,0 +1,203 @@
+import logging
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from ophyd.signal import Signal
+from ophyd.areadetector.streaming import FrameRingBuffer, ImageStream
+from ophyd.areadetector.distributor import FrameDistributor
+
+logger = logging.getLogger(__name__)
+
+
+def make_plugin(height=4, width=3):
+    '''A stand-in for an ImagePlugin, using soft signals'''
+    size = SimpleNamespace(height=Signal(name='height'),
+                           width=Signal(name='width'),
+                           depth=Signal(name='depth'))
+    plugin = SimpleNamespace(name='image1',
+                             array_size=size,
+                             ndimensions=Signal(name='ndimensions'),
+                             array_counter=Signal(name='array_counter'),
+                             array_data=Signal(name='array_data'),
+                             )
+
+    # as with the monitor callbacks on connection
+    size.height.put(height)
+    size.width.put(width)
+    size.depth.put(0)
+    plugin.ndimensions.put(2)
+    return plugin
+
+
+def publish(plugin, frame, timestamp, counter=None):
+    if counter is not None:
+        plugin.array_counter.put(counter)
+    plugin.array_data.put(np.asarray(frame).ravel(), timestamp=timestamp)
+
+
+def test_ring_buffer():
+    buf = FrameRingBuffer(3, (2, 2), dtype=np.int32)
+    with pytest.raises(ValueError):
+        FrameRingBuffer(0, (2, 2))
+
+    assert buf.latest(2) == []
+    for i in range(5):
+        buf.append(np.full(4, i), timestamp=i * 0.5)
+
+    assert len(buf) == 3
+    assert buf.overwritten == 2
+    assert buf.frame(1) is None
+    assert buf.frame(4)[0, 0] == 4
+    assert [frame[0, 0] for frame in buf.latest(2)] == [3, 4]
+    assert buf.frame_rate == pytest.approx(2.0)
+
+    # views share memory with the buffer
+    assert np.shares_memory(buf.latest(1)[0], buf.frames)
+
+    frames, next_index = buf.since(0)
+    assert [frame[0, 0] for frame in frames] == [2, 3, 4]
+    assert next_index == 5
+
+    with pytest.raises(ValueError):
+        buf.append(np.zeros(3), timestamp=0.0)
+
+    # trailing elements (i.e., beyond the waveform NORD) are ignored
+    buf.append(np.arange(10), timestamp=3.0)
+    np.testing.assert_array_equal(buf.latest(1)[0], [[0, 1], [2, 3]])
+
+
+def test_image_stream():
+    plugin = make_plugin(height=4, width=3)
+    stream = ImageStream(plugin, capacity=4)
+    assert stream.running
+    assert stream.shape == (4, 3)
+    assert stream.last_frame is None
+
+    for i in range(6):
+        publish(plugin, np.full(12, i, dtype=np.uint16), timestamp=i * 0.1,
+                counter=i + 1)
+
+    assert stream.received == 6
+    assert stream.buffer.dtype == np.uint16
+    assert stream.last_frame.shape == (4, 3)
+    assert stream.last_frame[0, 0] == 5
+    assert [frame[0, 0] for frame in stream.latest(10)] == [2, 3, 4, 5]
+    assert stream.overwritten == 2
+    assert stream.dropped == 0
+    assert stream.frame_rate == pytest.approx(10.0)
+
+    # the plugin counted frames which were never received
+    publish(plugin, np.full(12, 9, dtype=np.uint16), timestamp=1.0,
+            counter=10)
+    assert stream.dropped == 3
+
+    # a short frame is rejected
+    publish(plugin, np.zeros(5, dtype=np.uint16), timestamp=1.1, counter=11)
+    assert stream.rejected == 1
+    assert stream.dropped == 4
+
+    # a geometry change reallocates the buffer
+    plugin.array_size.width.put(2)
+    publish(plugin, np.ones(8, dtype=np.uint16), timestamp=1.2, counter=12)
+    assert stream.buffer.shape == (4, 2)
+    assert len(stream.latest(10)) == 1
+
+    stream.stop()
+    assert not stream.running
+    publish(plugin, np.ones(8, dtype=np.uint16), timestamp=1.3, counter=13)
+    assert stream.received == 9
+    repr(stream)
+
+
+def test_image_stream_counter_reset():
+    plugin = make_plugin()
+    with ImageStream(plugin, capacity=2, start=False) as stream:
+        publish(plugin, np.zeros(12), timestamp=0.0, counter=5)
+        publish(plugin, np.zeros(12), timestamp=0.1, counter=8)
+        assert stream.dropped == 2
+
+        # counter reset to zero when acquisition restarts
+        publish(plugin, np.zeros(12), timestamp=0.2, counter=0)
+        publish(plugin, np.zeros(12), timestamp=0.3, counter=1)
+        assert stream.dropped == 2
+
+    assert not stream.running
+
+
+def frame_sum(frame):
+    return float(frame.sum())
+
+
+def slow_frame_sum(frame):
+    time.sleep(0.5)
+    return float(frame.sum())
+
+
+def failing(frame):
+    raise ValueError('failed')
+
+
+def test_frame_distributor():
+    plugin = make_plugin(height=4, width=3)
+    results = []
+
+    def got_result(value=None, timestamp=None, **kwargs):
+        results.append((timestamp, value))
+
+    with FrameDistributor(plugin, frame_sum, workers=2,
+                          capacity=4) as dist:
+        dist.result.subscribe(got_result, run=False)
+        for i in range(3):
+            publish(plugin, np.full(12, i, dtype=np.int32), timestamp=i,
+                    counter=i + 1)
+
+        assert dist.submitted == 3
+        assert dist.wait(timeout=5.0)
+        assert dist.processed == 3
+        assert sorted(results) == [(0, 0.0), (1, 12.0), (2, 24.0)]
+
+        # a geometry change while workers run starts a new shared buffer
+        plugin.array_size.width.put(2)
+        publish(plugin, np.ones(8, dtype=np.int32), timestamp=3, counter=4)
+        assert dist.wait(timeout=5.0)
+        assert results[-1] == (3, 8.0)
+        assert dist.dropped == 0
+        repr(dist)
+
+    assert dist.buffer is None
+    assert not dist.running
+
+
+def test_frame_distributor_back_pressure():
+    plugin = make_plugin(height=2, width=2)
+    with FrameDistributor(plugin, slow_frame_sum, workers=1,
+                          capacity=2) as dist:
+        for i in range(5):
+            publish(plugin, np.full(4, i), timestamp=i, counter=i + 1)
+
+        # both slots are busy with the first two frames
+        assert dist.submitted == 2
+        assert dist.busy_dropped == 3
+        assert dist.dropped == 3
+        assert dist.in_flight == 2
+        assert dist.wait(timeout=5.0)
+        assert dist.result.get() == 4.0
+        assert dist.processed == 2
+
+
+def test_frame_distributor_errors():
+    plugin = make_plugin(height=2, width=2)
+    with FrameDistributor(plugin, failing, workers=1, capacity=2) as dist:
+        publish(plugin, np.zeros(4), timestamp=0, counter=1)
+        assert dist.wait(timeout=5.0)
+        assert dist.errors == 1
+        assert dist.processed == 0
+        assert dist.result.get() is None
+
+
+from . import main
+is_main = (__name__ == '__main__')
+main(is_main)
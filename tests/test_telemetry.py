@@ -0,0 +1,111 @@
+import os
+import logging
+import tempfile
+
+import numpy as np
+import pytest
+
+from ophyd import SimPositioner
+from ophyd.telemetry import MotionRecorder
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope='function')
+def positioner():
+    return SimPositioner(name='sim', velocity=10.0, update_rate=100.0,
+                         settle_time=0.05)
+
+
+def test_record_moves(positioner):
+    recorder = positioner.record_motion(capacity=10)
+    assert positioner.motion_recorder is recorder
+
+    for target in (0.5, 0.0, 0.5):
+        positioner.move(target, wait=True, timeout=2.0)
+
+    moves = recorder.moves
+    assert len(moves) == 3
+    assert list(moves['move_id']) == [0, 1, 2]
+    assert list(moves['target']) == [0.5, 0.0, 0.5]
+    assert all(moves['success'])
+    assert np.all(moves['command_ts'] <= moves['start_ts'])
+    assert np.all(moves['start_ts'] < moves['done_ts'])
+    assert np.all(moves['done_ts'] <= moves['settled_ts'])
+    assert np.all(moves['num_readbacks'] > 1)
+
+    readbacks = recorder.readbacks
+    assert len(readbacks) == moves['num_readbacks'].sum()
+    assert list(np.unique(readbacks['move_id'])) == [0, 1, 2]
+
+    summary = recorder.summary()
+    assert summary['name'] == 'sim'
+    assert summary['moves'] == summary['successful'] == 3
+    motion = summary['motion_time']
+    assert 0.04 < motion['mean'] < 0.5
+    assert motion['p99'] <= motion['max']
+    assert summary['completion_latency']['mean'] >= 0.05
+    assert summary['overhead']['mean'] >= summary['completion_latency']['mean']
+
+
+def test_auto_timeout_keeps_recorder(positioner):
+    recorder = positioner.record_motion()
+    positioner.auto_timeout = True
+    assert positioner.motion_recorder is recorder
+
+    status = positioner.move(0.2, wait=True, timeout=2.0)
+    assert not hasattr(status, 'recorder_move_id')
+    moves = recorder.moves
+    assert len(moves) == 1
+    assert moves['success'][0]
+    assert moves['final_position'][0] == 0.2
+
+
+def test_ring_buffer(positioner):
+    recorder = MotionRecorder(positioner, capacity=2, readback_capacity=5)
+
+    for target in (0.1, 0.2, 0.3):
+        positioner.move(target, wait=True, timeout=2.0)
+
+    moves = recorder.moves
+    assert list(moves['move_id']) == [1, 2]
+    assert list(moves['target']) == [0.2, 0.3]
+    assert recorder.summary()['overwritten'] == 1
+    assert len(recorder.readbacks) == 5
+
+    recorder.clear()
+    assert len(recorder.moves) == 0
+
+
+def test_failed_move_and_detach(positioner):
+    recorder = positioner.record_motion()
+    status = positioner.move(5.0, wait=False)
+    positioner.stop()
+
+    moves = recorder.moves
+    assert len(moves) == 1
+    assert not moves['success'][0]
+    assert np.isnan(moves['done_ts'][0])
+    assert recorder.summary()['motion_time'] is None
+
+    recorder.detach()
+    assert positioner.motion_recorder is None
+    positioner.move(0.0, wait=True, timeout=2.0)
+    assert len(recorder.moves) == 1
+
+
+def test_export(positioner):
+    recorder = positioner.record_motion()
+    positioner.move(0.2, wait=True, timeout=2.0)
+
+    with tempfile.TemporaryDirectory() as path:
+        fn = os.path.join(path, 'telemetry.npz')
+        recorder.export(fn)
+        data = np.load(fn)
+        np.testing.assert_array_equal(data['moves'], recorder.moves)
+        np.testing.assert_array_equal(data['readbacks'], recorder.readbacks)
+
+
+from . import main
+is_main = (__name__ == '__main__')
+main(is_main)
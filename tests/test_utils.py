@@ -1,14 +1,19 @@
 
 
 import os
+import time
 import logging
+import threading
 import unittest
+import uuid
 import numpy as np
 
 import epics
 
 from ophyd.utils import epics_pvs as epics_utils
 from ophyd.utils import errors
+from ophyd.utils.scheduler import (CallbackScheduler, get_scheduler)
+from ophyd.utils.uids import (UidPool, new_uid)
 
 from . import config
 
@@ -99,6 +104,81 @@ class EpicsUtilTest(unittest.TestCase):
         self.assertRaises(ValueError, utils.data_shape, list())
 
 
+class SchedulerTest(unittest.TestCase):
+    def test_order(self):
+        scheduler = CallbackScheduler()
+        results = []
+        done = threading.Event()
+
+        scheduler.call_later(0.2, done.set)
+        scheduler.call_later(0.1, results.append, 2)
+        scheduler.call_soon(results.append, 1)
+        cancelled = scheduler.call_later(0.05, results.append, 3)
+        cancelled.cancel()
+
+        self.assertTrue(done.wait(2.0))
+        self.assertEquals(results, [1, 2])
+
+        scheduler.stop()
+        scheduler.join(1.0)
+        self.assertFalse(scheduler.is_alive())
+
+    def test_failing_callback(self):
+        def fail():
+            raise ValueError('test')
+
+        scheduler = get_scheduler()
+        self.assertIs(scheduler, get_scheduler())
+
+        done = threading.Event()
+        scheduler.call_soon(fail)
+        scheduler.call_soon(done.set)
+        self.assertTrue(done.wait(2.0))
+
+
+class UidTest(unittest.TestCase):
+    def test_pool(self):
+        pool = UidPool(block_size=4)
+        self.assertRaises(ValueError, UidPool, block_size=0)
+
+        uid = pool()
+        self.assertEquals(len(pool), 3)
+        self.assertEquals(uuid.UUID(uid).version, 4)
+
+        pool.reserve(6)
+        self.assertEquals(len(pool), 7)
+
+        uids = pool.take(10) + [pool() for i in range(10)]
+        self.assertEquals(len(set(uids)), 20)
+        self.assertNotIn(uid, uids)
+        self.assertTrue(all(uuid.UUID(u).version == 4 for u in uids))
+
+        self.assertNotEqual(new_uid(), new_uid())
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+    def test_pool_fork(self):
+        pool = UidPool(block_size=4)
+        pool.reserve(4)
+        new_uid()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.write(write_fd, ' '.join([pool(), new_uid()]).encode())
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            child_uids = f.read().split()
+        os.waitpid(pid, 0)
+
+        self.assertEquals(len(child_uids), 2)
+        self.assertNotIn(pool(), child_uids)
+        self.assertNotIn(new_uid(), child_uids)
+
+
 class ErrorsTest(unittest.TestCase):
     def test_alarm(self):
         self.assertIs(errors.get_alarm_class(errors.MinorAlarmError.severity),